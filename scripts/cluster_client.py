@@ -0,0 +1,294 @@
+import asyncio
+import http.client
+import json
+import queue
+import re
+import ssl
+import subprocess
+import time
+import urllib.parse
+
+import readiness
+from readiness import JsonStreamDecoder, kubectl_args, resource_exists, run_kubectl
+
+NAMESPACE = "default"
+
+# REST collection paths for the resource kinds the deploy script works with
+COLLECTIONS = {
+    "service": "/api/v1/namespaces/{namespace}/services",
+    "deployment": "/apis/apps/v1/namespaces/{namespace}/deployments",
+    "hpa": "/apis/autoscaling/v2/namespaces/{namespace}/horizontalpodautoscalers",
+    "pod": "/api/v1/namespaces/{namespace}/pods",
+}
+KIND_ALIASES = {
+    "svc": "service",
+    "Service": "service",
+    "Deployment": "deployment",
+    "HorizontalPodAutoscaler": "hpa",
+    "pods": "pod",
+    "Pod": "pod",
+}
+
+# Function to map a kubectl-style or manifest kind to the kinds in COLLECTIONS
+def normalize_kind(kind):
+    return KIND_ALIASES.get(kind, kind)
+
+# Function to read the kind and name of a single-document manifest without a YAML parser
+def read_manifest_identity(text):
+    kind = re.search(r"^kind:\s*(\S+)", text, re.MULTILINE)
+    name = re.search(r"^metadata:\s*\n(?:\s+.*\n)*?\s+name:\s*(\S+)", text, re.MULTILINE)
+    if not kind or not name:
+        raise ValueError("Manifest is missing kind or metadata.name")
+    return normalize_kind(kind.group(1)), name.group(1).strip("'\"")
+
+# Subprocess backend: every operation runs its own kubectl process (the fallback path)
+class KubectlClient:
+    name = "kubectl"
+
+    async def get(self, kind, name):
+        output = await run_kubectl("get", normalize_kind(kind), name, "-o", "json", "--ignore-not-found")
+        return json.loads(output) if output else None
+
+    async def list(self, kind, selector=None):
+        args = ["get", normalize_kind(kind), "-o", "json"]
+        if selector:
+            args += ["-l", selector]
+        output = await run_kubectl(*args)
+        return json.loads(output)["items"] if output else []
+
+    async def apply(self, yaml_file):
+        return await run_kubectl("apply", "-f", yaml_file) is not None
+
+    async def delete(self, yaml_file):
+        return await run_kubectl("delete", "-f", yaml_file, "--wait=true") is not None
+
+    async def scale(self, deployment_name, replicas):
+        return await run_kubectl("scale", "deployment", deployment_name, f"--replicas={replicas}") is not None
+
+    async def annotate(self, kind, name, annotations):
+        pairs = [f"{key}={value}" for key, value in annotations.items()]
+        return await run_kubectl("annotate", normalize_kind(kind), name, *pairs, "--overwrite") is not None
+
+    async def get_raw(self, path):
+        return await run_kubectl("get", "--raw", path)
+
+    async def watch_until(self, kind, name=None, selector=None, condition=resource_exists, timeout=60):
+        return await readiness.watch_until(normalize_kind(kind), name, selector, condition, timeout)
+
+    def cp(self, source, destination):
+        result = subprocess.run(kubectl_args("cp", source, destination), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            print(f"❌ Error executing command: {result.stderr.decode('utf-8')}")
+            return None
+        return result.stdout.decode("utf-8").strip()
+
+    # Function to build the kubectl exec command line for a pod
+    def exec_args(self, pod_name, command, stdin=False):
+        return kubectl_args("exec", *(["-i"] if stdin else []), pod_name, "--", *command)
+
+    def exec(self, pod_name, command, stdin=False, **kwargs):
+        return subprocess.run(self.exec_args(pod_name, command, stdin), **kwargs)
+
+    def close(self):
+        pass
+
+# HTTP backend: one pool of keep-alive connections to the API server (or to a local `kubectl proxy`)
+class ApiClient(KubectlClient):
+    name = "api"
+
+    def __init__(self, server, token=None, ca_file=None, insecure=False, pool_size=4, namespace=NAMESPACE):
+        url = urllib.parse.urlsplit(server)
+        self.scheme = url.scheme
+        self.host = url.hostname
+        self.port = url.port
+        self.token = token
+        self.namespace = namespace
+        self.proxy_process = None
+        self.pool = queue.LifoQueue(maxsize=pool_size)
+        if self.scheme == "https":
+            self.ssl_context = ssl.create_default_context(cafile=ca_file)
+            if insecure:
+                self.ssl_context.check_hostname = False
+                self.ssl_context.verify_mode = ssl.CERT_NONE
+
+    # Function to start `kubectl proxy` once and talk to the API server through it
+    @classmethod
+    def from_kubectl_proxy(cls, startup_timeout=10):
+        process = subprocess.Popen(kubectl_args("proxy", "--port=0"), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        deadline = time.monotonic() + startup_timeout
+        line = ""
+        while time.monotonic() < deadline:
+            line = process.stdout.readline()
+            match = re.search(r"Starting to serve on ([\d.]+:\d+)", line)
+            if match:
+                client = cls(f"http://{match.group(1)}")
+                client.proxy_process = process
+                return client
+            if not line and process.poll() is not None:
+                break
+        process.kill()
+        raise RuntimeError(f"kubectl proxy did not start: {line.strip()}")
+
+    def connect(self):
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, context=self.ssl_context, timeout=30)
+        return http.client.HTTPConnection(self.host, self.port, timeout=30)
+
+    def headers(self, content_type=None):
+        headers = {"Accept": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if content_type:
+            headers["Content-Type"] = content_type
+        return headers
+
+    # Function to send one request over a pooled connection, reconnecting once if it went stale
+    def request(self, method, path, body=None, content_type=None):
+        for attempt in range(2):
+            try:
+                connection = self.pool.get_nowait()
+            except queue.Empty:
+                connection = self.connect()
+            try:
+                connection.request(method, path, body=body, headers=self.headers(content_type))
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                if attempt:
+                    raise
+                continue
+            try:
+                self.pool.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+            return response.status, data
+
+    def collection(self, kind):
+        return COLLECTIONS[normalize_kind(kind)].format(namespace=self.namespace)
+
+    async def call(self, method, path, body=None, content_type=None):
+        return await asyncio.to_thread(self.request, method, path, body, content_type)
+
+    async def get(self, kind, name):
+        status, data = await self.call("GET", f"{self.collection(kind)}/{name}")
+        return json.loads(data) if status == 200 else None
+
+    async def list(self, kind, selector=None):
+        path = self.collection(kind)
+        if selector:
+            path += "?" + urllib.parse.urlencode({"labelSelector": selector})
+        status, data = await self.call("GET", path)
+        return json.loads(data)["items"] if status == 200 else []
+
+    async def apply(self, yaml_file):
+        with open(yaml_file) as f:
+            manifest = f.read()
+        kind, name = read_manifest_identity(manifest)
+        # Server-side apply accepts the manifest as YAML, so no client-side parsing is needed
+        path = f"{self.collection(kind)}/{name}?fieldManager=deploy-and-test&force=true"
+        status, data = await self.call("PATCH", path, manifest.encode("utf-8"), "application/apply-patch+yaml")
+        if status >= 300:
+            print(f"❌ Error applying {yaml_file}: {data.decode('utf-8')}")
+            return False
+        return True
+
+    async def delete(self, yaml_file):
+        with open(yaml_file) as f:
+            kind, name = read_manifest_identity(f.read())
+        status, data = await self.call("DELETE", f"{self.collection(kind)}/{name}?propagationPolicy=Foreground")
+        if status == 404:
+            return True
+        if status >= 300:
+            print(f"❌ Error deleting {yaml_file}: {data.decode('utf-8')}")
+            return False
+        return await self.wait_deleted(kind, name, readiness.TIMEOUTS.get(normalize_kind(kind), 60))
+
+    async def scale(self, deployment_name, replicas):
+        body = json.dumps({"spec": {"replicas": replicas}}).encode("utf-8")
+        path = f"{self.collection('deployment')}/{deployment_name}/scale"
+        status, data = await self.call("PATCH", path, body, "application/merge-patch+json")
+        if status >= 300:
+            print(f"❌ Error scaling {deployment_name}: {data.decode('utf-8')}")
+            return False
+        return True
+
+    async def annotate(self, kind, name, annotations):
+        body = json.dumps({"metadata": {"annotations": annotations}}).encode("utf-8")
+        status, data = await self.call("PATCH", f"{self.collection(kind)}/{name}", body, "application/merge-patch+json")
+        if status >= 300:
+            print(f"❌ Error annotating {kind} {name}: {data.decode('utf-8')}")
+            return False
+        return True
+
+    async def get_raw(self, path):
+        status, data = await self.call("GET", path)
+        return data.decode("utf-8") if status == 200 else None
+
+    # Function to stream watch events on a dedicated connection until the callback returns True
+    def watch(self, kind, name, selector, on_event, timeout):
+        query = {"watch": "1", "timeoutSeconds": str(max(int(timeout), 1))}
+        if name:
+            query["fieldSelector"] = f"metadata.name={name}"
+        if selector:
+            query["labelSelector"] = selector
+        connection = self.connect()
+        connection.timeout = timeout
+        try:
+            connection.request("GET", f"{self.collection(kind)}?{urllib.parse.urlencode(query)}", headers=self.headers())
+            response = connection.getresponse()
+            if response.status != 200:
+                return False
+            decoder = JsonStreamDecoder()
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                chunk = response.read1(65536)
+                if not chunk:
+                    return False
+                for event in decoder.feed(chunk.decode("utf-8")):
+                    if on_event(event):
+                        return True
+            return False
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            connection.close()
+
+    async def watch_until(self, kind, name=None, selector=None, condition=resource_exists, timeout=60):
+        def on_event(event):
+            return event.get("type") in ("ADDED", "MODIFIED") and condition(event["object"])
+        return await asyncio.to_thread(self.watch, kind, name, selector, on_event, timeout)
+
+    async def wait_deleted(self, kind, name, timeout):
+        if await self.get(kind, name) is None:
+            return True
+        return await asyncio.to_thread(self.watch, kind, name, None, lambda event: event.get("type") == "DELETED", timeout)
+
+    def close(self):
+        while not self.pool.empty():
+            self.pool.get_nowait().close()
+        if self.proxy_process:
+            self.proxy_process.terminate()
+            self.proxy_process.wait()
+
+# Backend used by the deploy script, replaced by set_client() at startup
+_client = KubectlClient()
+
+def get_client():
+    return _client
+
+def set_client(client):
+    global _client
+    _client = client
+
+# Function to create the backend selected on the command line, falling back to kubectl
+def create_client(backend="api", server=None, token=None, ca_file=None, insecure=False):
+    if backend == "kubectl":
+        return KubectlClient()
+    try:
+        if server:
+            return ApiClient(server, token=token, ca_file=ca_file, insecure=insecure)
+        return ApiClient.from_kubectl_proxy()
+    except Exception as e:
+        print(f"⚠️ API client unavailable, falling back to kubectl subprocesses: {str(e)}")
+        return KubectlClient()
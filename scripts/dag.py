@@ -0,0 +1,42 @@
+import asyncio
+
+# Function to order graph nodes so every node comes after its dependencies
+def topological_order(graph):
+    order = []
+    state = {}  # name -> "visiting" | "done"
+
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        if name not in graph:
+            raise ValueError(f"Unknown dependency '{name}' (required by {path[-1]})")
+        state[name] = "visiting"
+        for dependency in graph[name]["depends_on"]:
+            visit(dependency, path + [name])
+        state[name] = "done"
+        order.append(name)
+
+    for name in graph:
+        visit(name, [])
+    return order
+
+# Function to run every node as soon as its dependencies succeed, independent nodes concurrently
+async def run_graph(graph):
+    tasks = {}
+
+    async def run_node(name):
+        dependencies = graph[name]["depends_on"]
+        results = await asyncio.gather(*(tasks[dependency] for dependency in dependencies))
+        if not all(results):
+            failed = [dependency for dependency, ok in zip(dependencies, results) if not ok]
+            print(f"⏭️ Skipping {name}: dependency failed ({', '.join(failed)}).")
+            return False
+        return bool(await graph[name]["action"]())
+
+    for name in topological_order(graph):
+        tasks[name] = asyncio.ensure_future(run_node(name))
+
+    results = await asyncio.gather(*tasks.values())
+    return dict(zip(tasks, results))
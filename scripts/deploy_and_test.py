@@ -1,128 +1,126 @@
+import asyncio
+import json
+import os
 import subprocess
+import sys
 import time
 import argparse
-
-# Function to execute a shell command
-def run_command(command):
-    try:
-        result = subprocess.run(command, shell=True, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return result.stdout.decode('utf-8').strip()
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error executing command: {e.stderr.decode('utf-8')}")
-        return None
-
-# Function to check if a Kubernetes service exists
-def service_exists(service_name):
-    command = f"kubectl get svc {service_name} --no-headers"
-    result = run_command(command)
-    return bool(result)
+from contextlib import contextmanager
+
+from cluster_client import create_client, get_client, set_client
+from dag import run_graph
+from grid import count_free_slots, get_hub_status
+from grid_autoscaler import GridAutoscaler, start_in_background
+from junit_report import POD_JUNIT_PATH, parse_junit, print_summary
+from node_config import CHROME_NODE_MANIFEST, node_settings, write_chrome_node_manifest
+from readiness import TIMEOUTS, parse_timeouts, deployment_available, pod_running
+from result_history import FAILED_OUTCOMES, ResultHistory, error_signature
+from sync_tests import sync_tests
+from throughput import run_throughput_benchmark
+from timing_cache import load_timings, save_timings, average_durations
+from trace_report import aggregate, load_spans, print_report
+import timing_cache
+import trace_report
+
+POD_REPLAY_ARCHIVE = "/tests/insider/replay_archive"
+LOCAL_REPLAY_ARCHIVE = "tests/insider/replay_archive"
+POD_ARTIFACTS_DIR = "/tmp/insider-artifacts"
+LOCAL_ARTIFACTS_DIR = ".cache/artifacts"
+# Client of the runner daemon in the test-controller pod; synced with the tests
+POD_RUNNER = "/tests/insider/runner_daemon.py"
 
 # Function to deploy a Kubernetes service
-def deploy_service(service_name, yaml_file):
+async def deploy_service(service_name, yaml_file, timeout=None):
     print(f"🚀 Deploying service {service_name}...")
-    run_command(f"kubectl apply -f {yaml_file}")
-    
-    # Wait for service to exist
-    for attempt in range(10):
-        output = run_command(f"kubectl get svc {service_name} --no-headers")
-        if output:
-            print(f"✅ Service {service_name} is now available.")
-            return True
-        print(f"⏳ Waiting for service {service_name} to be ready... (Attempt {attempt + 1}/10)")
-        time.sleep(5)
-    
+    await get_client().apply(yaml_file)
+
+    # Watch until the service exists
+    print(f"⏳ Waiting for service {service_name} to be ready...")
+    if await get_client().watch_until("service", service_name, timeout=timeout or TIMEOUTS["service"]):
+        print(f"✅ Service {service_name} is now available.")
+        return True
+
     print(f"❌ Service {service_name} did not become available.")
     return False
 
-# Function to check if a Kubernetes deployment is running
-def is_deployment_running(deployment_name):
-    command = f"kubectl get deployment {deployment_name} -o jsonpath='{{.status.availableReplicas}}'"
-    result = run_command(command)
-    return result and result.isdigit() and int(result) > 0
-
 # Function to deploy a Kubernetes deployment
-def deploy_deployment(deployment_name, yaml_file, retries=3, wait_time=5):
+async def deploy_deployment(deployment_name, yaml_file, retries=3, timeout=None):
     for attempt in range(1, retries + 1):
         print(f"🚀 Deploying {deployment_name} (Attempt {attempt}/{retries})...")
-        run_command(f"kubectl apply -f {yaml_file}")
+        await get_client().apply(yaml_file)
         print(f"⏳ Waiting for {deployment_name} to reach Running state...")
 
-        for _ in range(12):  # Max wait time: 12 * 5s = 60 seconds
-            if is_deployment_running(deployment_name):
-                print(f"✅ {deployment_name} is now Running.")
-                return True
-            time.sleep(wait_time)
+        if await get_client().watch_until("deployment", deployment_name, condition=deployment_available,
+                             timeout=timeout or TIMEOUTS["deployment"]):
+            print(f"✅ {deployment_name} is now Running.")
+            return True
 
         print(f"❌ {deployment_name} did not reach Running state, retrying...")
-        run_command(f"kubectl delete -f {yaml_file}")
-        time.sleep(wait_time)
+        # Delete waits for the resources to be gone before returning
+        await get_client().delete(yaml_file)
 
     print(f"❌ {deployment_name} failed to start after {retries} attempts.")
     return False
 
-# Function to check if an HPA exists
-def hpa_exists(hpa_name):
-    command = f"kubectl get hpa {hpa_name} --no-headers"
-    result = run_command(command)
-    return bool(result)
-
 # Function to deploy an HPA
-def deploy_hpa(hpa_name, yaml_file):
+async def deploy_hpa(hpa_name, yaml_file, timeout=None):
     print(f"🚀 Deploying HPA {hpa_name}...")
-    run_command(f"kubectl apply -f {yaml_file}")
-    
-    # Wait for HPA to exist
-    for attempt in range(10):
-        output = run_command(f"kubectl get hpa {hpa_name} --no-headers")
-        if output:
-            print(f"✅ HPA {hpa_name} is now available.")
-            return True
-        print(f"⏳ Waiting for HPA {hpa_name} to be ready... (Attempt {attempt + 1}/10)")
-        time.sleep(5)
-    
+    await get_client().apply(yaml_file)
+
+    # Watch until the HPA exists
+    print(f"⏳ Waiting for HPA {hpa_name} to be ready...")
+    if await get_client().watch_until("hpa", hpa_name, timeout=timeout or TIMEOUTS["hpa"]):
+        print(f"✅ HPA {hpa_name} is now available.")
+        return True
+
     print(f"❌ HPA {hpa_name} did not become available.")
     return False
 
+# Function to remove a CPU-based HPA left from earlier runs, so it doesn't fight the grid autoscaler
+async def remove_hpa(hpa_name, yaml_file):
+    if await get_client().get("hpa", hpa_name) is None:
+        return True
+    print(f"🧹 Removing HPA {hpa_name}, chrome-node is scaled from the hub's session queue instead...")
+    return await get_client().delete(yaml_file)
+
 # Function to scale the chrome-node deployment
-def scale_chrome_node(node_count):
+async def scale_chrome_node(node_count):
     print(f"📏 Scaling chrome-node to {node_count} replicas...")
-    command = f"kubectl scale deployment chrome-node --replicas={node_count}"
-    if run_command(command):
+    if await get_client().scale("chrome-node", node_count):
         print(f"✅ Successfully scaled chrome-node to {node_count} replicas.")
-    else:
-        print(f"❌ Failed to scale chrome-node.")
+        return True
+    print(f"❌ Failed to scale chrome-node.")
+    return False
 
 # Function to check if the chrome-node pod is healthy
-def is_chrome_node_healthy():
+def is_chrome_node_healthy(timeout=None):
     print(f"🔍 Checking if chrome-node pod is healthy...")
-    for attempt in range(10):
-        command = "kubectl get pod -l app=chrome-node -o jsonpath='{.items[0].status.phase}'"
-        status = run_command(command)
-        if status == "Running":
-            print(f"✅ Chrome-node pod is healthy.")
-            return True
-        print(f"⏳ Waiting for chrome-node pod to become healthy... (Attempt {attempt + 1}/10)")
-        time.sleep(5)
+    if asyncio.run(get_client().watch_until("pod", selector="app=chrome-node", condition=pod_running,
+                                            timeout=timeout or TIMEOUTS["pod"])):
+        print(f"✅ Chrome-node pod is healthy.")
+        return True
 
     print(f"❌ Chrome-node pod is not healthy.")
     return False
 
 # Function to get the actual pod name of the test controller pod
 def get_test_controller_pod_name():
-    command = "kubectl get pods -l app=selenium-test-controller -o jsonpath='{.items[0].metadata.name}'"
-    pod_name = run_command(command)
-    return pod_name
+    pods = asyncio.run(get_client().list("pod", selector="app=selenium-test-controller"))
+    return pods[0]["metadata"]["name"] if pods else None
 
 # Function to copy tests to the test controller pod
-def copy_tests_to_test_controller():
+def copy_tests_to_test_controller(sync_mode="incremental"):
     print(f"📂 Copying tests to selenium-test-controller pod...")
     pod_name = get_test_controller_pod_name()
 
     if pod_name:
-        command = f"kubectl cp tests {pod_name}:/tests"
-        result = run_command(command)
+        if sync_mode == "incremental":
+            # Send only the files whose content changed since the last sync
+            copied = sync_tests(pod_name)
+        else:
+            copied = get_client().cp("tests", f"{pod_name}:/tests") is not None
 
-        if result is not None:
+        if copied:
             print(f"✅ Tests copied successfully.")
         else:
             print(f"❌ Failed to copy tests.")
@@ -131,85 +129,335 @@ def copy_tests_to_test_controller():
         print(f"❌ No selenium-test-controller pod found.")
         exit(1)  # Exit the script if the pod isn't found
 
+# Function to size the pytest-xdist worker count from the grid's free slots
+def get_test_worker_count():
+    status = asyncio.run(get_hub_status())
+    if status is None:
+        print(f"⚠️ Could not read Selenium Hub status, running tests with a single worker.")
+        return 1
+    free_slots = count_free_slots(status)
+    print(f"📊 Selenium Hub reports {free_slots} free session slot(s).")
+    return max(free_slots, 1)
+
+# Function to build the pod command for a pytest pass: through the warm runner daemon
+# (falls back to plain pytest in the pod when it isn't up) or a cold pytest process
+def pytest_command(args, env=None, runner="daemon"):
+    env = env or {}
+    if runner == "daemon":
+        return ["python", POD_RUNNER, "run"] + [f"--env={key}={value}" for key, value in env.items()] + ["--"] + args
+    return ["env"] + [f"{key}={value}" for key, value in env.items()] + ["pytest"] + args
+
+# Function to run one pytest pass in the test controller pod, streaming its output
+def run_pytest(pod_name, args, env=None, runner="daemon"):
+    command = pytest_command(args, env, runner)
+    # Stream the test output line by line as it arrives instead of buffering it
+    print("\n========= Test Output =========")
+    process = subprocess.Popen(
+        get_client().exec_args(pod_name, command),
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+    )
+    for line in process.stdout:
+        sys.stdout.write(line)
+        sys.stdout.flush()
+    returncode = process.wait()
+    print("===============================\n")
+    return returncode
+
 # Function to run tests inside the test controller pod
-def run_tests():
+def run_tests(replay="off", reruns=1, flake_threshold=0.3, runner="daemon"):
     print(f"🧪 Running tests inside selenium-test-controller pod...")
 
     # Get the actual pod name of the test controller
     pod_name = get_test_controller_pod_name()
 
     if pod_name:
-        # Run the tests using pytest inside the pod and capture the output
-        command = ["kubectl", "exec", "-it", pod_name, "--", "pytest", "-v", "-s", "/tests/insider"]
-        
-        result = subprocess.run(command, capture_output=True, text=True)
-        
-        # Print the test output and errors
-        print("\n========= Test Output =========")
-        print(result.stdout)
-        print("========= Test Errors =========")
-        print(result.stderr)
-
-        # Check if the tests were successful or not based on the return code
-        if result.returncode == 0:
+        # Order tests by risk (recent failures first, from the test history), then longest
+        # first (the pod-side conftest reads both) and spread them over one xdist worker per free grid slot
+        history = ResultHistory()
+        quarantined = history.quarantined(flake_threshold) if flake_threshold else []
+        for test_id in quarantined:
+            print(f"🚧 Quarantined (flip rate >= {flake_threshold:.0%}, failures don't fail the run): {test_id}")
+        timings = average_durations(load_timings())
+        workers = get_test_worker_count()
+        run_id = time.strftime("%Y%m%d-%H%M%S")
+        pod_trace_path = f"/tmp/insider-trace-{run_id}.jsonl"
+        pod_artifacts_dir = f"{POD_ARTIFACTS_DIR}/{run_id}"
+        base_args = ["-v", "-s", f"--junitxml={POD_JUNIT_PATH}", f"--trace-file={pod_trace_path}",
+                        f"--artifacts-dir={pod_artifacts_dir}"]
+        if replay != "off":
+            base_args += ["--replay", replay]
+
+        args = list(base_args)
+        if workers > 1:
+            args += ["-n", str(workers), "--dist", "load"]
+        env = {"PYTEST_TEST_TIMINGS": json.dumps(timings), "PYTEST_TEST_FIRST": json.dumps(history.run_first())}
+        returncode = run_pytest(pod_name, args + ["/tests/insider"], env, runner)
+
+        results = fetch_test_results(pod_name)
+        final = {}
+        if results:
+            print_summary(results)
+            save_timings({result["test_id"]: result["duration"] for result in results
+                          if result["outcome"] != "skipped"})
+            history.record(run_id, 1, results)
+            final = {result["test_id"]: result for result in results}
+
+        # Rerun only the failed tests, in a fresh pytest process and so on fresh grid sessions.
+        # Quarantined tests are not rerun: their outcome doesn't decide the run anyway.
+        for attempt in range(2, reruns + 2):
+            failed = [test_id for test_id, result in final.items()
+                      if result["outcome"] in FAILED_OUTCOMES and test_id not in quarantined]
+            if not failed:
+                break
+            print(f"🔁 Rerun {attempt - 1}/{reruns}: {len(failed)} failed test(s) on fresh sessions...")
+            args = list(base_args)
+            if min(workers, len(failed)) > 1:
+                args += ["-n", str(min(workers, len(failed))), "--dist", "load"]
+            run_pytest(pod_name, args + [f"/tests/insider/{test_id}" for test_id in failed], runner=runner)
+            rerun_results = fetch_test_results(pod_name)
+            if not rerun_results:
+                break
+            print_summary(rerun_results)
+            history.record(run_id, attempt, rerun_results)
+            for result in rerun_results:
+                previous = final.get(result["test_id"])
+                if result["outcome"] == "passed":
+                    print(f"🎲 {result['test_id']} passed on rerun (flaky).")
+                elif previous and error_signature(previous["message"]) == error_signature(result["message"]):
+                    print(f"🧱 {result['test_id']} failed again with the same error.")
+                final[result["test_id"]] = result
+        history.close()
+
+        if replay == "record":
+            fetch_replay_archive(pod_name)
+        fetch_trace(pod_name, pod_trace_path, run_id)
+        if returncode != 0:
+            fetch_artifacts(pod_name, pod_artifacts_dir, run_id)
+
+        # Without a report fall back to the return code; otherwise the last attempt of
+        # every non-quarantined test decides
+        if final:
+            passed = all(result["outcome"] not in FAILED_OUTCOMES or test_id in quarantined
+                         for test_id, result in final.items())
+        else:
+            passed = returncode == 0
+        if passed:
             print(f"✅ Tests completed successfully.")
         else:
             print(f"❌ Tests failed.")
+        return passed
     else:
         print(f"❌ No selenium-test-controller pod found.")
+        return False
+
+# Function to copy the JUnit report back from the pod and parse it
+def fetch_test_results(pod_name):
+    local_path = os.path.join(os.path.dirname(timing_cache.TIMINGS_FILE), "results", "junit.xml")
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    # A report left over from an earlier run must not pass for this run's results
+    if os.path.exists(local_path):
+        os.remove(local_path)
+    if get_client().cp(f"{pod_name}:{POD_JUNIT_PATH}", local_path) is None or not os.path.exists(local_path):
+        print(f"⚠️ No JUnit report found in the pod.")
+        return []
+    try:
+        return parse_junit(local_path)
+    except Exception as e:
+        print(f"⚠️ Could not parse the JUnit report: {str(e)}")
+        return []
+
+# Function to copy this run's spans back from the pod and print the hottest steps
+def fetch_trace(pod_name, pod_trace_path, run_id):
+    os.makedirs(trace_report.TRACES_DIR, exist_ok=True)
+    local_path = os.path.join(trace_report.TRACES_DIR, f"{run_id}.jsonl")
+    if get_client().cp(f"{pod_name}:{pod_trace_path}", local_path) is None or not os.path.exists(local_path):
+        print(f"⚠️ No trace file found in the pod.")
+        return
+    print(f"⏱️ Trace saved to {local_path} (compare runs with scripts/trace_report.py).")
+    print_report(aggregate(load_spans([local_path]), kinds=["session", "step", "wait"]), top=10)
+
+# Function to copy the failed tests' screenshot/DOM/console archives back from the pod
+def fetch_artifacts(pod_name, pod_artifacts_dir, run_id):
+    local_dir = os.path.join(LOCAL_ARTIFACTS_DIR, run_id)
+    os.makedirs(LOCAL_ARTIFACTS_DIR, exist_ok=True)
+    if get_client().cp(f"{pod_name}:{pod_artifacts_dir}", local_dir) is None or not os.path.isdir(local_dir):
+        print(f"⚠️ No failure artifacts found in the pod.")
+        return
+    print(f"📦 {len(os.listdir(local_dir))} failure artifact(s) saved to {local_dir}.")
+
+# Function to copy the archive recorded in the pod back next to the tests, so the
+# next sync ships it for --replay replay runs
+def fetch_replay_archive(pod_name):
+    if get_client().cp(f"{pod_name}:{POD_REPLAY_ARCHIVE}", LOCAL_REPLAY_ARCHIVE) is None:
+        print(f"⚠️ Could not copy the replay archive back from the pod.")
+    else:
+        print(f"🎞️ Replay archive saved to {LOCAL_REPLAY_ARCHIVE}.")
 
 # Function to print a separator
 def print_separator():
     print("\n" + "=" * 50 + "\n")
 
-# Main script execution
-def main():
+# Wall-clock timer for the deploy phases, used to benchmark a full run
+class PhaseTimer:
+    def __init__(self):
+        self.phases = []
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    # Function to print the time spent in each phase (concurrent phases overlap)
+    def print_summary(self):
+        print("⏱️ Deploy benchmark (wall-clock per phase)")
+        for name, elapsed in self.phases:
+            print(f"   - {name:<36} {elapsed:8.2f}s")
+        print(f"   - {'total':<36} {time.perf_counter() - self.started:8.2f}s")
+
+# Main script execution (argv and timer let the benchmark harness drive it in-process)
+def main(argv=None, timer=None):
     parser = argparse.ArgumentParser(description="Deploy Kubernetes services, deployments, and run tests.")
     parser.add_argument("--node_count", type=int, default=1, help="Number of chrome-node replicas (min: 1, max: 5)")
-    args = parser.parse_args()
+    parser.add_argument("--timeout", action="append", metavar="KIND=SECONDS",
+                        help=f"Readiness timeout per resource kind, repeatable (kinds: {', '.join(TIMEOUTS)})")
+    parser.add_argument("--cluster_client", choices=["api", "kubectl"], default="api",
+                        help="Cluster backend: pooled API connections (default) or one kubectl process per call")
+    parser.add_argument("--api_server", default=os.environ.get("K8S_API_SERVER"),
+                        help="API server URL; without it the api backend goes through a local `kubectl proxy`")
+    parser.add_argument("--api_token", default=os.environ.get("K8S_API_TOKEN"), help="Bearer token for --api_server")
+    parser.add_argument("--api_ca_file", default=os.environ.get("K8S_API_CA_FILE"), help="CA bundle for --api_server")
+    parser.add_argument("--sync_mode", choices=["incremental", "copy"], default="incremental",
+                        help="Ship only changed test files (default) or `kubectl cp` the whole tests directory")
+    parser.add_argument("--autoscaler", choices=["grid", "hpa"], default="grid",
+                        help="Scale chrome-node from the hub's session queue during the tests (default) or with the CPU HPA")
+    parser.add_argument("--headroom", type=int, default=1, help="Free session slots the grid autoscaler keeps ready")
+    parser.add_argument("--cooldown", type=float, default=120,
+                        help="Seconds of low demand before the grid autoscaler removes a chrome-node")
+    parser.add_argument("--max_sessions", type=int, default=1, help="Browser sessions per chrome-node (SE_NODE_MAX_SESSIONS)")
+    parser.add_argument("--overcommit", action="store_true",
+                        help="Allow more sessions per node than it has CPUs (SE_NODE_OVERRIDE_MAX_SESSIONS)")
+    parser.add_argument("--cpu_request", help="chrome-node CPU request, e.g. 500m")
+    parser.add_argument("--cpu_limit", help="chrome-node CPU limit, e.g. 2")
+    parser.add_argument("--memory_request", help="chrome-node memory request, e.g. 1Gi")
+    parser.add_argument("--memory_limit", help="chrome-node memory limit, e.g. 4Gi")
+    parser.add_argument("--throughput_sessions",
+                        help="Instead of the tests, run the throughput benchmark at these concurrency levels, e.g. 1,2,4,8")
+    parser.add_argument("--throughput_duration", type=float, default=60,
+                        help="Seconds per throughput benchmark level")
+    parser.add_argument("--replay", choices=["off", "record", "replay"], default="off",
+                        help="Record useinsider.com/Lever pages into an archive, or replay them without network")
+    parser.add_argument("--reruns", type=int, default=1, help="Times to rerun only the failed tests on fresh sessions")
+    parser.add_argument("--flake_threshold", type=float, default=0.3,
+                        help="Quarantine tests whose recent pass/fail flip rate reaches this (0 disables quarantine)")
+    parser.add_argument("--runner", choices=["daemon", "exec"], default="daemon",
+                        help="Run pytest through the pod's warm runner daemon (default) or as a fresh process")
+    args = parser.parse_args(argv)
 
     if args.node_count < 1 or args.node_count > 5:
         print(f"❌ Error: Invalid node_count '{args.node_count}'. Allowed range: 1 to 5.")
         exit(1)
 
-    node_count = args.node_count
+    if args.max_sessions < 1:
+        print(f"❌ Error: Invalid max_sessions '{args.max_sessions}'. Must be at least 1.")
+        exit(1)
 
-    print_separator()
-    print("🔧 Kubernetes Service and Deployment Script")
-    print_separator()
+    try:
+        TIMEOUTS.update(parse_timeouts(args.timeout))
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        exit(1)
 
-    # Step 1: Deploy services
-    services = [
-        {"name": "chrome-node", "file": "kubernetes/services/chrome-node.yaml"},
-        {"name": "selenium-hub", "file": "kubernetes/services/selenium-hub.yaml"},
-    ]
+    node_count = args.node_count
+    timer = timer or PhaseTimer()
+    set_client(create_client(args.cluster_client, args.api_server, args.api_token, args.api_ca_file))
+    print(f"🔌 Using the {get_client().name} cluster client.")
 
-    for service in services:
-        deploy_service(service["name"], service["file"])
-    
-    print_separator()
+    try:
+        autoscaler = None
+        if args.autoscaler == "grid":
+            # The requested node count is the floor; the autoscaler only adds nodes ahead of queued sessions
+            autoscaler = GridAutoscaler(min_replicas=node_count, max_replicas=5, headroom=args.headroom,
+                                        cooldown=args.cooldown)
+        # Render chrome-node with the session density and resources from the flags
+        env, resources = node_settings(args.max_sessions, args.overcommit, args.cpu_request, args.cpu_limit,
+                                       args.memory_request, args.memory_limit)
+        chrome_node_file = write_chrome_node_manifest(env, resources)
+        print(f"🧩 chrome-node: {args.max_sessions} session(s) per node"
+              f"{' (overcommitted)' if args.overcommit else ''}, resources {resources or 'unset'}.")
+        throughput_levels = [int(level) for level in args.throughput_sessions.split(",")] if args.throughput_sessions else None
+        try:
+            deploy_and_run_tests(node_count, timer, args.sync_mode, args.replay, autoscaler, chrome_node_file,
+                                 throughput_levels, args.throughput_duration, args.reruns, args.flake_threshold,
+                                 args.runner)
+        finally:
+            os.remove(chrome_node_file)
+    finally:
+        get_client().close()
+        print_separator()
+        timer.print_summary()
+        print_separator()
+
+# Function to turn the declared resources into a graph of timed deploy actions
+def build_deploy_graph(resources, node_count, timer):
+    graph = {}
+    for resource in resources:
+        kind, name = resource["kind"], resource["name"]
+        if kind == "service":
+            step = lambda name=name, file=resource["file"]: deploy_service(name, file)
+        elif kind == "deployment":
+            step = lambda name=name, file=resource["file"]: deploy_deployment(name, file)
+        elif kind == "scale":
+            step = lambda: scale_chrome_node(node_count)
+        elif kind == "hpa":
+            step = lambda name=name, file=resource["file"]: deploy_hpa(name, file)
+        elif kind == "remove-hpa":
+            step = lambda name=name, file=resource["file"]: remove_hpa(name, file)
+        else:
+            raise ValueError(f"Unknown resource kind '{kind}'")
 
-    # Step 2: Deploy deployments
-    deployments = [
-        {"name": "chrome-node", "file": "kubernetes/deployments/chrome-node.yaml"},
-        {"name": "selenium-hub", "file": "kubernetes/deployments/selenium-hub.yaml"},
-        {"name": "selenium-test-controller", "file": "kubernetes/deployments/selenium-test-controller.yaml"},
-    ]
+        async def action(node_id=f"{kind}/{name}", step=step):
+            with timer.phase(node_id):
+                return await step()
 
-    for deployment in deployments:
-        if not deploy_deployment(deployment["name"], deployment["file"]):
-            print("❌ Stopping further deployments due to failure.")
-            return
+        graph[f"{kind}/{name}"] = {"depends_on": resource["depends_on"], "action": action}
+    return graph
 
+# Function to deploy every resource and run the tests, timing each phase
+def deploy_and_run_tests(node_count, timer, sync_mode="incremental", replay="off", autoscaler=None,
+                         chrome_node_file=CHROME_NODE_MANIFEST, throughput_levels=None, throughput_duration=60,
+                         reruns=1, flake_threshold=0.3, runner="daemon"):
+    print_separator()
+    print("🔧 Kubernetes Service and Deployment Script")
     print_separator()
 
-    # Step 3: Scale chrome-node
-    scale_chrome_node(node_count)
+    # Steps 1-4: Deploy services, deployments, scale and HPA as a dependency graph.
+    # Only the chrome-node and test-controller deployments need the hub; everything
+    # else is applied and awaited concurrently.
+    resources = [
+        {"kind": "service", "name": "chrome-node", "file": "kubernetes/services/chrome-node.yaml", "depends_on": []},
+        {"kind": "service", "name": "selenium-hub", "file": "kubernetes/services/selenium-hub.yaml", "depends_on": []},
+        {"kind": "deployment", "name": "selenium-hub", "file": "kubernetes/deployments/selenium-hub.yaml", "depends_on": []},
+        {"kind": "deployment", "name": "chrome-node", "file": chrome_node_file,
+         "depends_on": ["service/selenium-hub", "deployment/selenium-hub"]},
+        {"kind": "deployment", "name": "selenium-test-controller", "file": "kubernetes/deployments/selenium-test-controller.yaml",
+         "depends_on": ["service/selenium-hub", "deployment/selenium-hub"]},
+        {"kind": "scale", "name": "chrome-node", "depends_on": ["deployment/chrome-node"]},
+        # With the grid autoscaler the CPU-based HPA is removed instead of applied
+        {"kind": "remove-hpa" if autoscaler else "hpa", "name": "chrome-node-hpa",
+         "file": "kubernetes/deployments/chrome-node-hpa.yaml", "depends_on": ["scale/chrome-node"]},
+    ]
 
-    print_separator()
+    with timer.phase("deploy graph"):
+        results = asyncio.run(run_graph(build_deploy_graph(resources, node_count, timer)))
 
-    # Step 4: Deploy HPA
-    deploy_hpa("chrome-node-hpa", "kubernetes/deployments/chrome-node-hpa.yaml")
+    if not all(results.values()):
+        failed = [name for name, ok in results.items() if not ok]
+        print(f"❌ Stopping due to failed resources: {', '.join(failed)}")
+        return
 
     print_separator()
     print("🎉 All services, deployments, and HPA have been successfully deployed!")
@@ -219,12 +467,29 @@ def main():
     print("🧪 **Starting Tests**")
     print_separator()
 
-    if not is_chrome_node_healthy():
-        print("❌ Chrome-node pod is not healthy. Aborting tests.")
+    with timer.phase("chrome-node health"):
+        if not is_chrome_node_healthy():
+            print("❌ Chrome-node pod is not healthy. Aborting tests.")
+            return
+
+    with timer.phase("copy tests"):
+        copy_tests_to_test_controller(sync_mode)
+
+    if throughput_levels:
+        with timer.phase("throughput benchmark"):
+            run_throughput_benchmark(get_test_controller_pod_name(), throughput_levels, throughput_duration,
+                                     replay="replay" if replay == "off" else replay)
         return
 
-    copy_tests_to_test_controller()
-    run_tests()
+    with timer.phase("run tests"):
+        if autoscaler:
+            thread, stop_event = start_in_background(autoscaler)
+        try:
+            run_tests(replay, reruns, flake_threshold, runner)
+        finally:
+            if autoscaler:
+                stop_event.set()
+                thread.join()
 
     print_separator()
     print("✅ **Testing Completed!**")
@@ -0,0 +1,55 @@
+import json
+
+from cluster_client import get_client
+
+# Selenium Hub endpoints, reached through the API server's service proxy
+HUB_PROXY_PATH = "/api/v1/namespaces/default/services/selenium-hub:4444/proxy"
+HUB_STATUS_PATH = f"{HUB_PROXY_PATH}/status"
+HUB_QUEUE_PATH = f"{HUB_PROXY_PATH}/se/grid/newsessionqueue/queue"
+
+# Function to count the free session slots on nodes that are up
+def count_free_slots(status):
+    free_slots = 0
+    for node in status.get("value", {}).get("nodes", []):
+        if node.get("availability") != "UP":
+            continue
+        free_slots += sum(1 for slot in node.get("slots", []) if slot.get("session") is None)
+    return free_slots
+
+# Function to count all and busy session slots on nodes that are up
+def count_slots(status):
+    total = busy = 0
+    for node in status.get("value", {}).get("nodes", []):
+        if node.get("availability") != "UP":
+            continue
+        slots = node.get("slots", [])
+        total += len(slots)
+        busy += sum(1 for slot in slots if slot.get("session") is not None)
+    return total, busy
+
+# Function to read the session slots each node offers (SE_NODE_MAX_SESSIONS), or None with no nodes up
+def slots_per_node(status):
+    counts = [len(node.get("slots", [])) for node in status.get("value", {}).get("nodes", [])
+              if node.get("availability") == "UP"]
+    return max(counts) if counts else None
+
+# Function to read the hub's /status document, or None when the hub can't be reached
+async def get_hub_status():
+    output = await get_client().get_raw(HUB_STATUS_PATH)
+    if not output:
+        return None
+    try:
+        return json.loads(output)
+    except ValueError:
+        return None
+
+# Function to read the new-session requests waiting in the hub's queue, or None when it can't be read
+async def get_session_queue():
+    output = await get_client().get_raw(HUB_QUEUE_PATH)
+    if not output:
+        return None
+    try:
+        queue = json.loads(output).get("value")
+    except (ValueError, AttributeError):
+        return None
+    return queue if isinstance(queue, list) else None
@@ -0,0 +1,307 @@
+import argparse
+import asyncio
+import json
+import math
+import threading
+import time
+import urllib.parse
+
+from cluster_client import create_client, get_client, set_client
+from grid import HUB_QUEUE_PATH, HUB_STATUS_PATH, count_slots, get_hub_status, get_session_queue, slots_per_node
+
+DEPLOYMENT = "chrome-node"
+NODE_SELECTOR = "app=chrome-node"
+# The ReplicaSet removes the ready pod with the lowest deletion cost first (default 0)
+DELETION_COST_ANNOTATION = "controller.kubernetes.io/pod-deletion-cost"
+IDLE_DELETION_COST = "-100"
+
+# Function to work out how many chrome-node replicas cover the running and queued
+# sessions plus `headroom` spare slots, within the min/max replica bounds
+def desired_replicas(busy, queued, node_slots, headroom, min_replicas, max_replicas):
+    needed = math.ceil((busy + queued + headroom) / max(node_slots, 1))
+    return max(min_replicas, min(max_replicas, needed))
+
+# Function to pick the chrome-node pod whose hub node runs no session, matched by the node's
+# address (the pod IP it registered with); None when every node is busy or none can be matched
+def find_idle_pod(status, pods):
+    pods_by_ip = {pod.get("status", {}).get("podIP"): pod for pod in pods}
+    for node in status.get("value", {}).get("nodes", []):
+        if node.get("availability") != "UP" or any(slot.get("session") is not None for slot in node.get("slots", [])):
+            continue
+        host = urllib.parse.urlsplit(node.get("uri", "")).hostname
+        if host in pods_by_ip:
+            return pods_by_ip[host]
+    return None
+
+# Controller that sizes chrome-node from the hub's session queue and slot usage.
+# It scales up as soon as demand (plus headroom) exceeds capacity, and scales down
+# one replica at a time, only after demand has stayed below capacity for `cooldown` seconds,
+# and only once an idle node has been marked as the one the ReplicaSet should remove.
+class GridAutoscaler:
+    def __init__(self, deployment=DEPLOYMENT, min_replicas=1, max_replicas=5, headroom=1, cooldown=120,
+                 node_slots=1, clock=time.monotonic):
+        self.deployment = deployment
+        self.min_replicas = min_replicas
+        self.max_replicas = max_replicas
+        self.headroom = headroom
+        self.cooldown = cooldown
+        self.node_slots = node_slots
+        self.clock = clock
+        self.last_demand = None
+        self.events = []
+
+    # Function to run one control step and return what was observed and decided
+    async def step(self):
+        status, queue, deployment = await asyncio.gather(
+            get_hub_status(), get_session_queue(), get_client().get("deployment", self.deployment)
+        )
+        if status is None or deployment is None:
+            print(f"⚠️ Could not read the hub status or the {self.deployment} deployment, skipping this step.")
+            return None
+
+        _, busy = count_slots(status)
+        queued = len(queue or [])
+        node_slots = slots_per_node(status) or self.node_slots
+        current = deployment.get("spec", {}).get("replicas", 1)
+        desired = desired_replicas(busy, queued, node_slots, self.headroom, self.min_replicas, self.max_replicas)
+
+        now = self.clock()
+        if self.last_demand is None or desired >= current:
+            self.last_demand = now
+
+        target = current
+        if desired > current:
+            target = desired
+        elif desired < current and now - self.last_demand >= self.cooldown and await self.mark_idle_node(status):
+            target = current - 1
+
+        decision = {"time": now, "busy": busy, "queued": queued, "current": current, "desired": desired, "target": target}
+        if target != current:
+            direction = "⬆️ Scaling up" if target > current else "⬇️ Scaling down"
+            print(f"{direction} {self.deployment} {current} → {target} (busy {busy}, queued {queued}, headroom {self.headroom})")
+            if await get_client().scale(self.deployment, target):
+                # Every change restarts the cooldown, so scale-downs are spaced out
+                self.last_demand = now
+                self.events.append(decision)
+        return decision
+
+    # Function to give an idle node's pod the lowest deletion cost, so a scale-down never
+    # removes a node with a running session; False when no node is idle yet
+    async def mark_idle_node(self, status):
+        pods = await get_client().list("pod", selector=NODE_SELECTOR)
+        idle_pod = find_idle_pod(status, pods)
+        if idle_pod is None:
+            print(f"⏸️ Every {self.deployment} node is running a session, postponing the scale-down.")
+            return False
+        name = idle_pod["metadata"]["name"]
+        # A pod marked by an earlier step may have picked up a session since: unmark it
+        for pod in pods:
+            annotations = pod["metadata"].get("annotations") or {}
+            if pod["metadata"]["name"] != name and annotations.get(DELETION_COST_ANNOTATION) == IDLE_DELETION_COST:
+                await get_client().annotate("pod", pod["metadata"]["name"], {DELETION_COST_ANNOTATION: "0"})
+        return await get_client().annotate("pod", name, {DELETION_COST_ANNOTATION: IDLE_DELETION_COST})
+
+    # Function to poll until stop_event is set (or for a fixed number of iterations)
+    def run(self, interval=5, stop_event=None, iterations=None):
+        stop_event = stop_event or threading.Event()
+        count = 0
+        while not stop_event.is_set() and (iterations is None or count < iterations):
+            try:
+                asyncio.run(self.step())
+            except Exception as e:
+                print(f"⚠️ Autoscaler step failed: {str(e)}")
+            count += 1
+            stop_event.wait(interval)
+
+# Function to run an autoscaler in a background thread; set the returned event to stop it
+def start_in_background(autoscaler, interval=5):
+    stop_event = threading.Event()
+    thread = threading.Thread(target=autoscaler.run, args=(interval, stop_event), daemon=True)
+    thread.start()
+    return thread, stop_event
+
+# Simulated hub + cluster client, advanced one tick at a time. It answers the same
+# get/list/annotate/scale/get_raw calls as the real clients, so the controller runs unchanged.
+class SimulatedGrid:
+    name = "simulated"
+
+    def __init__(self, arrivals, session_ticks=6, startup_ticks=3, node_slots=1, replicas=1, tick_seconds=5):
+        self.arrivals = arrivals
+        self.session_ticks = session_ticks
+        self.startup_ticks = startup_ticks
+        self.node_slots = node_slots
+        self.tick_seconds = tick_seconds
+        self.replicas = replicas
+        # Ready nodes, oldest first, each with the remaining ticks of its running sessions
+        self.nodes = []
+        self.created_nodes = 0
+        for _ in range(replicas):
+            self.add_node()
+        self.pending_nodes = []
+        self.queue = 0
+        self.now = 0
+        self.queued_ticks = 0
+        self.node_ticks = 0
+        self.max_queue = 0
+        self.killed_sessions = 0
+        self.scale_calls = 0
+
+    def add_node(self):
+        self.created_nodes += 1
+        self.nodes.append({"name": f"chrome-node-{self.created_nodes}", "ip": f"10.0.0.{self.created_nodes}",
+                           "deletion_cost": 0, "sessions": []})
+
+    def clock(self):
+        return self.now * self.tick_seconds
+
+    async def get(self, kind, name):
+        return {"spec": {"replicas": self.replicas}, "status": {"availableReplicas": len(self.nodes)}}
+
+    async def list(self, kind, selector=None):
+        return [{"metadata": {"name": node["name"],
+                              "annotations": {DELETION_COST_ANNOTATION: str(node["deletion_cost"])}},
+                 "status": {"podIP": node["ip"]}} for node in self.nodes]
+
+    async def annotate(self, kind, name, annotations):
+        for node in self.nodes:
+            if node["name"] == name and DELETION_COST_ANNOTATION in annotations:
+                node["deletion_cost"] = int(annotations[DELETION_COST_ANNOTATION])
+        return True
+
+    async def scale(self, deployment_name, replicas):
+        self.scale_calls += 1
+        if replicas > self.replicas:
+            self.pending_nodes += [self.now + self.startup_ticks] * (replicas - self.replicas)
+        else:
+            for _ in range(self.replicas - replicas):
+                if self.pending_nodes:
+                    self.pending_nodes.pop()
+                    continue
+                # Like the ReplicaSet: lowest deletion cost first, then the newest node.
+                # Sessions on the removed node are lost.
+                node = min(reversed(self.nodes), key=lambda node: node["deletion_cost"])
+                self.nodes.remove(node)
+                self.killed_sessions += len(node["sessions"])
+        self.replicas = replicas
+        return True
+
+    async def get_raw(self, path):
+        if path == HUB_QUEUE_PATH:
+            return json.dumps({"value": [{"capabilities": {"browserName": "chrome"}}] * self.queue})
+        if path == HUB_STATUS_PATH:
+            nodes = []
+            for node in self.nodes:
+                slots = [{"session": {"sessionId": f"{node['name']}-{slot}"} if slot < len(node["sessions"]) else None}
+                         for slot in range(self.node_slots)]
+                nodes.append({"availability": "UP", "uri": f"http://{node['ip']}:5555", "slots": slots})
+            return json.dumps({"value": {"ready": True, "nodes": nodes}})
+        return None
+
+    def close(self):
+        pass
+
+    # Function to advance one tick: nodes come up, sessions finish, new requests queue and start
+    def tick(self):
+        started = [ready_at for ready_at in self.pending_nodes if ready_at <= self.now]
+        self.pending_nodes = [ready_at for ready_at in self.pending_nodes if ready_at > self.now]
+        for _ in started:
+            self.add_node()
+
+        self.queue += self.arrivals[self.now] if self.now < len(self.arrivals) else 0
+        # Fill the free slots node by node with the queued sessions
+        for node in self.nodes:
+            node["sessions"] = [remaining - 1 for remaining in node["sessions"] if remaining > 1]
+            starting = max(0, min(self.queue, self.node_slots - len(node["sessions"])))
+            node["sessions"] += [self.session_ticks] * starting
+            self.queue -= starting
+
+        self.queued_ticks += self.queue
+        self.node_ticks += self.replicas
+        self.max_queue = max(self.max_queue, self.queue)
+        self.now += 1
+
+    def summary(self):
+        return {
+            "queued_session_seconds": self.queued_ticks * self.tick_seconds,
+            "max_queue": self.max_queue,
+            "node_seconds": self.node_ticks * self.tick_seconds,
+            "scale_calls": self.scale_calls,
+            "killed_sessions": self.killed_sessions,
+        }
+
+# Function to parse "tick:count,..." bursts into per-tick arrivals
+def parse_bursts(text, ticks):
+    arrivals = [0] * ticks
+    for burst in filter(None, text.split(",")):
+        tick, count = burst.split(":")
+        if int(tick) < ticks:
+            arrivals[int(tick)] += int(count)
+    return arrivals
+
+# Function to replay a demand pattern against a SimulatedGrid, with or without the controller
+def simulate(grid, autoscaler=None, ticks=None):
+    previous = get_client()
+    set_client(grid)
+    try:
+        for _ in range(ticks or len(grid.arrivals)):
+            grid.tick()
+            if autoscaler:
+                asyncio.run(autoscaler.step())
+    finally:
+        set_client(previous)
+    return grid.summary()
+
+def print_simulation(rows):
+    print(f"📊 {'policy':<24} {'queued s':>9} {'max queue':>10} {'node s':>8} {'scales':>7} {'killed':>7}")
+    for name, summary in rows:
+        print(f"   {name:<24} {summary['queued_session_seconds']:>9} {summary['max_queue']:>10} "
+              f"{summary['node_seconds']:>8} {summary['scale_calls']:>7} {summary['killed_sessions']:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Scale chrome-node from the Selenium Hub's session queue and slot usage.")
+    parser.add_argument("--min_replicas", type=int, default=1, help="Lowest chrome-node replica count")
+    parser.add_argument("--max_replicas", type=int, default=5, help="Highest chrome-node replica count")
+    parser.add_argument("--headroom", type=int, default=1, help="Free session slots to keep ready ahead of demand")
+    parser.add_argument("--cooldown", type=float, default=120, help="Seconds demand must stay low before scaling down")
+    parser.add_argument("--interval", type=float, default=5, help="Seconds between polls of the hub")
+    parser.add_argument("--node_slots", type=int, default=1,
+                        help="Session slots per node when the hub reports no nodes (SE_NODE_MAX_SESSIONS)")
+    parser.add_argument("--cluster_client", choices=["api", "kubectl"], default="api", help="How to talk to the cluster")
+    parser.add_argument("--simulate", action="store_true", help="Run against a simulated hub and cluster instead")
+    parser.add_argument("--sim_ticks", type=int, default=120, help="Simulated ticks (of --interval seconds each)")
+    parser.add_argument("--sim_bursts", default="5:4,30:2,45:6,80:3", help="Session requests as tick:count,...")
+    parser.add_argument("--sim_session_ticks", type=int, default=6, help="Ticks each simulated session runs for")
+    parser.add_argument("--sim_startup_ticks", type=int, default=3, help="Ticks a new chrome-node takes to register")
+    args = parser.parse_args()
+
+    if args.simulate:
+        arrivals = parse_bursts(args.sim_bursts, args.sim_ticks)
+
+        def new_grid():
+            return SimulatedGrid(arrivals, args.sim_session_ticks, args.sim_startup_ticks, args.node_slots,
+                                 args.min_replicas, tick_seconds=args.interval)
+
+        grid = new_grid()
+        autoscaler = GridAutoscaler(DEPLOYMENT, args.min_replicas, args.max_replicas, args.headroom, args.cooldown,
+                                    args.node_slots, clock=grid.clock)
+        rows = [
+            (f"static {args.min_replicas} replica(s)", simulate(new_grid())),
+            (f"controller (headroom {args.headroom})", simulate(grid, autoscaler)),
+        ]
+        print_simulation(rows)
+        return
+
+    set_client(create_client(args.cluster_client))
+    print(f"📈 Autoscaling {DEPLOYMENT} between {args.min_replicas} and {args.max_replicas} replicas "
+          f"(headroom {args.headroom}, cooldown {args.cooldown:g}s). Press Ctrl+C to stop.")
+    autoscaler = GridAutoscaler(DEPLOYMENT, args.min_replicas, args.max_replicas, args.headroom, args.cooldown,
+                                args.node_slots)
+    try:
+        autoscaler.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        get_client().close()
+
+if __name__ == "__main__":
+    main()
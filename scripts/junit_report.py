@@ -0,0 +1,44 @@
+import xml.etree.ElementTree as ET
+
+# Pod-side path pytest writes its JUnit XML report to
+POD_JUNIT_PATH = "/tmp/insider-results.xml"
+
+# Function to turn a JUnit testcase's classname/name into a pytest node id
+def testcase_id(classname, name):
+    # Module-level tests only: "test_insider" + "test_homepage" -> "test_insider.py::test_homepage"
+    return f"{classname.replace('.', '/')}.py::{name}"
+
+# Function to stream per-test results out of a JUnit XML report without loading the whole tree
+def parse_junit(path):
+    results = []
+    for _, element in ET.iterparse(path, events=("end",)):
+        if element.tag != "testcase":
+            continue
+        outcome, message = "passed", ""
+        for child in element:
+            if child.tag in ("failure", "error"):
+                outcome, message = "failed" if child.tag == "failure" else "error", child.get("message", "")
+            elif child.tag == "skipped":
+                outcome, message = "skipped", child.get("message", "")
+        results.append({
+            "test_id": testcase_id(element.get("classname", ""), element.get("name", "")),
+            "outcome": outcome,
+            "duration": float(element.get("time") or 0),
+            "message": message,
+        })
+        element.clear()
+    return results
+
+# Function to print the per-test pass/fail/duration summary
+def print_summary(results):
+    icons = {"passed": "✅", "failed": "❌", "error": "💥", "skipped": "⏭️"}
+    print("📋 Test results")
+    for result in results:
+        print(f"   {icons[result['outcome']]} {result['test_id']:<50} {result['outcome']:<8} {result['duration']:7.2f}s")
+        if result["message"]:
+            print(f"      {result['message'].splitlines()[0][:200]}")
+    counts = {}
+    for result in results:
+        counts[result["outcome"]] = counts.get(result["outcome"], 0) + 1
+    total = sum(result["duration"] for result in results)
+    print(f"   {', '.join(f'{count} {outcome}' for outcome, count in counts.items())} ({total:.2f}s of test time)")
@@ -0,0 +1,51 @@
+import os
+import re
+import tempfile
+
+CHROME_NODE_MANIFEST = "kubernetes/deployments/chrome-node.yaml"
+
+# The container's `env:` line; its indentation anchors everything inserted next to it
+ENV_LINE = re.compile(r"^(?P<indent>[ \t]+)env:[ \t]*\n", re.MULTILINE)
+
+# Function to build the chrome-node env vars and resource block from the CLI settings
+def node_settings(max_sessions=1, overcommit=False, cpu_request=None, cpu_limit=None,
+                  memory_request=None, memory_limit=None):
+    env = {"SE_NODE_MAX_SESSIONS": str(max_sessions)}
+    if overcommit:
+        # Lets a node offer more sessions than it has CPUs
+        env["SE_NODE_OVERRIDE_MAX_SESSIONS"] = "true"
+    resources = {}
+    for section, values in (("requests", {"cpu": cpu_request, "memory": memory_request}),
+                            ("limits", {"cpu": cpu_limit, "memory": memory_limit})):
+        values = {key: value for key, value in values.items() if value}
+        if values:
+            resources[section] = values
+    return env, resources
+
+# Function to add env vars and resources to the chrome-node container without a YAML parser
+def render_chrome_node_manifest(text, env, resources):
+    match = ENV_LINE.search(text)
+    if not match:
+        raise ValueError("chrome-node manifest has no container env list")
+    indent = match.group("indent")
+    item_indent = indent + "  "
+
+    lines = []
+    if resources:
+        lines.append(f"{indent}resources:\n")
+        for section, values in resources.items():
+            lines.append(f"{indent}  {section}:\n")
+            lines += [f'{indent}    {key}: "{value}"\n' for key, value in values.items()]
+    lines.append(match.group(0))
+    for name, value in env.items():
+        lines.append(f'{item_indent}- name: {name}\n{item_indent}  value: "{value}"\n')
+    return text[:match.start()] + "".join(lines) + text[match.end():]
+
+# Function to write the rendered chrome-node manifest to a temp file and return its path
+def write_chrome_node_manifest(env, resources, template=CHROME_NODE_MANIFEST):
+    with open(template) as f:
+        rendered = render_chrome_node_manifest(f.read(), env, resources)
+    fd, path = tempfile.mkstemp(prefix="chrome-node-", suffix=".yaml")
+    with os.fdopen(fd, "w") as f:
+        f.write(rendered)
+    return path
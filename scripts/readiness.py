@@ -0,0 +1,108 @@
+import asyncio
+import json
+import os
+import shlex
+
+# kubectl binary (or command line) to run, overridable for fake clusters in tests
+KUBECTL = os.environ.get("KUBECTL", "kubectl")
+
+# Default readiness timeouts in seconds, per resource kind
+TIMEOUTS = {
+    "service": 30,
+    "deployment": 120,
+    "hpa": 30,
+    "pod": 120,
+}
+
+# Function to build the argument list for a kubectl invocation
+def kubectl_args(*args):
+    return shlex.split(KUBECTL) + list(args)
+
+# Function to parse "kind=seconds" overrides from the command line into TIMEOUTS
+def parse_timeouts(values):
+    timeouts = dict(TIMEOUTS)
+    for value in values or []:
+        kind, _, seconds = value.partition("=")
+        if kind not in timeouts or not seconds:
+            raise ValueError(f"Invalid timeout '{value}', expected one of {sorted(timeouts)}=<seconds>")
+        timeouts[kind] = float(seconds)
+    return timeouts
+
+# Readiness conditions, evaluated against each object the watch emits
+def resource_exists(obj):
+    return True
+
+def deployment_available(obj):
+    return (obj.get("status", {}).get("availableReplicas") or 0) > 0
+
+def pod_running(obj):
+    return obj.get("status", {}).get("phase") == "Running"
+
+# Decoder for the back-to-back JSON objects printed by `kubectl get --watch -o json`
+class JsonStreamDecoder:
+    def __init__(self):
+        self.buffer = ""
+        self.decoder = json.JSONDecoder()
+
+    # Function to add a chunk of output and return every object completed by it
+    def feed(self, text):
+        self.buffer += text
+        objects = []
+        while True:
+            self.buffer = self.buffer.lstrip()
+            if not self.buffer:
+                break
+            try:
+                obj, end = self.decoder.raw_decode(self.buffer)
+            except json.JSONDecodeError:
+                break  # Wait for the rest of the object
+            objects.append(obj)
+            self.buffer = self.buffer[end:]
+        return objects
+
+# Function to read watch events until one satisfies the condition or the stream ends
+async def read_until(stream, condition):
+    decoder = JsonStreamDecoder()
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return False
+        for obj in decoder.feed(chunk.decode("utf-8")):
+            if condition(obj):
+                return True
+
+# Function to watch a resource and return as soon as the condition is met
+async def watch_until(kind, name=None, selector=None, condition=resource_exists, timeout=60):
+    args = ["get", kind]
+    if name:
+        args.append(name)
+    if selector:
+        args += ["-l", selector]
+    args += ["--watch", "-o", "json"]
+
+    process = await asyncio.create_subprocess_exec(
+        *kubectl_args(*args), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        return await asyncio.wait_for(read_until(process.stdout, condition), timeout)
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+
+# Function to run a kubectl command without blocking the event loop
+async def run_kubectl(*args):
+    process = await asyncio.create_subprocess_exec(
+        *kubectl_args(*args), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        print(f"❌ Error executing command: {stderr.decode('utf-8')}")
+        return None
+    return stdout.decode("utf-8").strip()
+
+# Function to block until a resource is ready (synchronous wrapper around watch_until)
+def wait_for_resource(kind, name=None, selector=None, condition=resource_exists, timeout=60):
+    return asyncio.run(watch_until(kind, name, selector, condition, timeout))
@@ -0,0 +1,104 @@
+import os
+import re
+import sqlite3
+import time
+
+HISTORY_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "test_history.sqlite")
+# Recent attempts per test the flip rate and failure ranking look at
+HISTORY_WINDOW = 20
+FAILED_OUTCOMES = ("failed", "error")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    test_id TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    signature TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (run_id, attempt, test_id)
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (test_id, recorded_at);
+"""
+
+# Function to reduce a failure message to a stable signature, so the same failure
+# matches across runs (session ids, addresses, counts and timings are masked)
+def error_signature(message):
+    if not message:
+        return ""
+    line = message.strip().splitlines()[0]
+    line = re.sub(r"\b[0-9a-f]{16,}\b", "<id>", line)
+    line = re.sub(r"0x[0-9a-fA-F]+", "<addr>", line)
+    line = re.sub(r"\d+(\.\d+)?", "N", line)
+    return re.sub(r"\s+", " ", line)[:200]
+
+# Function to count how often consecutive attempts disagree (0 = stable, 1 = alternating).
+# Always-failing and always-passing tests both score 0; only flaky ones score high.
+def flip_rate(outcomes):
+    if len(outcomes) < 2:
+        return 0.0
+    failed = [outcome in FAILED_OUTCOMES for outcome in outcomes]
+    flips = sum(1 for previous, current in zip(failed, failed[1:]) if previous != current)
+    return flips / (len(failed) - 1)
+
+# Local SQLite store of every test attempt: outcome, duration and error signature
+class ResultHistory:
+    def __init__(self, path=None):
+        path = path or HISTORY_DB
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    # Function to store one pytest pass (attempt 1 is the full run, 2+ are reruns)
+    def record(self, run_id, attempt, results):
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, attempt, result["test_id"], result["outcome"], result["duration"],
+                  error_signature(result.get("message")), now)
+                 for result in results if result["outcome"] != "skipped"],
+            )
+
+    # Function to get a test's latest attempts, oldest first
+    def attempts(self, test_id, window=HISTORY_WINDOW):
+        rows = self.db.execute(
+            "SELECT outcome, duration, signature FROM results WHERE test_id = ? "
+            "ORDER BY recorded_at DESC, attempt DESC LIMIT ?", (test_id, window)).fetchall()
+        return list(reversed(rows))
+
+    def test_ids(self):
+        return [row[0] for row in self.db.execute("SELECT DISTINCT test_id FROM results ORDER BY test_id")]
+
+    # Function to summarize each test's recent attempts
+    def stats(self, window=HISTORY_WINDOW):
+        summary = {}
+        for test_id in self.test_ids():
+            attempts = self.attempts(test_id, window)
+            outcomes = [outcome for outcome, _, _ in attempts]
+            summary[test_id] = {
+                "attempts": len(attempts),
+                "failures": sum(1 for outcome in outcomes if outcome in FAILED_OUTCOMES),
+                "last_failed": outcomes[-1] in FAILED_OUTCOMES,
+                "flip_rate": flip_rate(outcomes),
+                "avg_duration": sum(duration for _, duration, _ in attempts) / len(attempts),
+                "last_signature": attempts[-1][2],
+            }
+        return summary
+
+    # Function to list the tests flaky enough to stop gating the run
+    def quarantined(self, threshold, min_attempts=5, window=HISTORY_WINDOW):
+        return sorted(test_id for test_id, stats in self.stats(window).items()
+                      if stats["attempts"] >= min_attempts and stats["flip_rate"] >= threshold)
+
+    # Function to pick the tests to run first: the latest failures, then the most failure-prone
+    def run_first(self, window=HISTORY_WINDOW):
+        stats = self.stats(window)
+        risky = [test_id for test_id, test in stats.items() if test["failures"]]
+        return sorted(risky, key=lambda test_id: (not stats[test_id]["last_failed"], -stats[test_id]["failures"],
+                                                  stats[test_id]["avg_duration"]))
+
+    def close(self):
+        self.db.close()
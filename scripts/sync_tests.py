@@ -0,0 +1,84 @@
+import hashlib
+import io
+import json
+import os
+import shlex
+import subprocess
+import tarfile
+
+from cluster_client import get_client
+
+REMOTE_ROOT = "/tests"
+MANIFEST_NAME = ".sync-manifest.json"
+
+# Never shipped to the pod: caches anywhere, host-side script and unit tests at the top level
+EXCLUDED_NAMES = {"__pycache__", ".pytest_cache"}
+EXCLUDED_TOP_LEVEL = {"scripts", "unit", MANIFEST_NAME}
+
+# Function to hash every file under the tests directory, keyed by relative POSIX path
+def hash_tree(root):
+    manifest = {}
+    for directory, dirnames, filenames in os.walk(root):
+        relative_dir = os.path.relpath(directory, root)
+        dirnames[:] = sorted(
+            name for name in dirnames
+            if name not in EXCLUDED_NAMES and not (relative_dir == "." and name in EXCLUDED_TOP_LEVEL)
+        )
+        for filename in sorted(filenames):
+            if filename.endswith(".pyc") or (relative_dir == "." and filename in EXCLUDED_TOP_LEVEL):
+                continue
+            path = os.path.join(directory, filename)
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            manifest[os.path.relpath(path, root).replace(os.sep, "/")] = digest
+    return manifest
+
+# Function to list the files to upload and the files to remove on the pod
+def diff_manifests(local, remote):
+    changed = [path for path, digest in local.items() if remote.get(path) != digest]
+    deleted = [path for path in remote if path not in local]
+    return changed, deleted
+
+# Function to pack the changed files and the new manifest into one gzip'd tarball
+def build_bundle(root, changed, manifest):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as bundle:
+        for path in changed:
+            bundle.add(os.path.join(root, path), arcname=path)
+        data = json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8")
+        info = tarfile.TarInfo(MANIFEST_NAME)
+        info.size = len(data)
+        bundle.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+# Function to read the manifest left in the pod by the previous sync (empty when there is none)
+def read_remote_manifest(pod_name, remote_root=REMOTE_ROOT):
+    result = get_client().exec(pod_name, ["cat", f"{remote_root}/{MANIFEST_NAME}"],
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    if result.returncode != 0:
+        return {}
+    try:
+        return json.loads(result.stdout)
+    except ValueError:
+        return {}
+
+# Function to upload only the files whose content changed since the last sync
+def sync_tests(pod_name, root="tests", remote_root=REMOTE_ROOT):
+    local = hash_tree(root)
+    changed, deleted = diff_manifests(local, read_remote_manifest(pod_name, remote_root))
+    if not changed and not deleted:
+        print(f"✅ Tests already up to date in the pod ({len(local)} files unchanged).")
+        return True
+
+    bundle = build_bundle(root, changed, local)
+    script = f"mkdir -p {shlex.quote(remote_root)} && tar xzf - -C {shlex.quote(remote_root)}"
+    if deleted:
+        script += f" && cd {shlex.quote(remote_root)} && rm -f " + " ".join(shlex.quote(path) for path in deleted)
+    result = get_client().exec(pod_name, ["sh", "-c", script], stdin=True,
+                               input=bundle, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        print(f"❌ Error syncing tests: {result.stderr.decode('utf-8')}")
+        return False
+
+    print(f"📦 Synced {len(changed)} changed file(s) ({len(bundle) / 1024:.1f} KB), removed {len(deleted)}.")
+    return True
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import re
+import subprocess
+import threading
+
+from cluster_client import get_client
+
+# chrome-node pod usage from metrics-server, read through the API server
+CHROME_NODE_METRICS_PATH = "/apis/metrics.k8s.io/v1beta1/namespaces/default/pods?labelSelector=app%3Dchrome-node"
+POD_BENCHMARK = "/tests/insider/throughput_benchmark.py"
+RESULT_PREFIX = "THROUGHPUT_RESULT "
+MEMORY_UNITS = {"": 1, "k": 1000, "M": 1000 ** 2, "G": 1000 ** 3,
+                "Ki": 1024, "Mi": 1024 ** 2, "Gi": 1024 ** 3}
+
+# Function to turn a Kubernetes memory quantity ("123456Ki", "2Gi") into bytes
+def parse_memory(quantity):
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)(Ki|Mi|Gi|k|M|G)?", quantity)
+    if not match:
+        raise ValueError(f"Unsupported memory quantity '{quantity}'")
+    return float(match.group(1)) * MEMORY_UNITS[match.group(2) or ""]
+
+# Function to sum the memory used by all chrome-node pods, or None without metrics-server
+async def get_chrome_node_memory():
+    output = await get_client().get_raw(CHROME_NODE_METRICS_PATH)
+    if not output:
+        return None
+    try:
+        pods = json.loads(output)["items"]
+        return sum(parse_memory(container["usage"]["memory"]) for pod in pods for container in pod["containers"])
+    except (ValueError, KeyError):
+        return None
+
+# Background poller that keeps the peak chrome-node memory seen while a benchmark runs
+class MemorySampler:
+    def __init__(self, interval=2):
+        self.interval = interval
+        self.peak = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            memory = asyncio.run(get_chrome_node_memory())
+            if memory is not None:
+                self.peak = memory if self.peak is None else max(self.peak, memory)
+            self.stop_event.wait(self.interval)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop_event.set()
+        self.thread.join()
+
+# Function to pull the JSON summary line out of the pod-side benchmark output
+def parse_result(output):
+    for line in reversed(output.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    return None
+
+# Function to run the pod-side benchmark at each concurrency level and measure node memory around it
+def run_throughput_benchmark(pod_name, levels, duration=60, profile="default", replay="replay"):
+    rows = []
+    for sessions in levels:
+        print(f"🏎️ Throughput benchmark: {sessions} concurrent session(s) for {duration:g}s...")
+        idle = asyncio.run(get_chrome_node_memory())
+        command = ["python", POD_BENCHMARK, "--sessions", str(sessions), "--duration", str(duration),
+                   "--profile", profile, "--replay", replay]
+        with MemorySampler() as sampler:
+            process = get_client().exec(pod_name, command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        result = parse_result(process.stdout or "")
+        if result is None:
+            print(f"❌ No benchmark result for {sessions} session(s):\n{(process.stdout or '')[-2000:]}")
+            continue
+        if idle is not None and sampler.peak is not None:
+            result["node_mb_per_session"] = round((sampler.peak - idle) / sessions / (1024 * 1024), 1)
+        else:
+            result["node_mb_per_session"] = None
+        rows.append(result)
+    print_throughput(rows)
+    return rows
+
+# Function to print one row per concurrency level and point at the densest one without failures
+def print_throughput(rows):
+    print(f"📊 {'sessions':>8} {'completed':>10} {'failed':>7} {'per min':>8} {'create p50':>11} "
+          f"{'load p50':>9} {'node MB/session':>16} {'JS heap MB':>11}")
+    for row in rows:
+        node_mb = f"{row['node_mb_per_session']:.1f}" if row.get("node_mb_per_session") is not None else "-"
+        heap_mb = f"{row['heap_mb_p50']:.1f}" if row.get("heap_mb_p50") is not None else "-"
+        create = f"{row['create_p50']:.2f}s" if row.get("create_p50") is not None else "-"
+        load = f"{row['load_p50']:.2f}s" if row.get("load_p50") is not None else "-"
+        print(f"   {row['sessions']:>8} {row['completed']:>10} {row['failed']:>7} {row['sessions_per_minute']:>8.1f} "
+              f"{create:>11} {load:>9} {node_mb:>16} {heap_mb:>11}")
+    stable = [row for row in rows if row["failed"] == 0 and row["completed"] > 0]
+    if stable:
+        best = max(stable, key=lambda row: (row["sessions_per_minute"], row["sessions"]))
+        print(f"🏆 Best stable level: {best['sessions']} concurrent session(s), "
+              f"{best['sessions_per_minute']:.1f} sessions/minute.")
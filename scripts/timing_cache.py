@@ -0,0 +1,29 @@
+import json
+import os
+
+TIMINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "test_timings.json")
+HISTORY_LENGTH = 5
+
+# Function to load the recorded durations (last HISTORY_LENGTH runs per test)
+def load_timings(path=None):
+    path = path or TIMINGS_FILE
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+# Function to append the durations of the latest run and save the cache
+def save_timings(durations, path=None):
+    path = path or TIMINGS_FILE
+    timings = load_timings(path)
+    for test_id, duration in durations.items():
+        timings[test_id] = (timings.get(test_id, []) + [round(duration, 3)])[-HISTORY_LENGTH:]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+    return timings
+
+# Function to average the recorded durations per test
+def average_durations(timings):
+    return {test_id: sum(runs) / len(runs) for test_id, runs in timings.items() if runs}
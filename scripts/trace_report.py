@@ -0,0 +1,90 @@
+import argparse
+import glob
+import json
+import os
+
+# Local directory the per-run trace files are copied back into
+TRACES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "traces")
+
+# Function to read every span from one or more JSONL trace files
+def load_spans(paths):
+    spans = []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    print(f"⚠️ Skipping malformed span line in {path}")
+    return spans
+
+# Function to compute a percentile with linear interpolation between closest ranks
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+# Function to group spans by name and summarize their durations across runs
+def aggregate(spans, kinds=None):
+    groups = {}
+    for span in spans:
+        if kinds and span.get("kind") not in kinds:
+            continue
+        group = groups.setdefault(span["name"], {"kind": span.get("kind"), "durations": [], "runs": set(), "errors": 0})
+        group["durations"].append(span["duration"])
+        group["runs"].add(span.get("run_id"))
+        group["errors"] += span.get("status") == "error"
+
+    summary = {}
+    for name, group in groups.items():
+        durations = group["durations"]
+        summary[name] = {
+            "kind": group["kind"],
+            "count": len(durations),
+            "runs": len(group["runs"]),
+            "errors": group["errors"],
+            "total": sum(durations),
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "max": max(durations),
+        }
+    return summary
+
+# Function to print the hottest span names first (by total time spent in them)
+def print_report(summary, sort_by="total", top=None):
+    rows = sorted(summary.items(), key=lambda item: item[1][sort_by], reverse=True)
+    if top:
+        rows = rows[:top]
+    print(f"⏱️ {'Span':<40} {'kind':<8} {'count':>6} {'runs':>5} {'p50':>8} {'p95':>8} {'max':>8} {'total':>9} {'errors':>6}")
+    for name, row in rows:
+        print(f"   {name[:40]:<40} {row['kind'] or '':<8} {row['count']:>6} {row['runs']:>5} "
+              f"{row['p50']:>7.3f}s {row['p95']:>7.3f}s {row['max']:>7.3f}s {row['total']:>8.2f}s {row['errors']:>6}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate test trace spans into p50/p95 per step.")
+    parser.add_argument("paths", nargs="*", help=f"JSONL trace files (default: every file in {TRACES_DIR})")
+    parser.add_argument("--kind", action="append", choices=["test", "session", "step", "wait", "command"],
+                        help="Only include spans of this kind (repeatable)")
+    parser.add_argument("--sort", choices=["total", "p50", "p95", "max", "count"], default="total",
+                        help="Column to rank the spans by")
+    parser.add_argument("--top", type=int, help="Only show the first N spans")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(TRACES_DIR, "*.jsonl")))
+    if not paths:
+        print(f"❌ No trace files given and none found in {TRACES_DIR}.")
+        exit(1)
+
+    spans = load_spans(paths)
+    print(f"📂 {len(spans)} spans from {len(paths)} trace file(s).")
+    print_report(aggregate(spans, args.kind), args.sort, args.top)
+
+if __name__ == "__main__":
+    main()
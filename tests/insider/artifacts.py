@@ -0,0 +1,105 @@
+import io
+import json
+import os
+import queue
+import re
+import tarfile
+import threading
+import time
+import urllib.request
+import uuid
+
+ARTIFACTS_DIR = os.environ.get("INSIDER_ARTIFACTS_DIR", "/tmp/insider-artifacts")
+# Optional HTTP endpoint the archives are PUT to as <url>/<name>.tar.gz (e.g. an artifact store)
+UPLOAD_URL = os.environ.get("INSIDER_ARTIFACTS_UPLOAD_URL")
+
+# Runs in the browser: the page state in one round-trip instead of separate url/title/source calls
+PAGE_STATE_SCRIPT = """
+return {url: location.href, title: document.title, html: document.documentElement.outerHTML};
+"""
+
+# Function to build a file name that is unique per test, xdist worker and attempt
+def artifact_name(nodeid, worker=None):
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", nodeid).strip("-")
+    worker = worker or os.environ.get("PYTEST_XDIST_WORKER", "main")
+    return f"{slug}__{worker}__{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+# Function to grab the screenshot, page source and console logs while the session is held.
+# Only the raw data is fetched here; everything else happens on the uploader thread.
+def capture(driver, since=None):
+    files = {}
+    errors = []
+    try:
+        files["screenshot.png"] = driver.get_screenshot_as_png()
+    except Exception as e:
+        errors.append(f"screenshot: {str(e)}")
+    try:
+        state = driver.execute_script(PAGE_STATE_SCRIPT)
+        files["page.html"] = state.pop("html").encode("utf-8")
+    except Exception as e:
+        state = {}
+        errors.append(f"page source: {str(e)}")
+    try:
+        logs = driver.get_log("browser")
+        if since is not None:
+            # Pooled sessions keep earlier tests' messages in the buffer
+            logs = [entry for entry in logs if entry.get("timestamp", 0) >= since * 1000]
+        files["console.json"] = json.dumps(logs, indent=2).encode("utf-8")
+    except Exception as e:
+        errors.append(f"console logs: {str(e)}")
+    return files, dict(state, capture_errors=errors)
+
+# Function to pack the captured files and metadata into one gzip'd tarball in memory
+def build_archive(files, meta):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, data in dict(files, **{"meta.json": json.dumps(meta, indent=2).encode("utf-8")}).items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+# Background writer: compresses, stores and optionally uploads artifacts off the test's critical path
+class ArtifactUploader:
+    def __init__(self, directory=ARTIFACTS_DIR, upload_url=UPLOAD_URL):
+        self.directory = directory
+        self.upload_url = upload_url
+        self.jobs = queue.Queue()
+        self.written = []
+        self.failures = []
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # Function to queue an artifact; returns the path it will be written to
+    def submit(self, name, files, meta):
+        path = os.path.join(self.directory, f"{name}.tar.gz")
+        self.jobs.put((name, path, files, meta))
+        return path
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+            name, path, files, meta = job
+            try:
+                data = build_archive(files, meta)
+                os.makedirs(self.directory, exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data)
+                if self.upload_url:
+                    request = urllib.request.Request(f"{self.upload_url.rstrip('/')}/{name}.tar.gz", data=data,
+                                                     method="PUT", headers={"Content-Type": "application/gzip"})
+                    urllib.request.urlopen(request, timeout=30).close()
+                self.written.append(path)
+            except Exception as e:
+                self.failures.append(f"{name}: {str(e)}")
+            finally:
+                self.jobs.task_done()
+
+    # Function to wait for queued artifacts at the end of the session
+    def close(self):
+        self.jobs.put(None)
+        self.thread.join()
@@ -0,0 +1,86 @@
+import json
+import os
+
+# URL patterns the "fast" profile blocks: media, fonts and third-party trackers
+# that none of the assertions look at
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mov",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*linkedin.com/px*",
+    "*snap.licdn.com*", "*bat.bing.com*", "*clarity.ms*", "*hubspot.com*", "*hs-scripts.com*",
+    "*vimeo.com*", "*youtube.com*", "*ytimg.com*",
+]
+
+# Named browser profiles: "default" matches the original options, "fast" trims page weight
+PROFILES = {
+    "default": {"page_load_strategy": "normal", "images": True, "block_urls": False},
+    "fast": {"page_load_strategy": "eager", "images": False, "block_urls": True},
+}
+
+PAGE_WEIGHTS_FILE = os.environ.get("PAGE_WEIGHTS_FILE", "/tmp/insider-page-weights.json")
+
+# Runs in the browser: number of requests and bytes transferred for the current page
+PAGE_WEIGHT_SCRIPT = """
+const entries = performance.getEntriesByType("navigation").concat(performance.getEntriesByType("resource"));
+return {
+    url: location.href,
+    requests: entries.length,
+    bytes: entries.reduce((total, entry) => total + (entry.transferSize || entry.encodedBodySize || 0), 0),
+};
+"""
+
+# Function to add a profile's capabilities to the Chrome options
+def apply_profile_options(options, profile):
+    settings = PROFILES[profile]
+    options.page_load_strategy = settings["page_load_strategy"]
+    if not settings["images"]:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+# Function to run a Chrome DevTools command through the grid's CDP endpoint
+def execute_cdp(driver, command, params=None):
+    # webdriver.Remote has no execute_cdp_cmd, so register chromedriver's endpoint by hand
+    driver.command_executor._commands["executeCdpCommand"] = ("POST", "/session/$sessionId/goog/cdp/execute")
+    return driver.execute("executeCdpCommand", {"cmd": command, "params": params or {}})["value"]
+
+# Function to switch on the session-level parts of a profile (network interception)
+def enable_profile(driver, profile):
+    if PROFILES[profile]["block_urls"]:
+        execute_cdp(driver, "Network.enable")
+        execute_cdp(driver, "Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+# Function to measure the requests and bytes of the page currently loaded
+def measure_page_weight(driver):
+    return driver.execute_script(PAGE_WEIGHT_SCRIPT)
+
+# Function to compare a page's weight with the default-profile baseline and print the savings.
+# Default-profile runs store the baseline; for other profiles a missing baseline is measured
+# with measure_default(url), which loads the same page in a default-profile session.
+def report_page_weight(driver, profile, path=PAGE_WEIGHTS_FILE, measure_default=None):
+    weight = measure_page_weight(driver)
+    page = weight["url"].split("#")[0].split("?")[0]
+    try:
+        with open(path) as f:
+            baselines = json.load(f)
+    except (OSError, ValueError):
+        baselines = {}
+
+    line = f"📦 [{profile}] {page}: {weight['requests']} requests, {weight['bytes'] / 1024:.0f} KB"
+    baseline = None
+    if profile == "default":
+        baseline = weight
+    elif page not in baselines and measure_default is not None:
+        baseline = measure_default(weight["url"])
+    if baseline is not None:
+        baselines[page] = {"requests": baseline["requests"], "bytes": baseline["bytes"]}
+        with open(path, "w") as f:
+            json.dump(baselines, f, indent=2)
+    if profile != "default" and page in baselines:
+        baseline = baselines[page]
+        line += (f" (saved {baseline['requests'] - weight['requests']} requests, "
+                 f"{(baseline['bytes'] - weight['bytes']) / 1024:.0f} KB vs default)")
+    print(line)
+    return weight
@@ -0,0 +1,269 @@
+import functools
+import json
+import os
+import time
+
+import pytest
+
+from artifacts import ARTIFACTS_DIR, ArtifactUploader, artifact_name, capture
+from browser_profiles import PROFILES, measure_page_weight, report_page_weight
+from driver_pool import DriverPool, initialize_driver, merge_stats, format_stats
+from replay import MODES, REPLAY_ARCHIVE, ReplayArchive, ReplayServer, set_replay_server
+from tracing import TRACE_FILE, Tracer, instrument_driver, set_tracer, span
+from waits import WAIT_LATENCIES_FILE, load_latencies, save_latencies, set_latency_book
+from fixture_server import FixtureServer
+from pages import LocatorStats
+
+def pytest_addoption(parser):
+    parser.addoption("--driver-pool-size", type=int, default=1,
+                     help="Number of idle Remote sessions each worker keeps warm")
+    parser.addoption("--browser-profile", choices=sorted(PROFILES), default="default",
+                     help="Browser profile for tests without a browser_profile marker")
+    parser.addoption("--report-page-weight", action="store_true", default=False,
+                     help="Print requests/bytes of each test's last page and the savings vs the default profile")
+    parser.addoption("--replay", choices=MODES, default=os.environ.get("INSIDER_REPLAY", "off"),
+                     help="Record live pages into the replay archive, or replay them from it without network")
+    parser.addoption("--replay-archive", default=REPLAY_ARCHIVE,
+                     help="Directory of the record/replay archive")
+    parser.addoption("--trace-file", default=TRACE_FILE,
+                     help="Append timing spans for WebDriver commands and test steps to this JSONL file")
+    parser.addoption("--wait-latencies", default=WAIT_LATENCIES_FILE,
+                     help="JSON file of recent wait latencies used to size wait timeouts")
+    parser.addoption("--artifacts-dir", default=ARTIFACTS_DIR,
+                     help="Directory for the screenshot/DOM/console archives of failed tests")
+    parser.addoption("--parallel-jobs", action="store_true", default=False,
+                     help="Check QA job detail pages concurrently over several Remote sessions")
+    parser.addoption("--parallel-jobs-max", type=int, default=None,
+                     help="Upper bound on the sessions used by --parallel-jobs (default: free grid slots)")
+
+def pytest_configure(config):
+    config._driver_pool_stats = []
+    config.addinivalue_line("markers", "browser_profile(name): run the test with a named browser profile (default, fast)")
+
+def pytest_collection_modifyitems(config, items):
+    # Run the tests that failed recently first (picked from the host-side test history),
+    # then the longest first so xdist workers finish together; tests with no recorded
+    # duration go first so they get measured
+    timings = json.loads(os.environ.get("PYTEST_TEST_TIMINGS") or "{}")
+    first = {test_id: rank for rank, test_id in enumerate(json.loads(os.environ.get("PYTEST_TEST_FIRST") or "[]"))}
+    if timings or first:
+        items.sort(key=lambda item: (first.get(item.nodeid, len(first)), -timings.get(item.nodeid, float("inf"))))
+
+# Keep each phase's report on the item, so fixtures can tell in teardown whether the test failed
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+    # No session to capture from (e.g. the grid refused it): still leave a record of why
+    if report.when == "setup" and report.failed and "driver" in getattr(item, "fixturenames", ()):
+        uploader = getattr(item.config, "_artifact_uploader", None)
+        if uploader is not None:
+            meta = {"test": item.nodeid, "phase": "setup", "error": report.longreprtext}
+            uploader.submit(artifact_name(item.nodeid), {}, meta)
+
+# Session-wide background writer for failure artifacts
+@pytest.fixture(scope="session")
+def artifact_uploader(request):
+    uploader = ArtifactUploader(request.config.getoption("--artifacts-dir"))
+    request.config._artifact_uploader = uploader
+    yield uploader
+    uploader.close()
+    request.config._artifact_uploader = None
+    if uploader.written:
+        print(f"\n📦 {len(uploader.written)} failure artifact(s) in {uploader.directory}")
+    for failure in uploader.failures:
+        print(f"⚠️ Could not store artifact {failure}")
+
+# Function to grab the failed test's browser state and queue it, so the session is handed back right away
+def save_failure_artifact(request, driver, uploader, started):
+    report = getattr(request.node, "rep_call", None)
+    if report is None or not report.failed:
+        return
+    try:
+        with span("artifact.capture"):
+            files, meta = capture(driver, since=started)
+    except Exception as e:
+        files, meta = {}, {"capture_errors": [str(e)]}
+    meta.update(test=request.node.nodeid, phase="call", error=report.longreprtext)
+    path = uploader.submit(artifact_name(request.node.nodeid), files, meta)
+    request.node.user_properties.append(("artifact", path))
+    print(f"📸 Failure artifact queued: {path}")
+
+# Session-wide pools of warm Remote sessions, one per browser profile (each xdist worker gets its own)
+@pytest.fixture(scope="session")
+def driver_pools(request):
+    pools = {}
+    yield pools
+    for pool in pools.values():
+        pool.close()
+        request.config._driver_pool_stats.append(pool.stats())
+
+# Browser profile for the current test: the browser_profile marker, else --browser-profile
+@pytest.fixture
+def browser_profile(request):
+    marker = request.node.get_closest_marker("browser_profile")
+    profile = marker.args[0] if marker else request.config.getoption("--browser-profile")
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown browser profile '{profile}', expected one of {sorted(PROFILES)}")
+    return profile
+
+# Session-wide record/replay server; pages open through it unless --replay is off
+@pytest.fixture(scope="session")
+def replay_server(request):
+    mode = request.config.getoption("--replay")
+    if mode == "off":
+        yield None
+        return
+    server = ReplayServer(mode, ReplayArchive(request.config.getoption("--replay-archive"))).start()
+    set_replay_server(server)
+    yield server
+    set_replay_server(None)
+    server.stop()
+    print(f"\n🎞️ Replay ({mode}): {server.summary()}")
+
+# Session-wide span writer, active only when --trace-file is given
+@pytest.fixture(scope="session")
+def tracer(request):
+    path = request.config.getoption("--trace-file")
+    if not path:
+        yield None
+        return
+    tracer = Tracer(path)
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(None)
+    tracer.close()
+
+# Wrap every test in a span, so its steps and commands can be grouped per test
+@pytest.fixture(autouse=True)
+def trace_test(request, tracer):
+    if tracer is None:
+        yield
+        return
+    tracer.test = request.node.nodeid
+    with span("test", kind="test") as current:
+        yield
+        # pytest doesn't raise the test's exception into fixtures: take the outcome from its reports
+        reports = [getattr(request.node, f"rep_{when}", None) for when in ("setup", "call")]
+        if any(report is not None and report.failed for report in reports):
+            current["status"] = "error"
+    tracer.test = None
+
+# Function to create a Remote session inside a span and time its commands from then on
+def create_traced_driver(profile):
+    with span("session.create", kind="session", profile=profile):
+        return instrument_driver(initialize_driver(profile))
+
+# Session-wide wait latency history: loaded before the first wait, merged back at the end
+@pytest.fixture(scope="session")
+def wait_latencies(request):
+    path = request.config.getoption("--wait-latencies")
+    book = load_latencies(path)
+    set_latency_book(book)
+    yield book
+    try:
+        save_latencies(book, path)
+    except OSError as e:
+        print(f"⚠️ Could not save wait latencies: {str(e)}")
+
+# Function to create a session for a profile's pool. A worker may have a single grid slot
+# (SE_NODE_MAX_SESSIONS=1, -n sized to the free slots), so the other profiles' idle sessions
+# are quit first instead of holding the slot the new session is waiting for.
+def create_pooled_driver(driver_pools, profile):
+    for other_profile, pool in driver_pools.items():
+        if other_profile != profile:
+            pool.close()
+    return create_traced_driver(profile)
+
+# Function to get (or create) the session pool of a browser profile
+def get_driver_pool(request, driver_pools, profile):
+    if profile not in driver_pools:
+        driver_pools[profile] = DriverPool(
+            factory=functools.partial(create_pooled_driver, driver_pools, profile),
+            max_idle=request.config.getoption("--driver-pool-size"),
+        )
+    return driver_pools[profile]
+
+# Function to measure a page in a default-profile session, the baseline the other profiles are compared to.
+# The test's own session is handed back first, so the baseline session can take its grid slot.
+def measure_default_page_weight(request, driver_pools, release_test_driver, url):
+    release_test_driver()
+    pool = get_driver_pool(request, driver_pools, "default")
+    baseline_driver = pool.acquire()
+    try:
+        baseline_driver.get(url)
+        return measure_page_weight(baseline_driver)
+    finally:
+        pool.release(baseline_driver)
+
+# Session pool of the current test's browser profile, also used for extra sessions a test opens
+@pytest.fixture
+def driver_pool(request, driver_pools, browser_profile):
+    return get_driver_pool(request, driver_pools, browser_profile)
+
+# Per-test driver taken from the profile's pool and reset when handed back
+@pytest.fixture
+def driver(request, driver_pool, driver_pools, browser_profile, replay_server, wait_latencies, artifact_uploader):
+    driver = driver_pool.acquire()
+    started = time.time()
+    released = []
+
+    # Function to hand the session back once, whichever of the teardown steps gets there first
+    def release():
+        if not released:
+            released.append(driver)
+            driver_pool.release(driver)
+
+    yield driver
+    save_failure_artifact(request, driver, artifact_uploader, started)
+    if request.config.getoption("--report-page-weight"):
+        try:
+            measure_default = functools.partial(measure_default_page_weight, request, driver_pools, release)
+            report_page_weight(driver, browser_profile, measure_default=measure_default)
+        except Exception as e:
+            print(f"⚠️ Could not measure page weight: {str(e)}")
+    release()
+
+# Static server for tests/insider/fixtures, reachable from the chrome-node browsers
+@pytest.fixture(scope="session")
+def fixture_server():
+    server = FixtureServer().start()
+    yield server
+    server.stop()
+
+# Per-test locator lookup counts and wait time, also recorded in the JUnit report
+@pytest.fixture
+def locator_stats(record_property):
+    stats = LocatorStats()
+    yield stats
+    record_property("locator_lookups", stats.lookups)
+    record_property("locator_cache_hits", stats.cache_hits)
+    record_property("locator_wait_time", round(stats.wait_time, 3))
+    print(f"🔎 {stats.summary()}")
+
+# Max sessions for the parallel job check, or None when the mode is off
+@pytest.fixture
+def parallel_jobs(request):
+    if not request.config.getoption("--parallel-jobs"):
+        return None
+    return request.config.getoption("--parallel-jobs-max") or 0
+
+def pytest_sessionfinish(session):
+    # On xdist workers, ship the pool stats back to the controller process
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["driver_pool_stats"] = session.config._driver_pool_stats
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    stats = getattr(node, "workeroutput", {}).get("driver_pool_stats", [])
+    node.config._driver_pool_stats.extend(stats)
+
+def pytest_terminal_summary(terminalreporter, config):
+    stats = config._driver_pool_stats
+    if not stats:
+        return
+    terminalreporter.section("driver pool")
+    for line in format_stats(merge_stats(stats)):
+        terminalreporter.write_line(line)
@@ -0,0 +1,168 @@
+from selenium import webdriver
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from browser_profiles import apply_profile_options, enable_profile, execute_cdp
+
+HUB_URL = os.environ.get("SELENIUM_REMOTE_URL", "http://selenium-hub:4444/wd/hub")
+WINDOW_SIZE = (1920, 1080)
+
+# Function to get chrome options
+def get_chrome_options(profile="default"):
+    # Set up Chrome options
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    # Keep console messages so failure artifacts can include them
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+    return apply_profile_options(options, profile)
+
+# Function to set driver options
+def initialize_driver(profile="default"):
+    chrome_options = get_chrome_options(profile)
+    driver = webdriver.Remote(
+        command_executor=HUB_URL,
+        options=chrome_options
+    )
+
+    # Set Browser Window to Desktop View
+    driver.set_window_size(*WINDOW_SIZE)
+
+    # Turn on the profile's network interception (no-op for the default profile)
+    enable_profile(driver, profile)
+
+    return driver
+
+# Function to get the origin of a page URL (None for about:blank, data: and similar pages)
+def page_origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") else None
+
+# Function to bring a used session back to a clean desktop state
+def reset_driver(driver):
+    handles = driver.window_handles
+    origins = set()
+
+    # Close every tab except the first one, noting the origin each tab was on
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        origins.add(page_origin(driver.current_url))
+        driver.close()
+    driver.switch_to.window(handles[0])
+    origins.add(page_origin(driver.current_url))
+
+    # sessionStorage belongs to the tab and CDP can't clear it, so clear it before leaving the page
+    try:
+        driver.execute_script("window.sessionStorage.clear();")
+    except Exception:
+        pass  # about:blank and data: pages have no storage to clear
+
+    # Cookies of every host and the storage of every origin the tabs were on, not only the current page's
+    execute_cdp(driver, "Network.clearBrowserCookies")
+    for origin in sorted(origins - {None}):
+        execute_cdp(driver, "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+
+    driver.get("about:blank")
+    driver.set_window_size(*WINDOW_SIZE)
+
+# Function to check that a pooled session is still alive on the grid
+def is_driver_alive(driver):
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+# Pool of warm Remote sessions, one pool per pytest process (and so per xdist worker)
+class DriverPool:
+    def __init__(self, factory=initialize_driver, max_idle=1):
+        self.factory = factory
+        self.max_idle = max_idle
+        self.idle = []
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.creation_times = []
+
+    # Function to hand out a warm session, creating one only when none is usable
+    def acquire(self):
+        while True:
+            with self.lock:
+                driver = self.idle.pop() if self.idle else None
+            if driver is None:
+                break
+            if is_driver_alive(driver):
+                with self.lock:
+                    self.hits += 1
+                return driver
+            self.discard(driver)
+
+        start = time.perf_counter()
+        driver = self.factory()
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.misses += 1
+            self.creation_times.append(elapsed)
+        return driver
+
+    # Function to take a session back, resetting it for the next test
+    def release(self, driver, reusable=True):
+        if reusable:
+            try:
+                reset_driver(driver)
+            except Exception as e:
+                print(f"⚠️ Could not reset pooled session, discarding it: {str(e)}")
+                reusable = False
+
+        with self.lock:
+            if reusable and len(self.idle) < self.max_idle:
+                self.idle.append(driver)
+                return
+        self.discard(driver)
+
+    # Function to quit a session, ignoring sessions the grid already dropped
+    def discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    # Function to quit every idle session at the end of the run
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for driver in idle:
+            self.discard(driver)
+
+    # Function to export hit/miss and session-creation latency numbers
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "creation_times": list(self.creation_times),
+            }
+
+# Function to merge stats coming from several pools (e.g. xdist workers)
+def merge_stats(stats_list):
+    merged = {"hits": 0, "misses": 0, "creation_times": []}
+    for stats in stats_list:
+        merged["hits"] += stats["hits"]
+        merged["misses"] += stats["misses"]
+        merged["creation_times"].extend(stats["creation_times"])
+    return merged
+
+# Function to format pool stats as report lines
+def format_stats(stats):
+    total = stats["hits"] + stats["misses"]
+    times = stats["creation_times"]
+    lines = [f"Driver pool: {stats['hits']} hits / {stats['misses']} misses ({total} acquisitions)"]
+    if times:
+        avg = sum(times) / len(times)
+        lines.append(
+            f"Session creation: {len(times)} sessions, avg {avg:.2f}s, min {min(times):.2f}s, max {max(times):.2f}s"
+        )
+    return lines
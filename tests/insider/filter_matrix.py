@@ -0,0 +1,63 @@
+import json
+import os
+
+from tracing import span
+
+FILTER_MATRIX_FILE = os.environ.get(
+    "INSIDER_JOB_FILTERS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "job_filters.json")
+)
+
+# Function to load the location/department pairs to check (min_jobs defaults to 0)
+def load_filter_matrix(path=FILTER_MATRIX_FILE):
+    with open(path) as f:
+        combinations = json.load(f)["combinations"]
+    for combination in combinations:
+        if not combination.get("location") or not combination.get("department"):
+            raise ValueError(f"Filter combination needs a location and a department: {combination}")
+        combination.setdefault("min_jobs", 0)
+    return combinations
+
+# Function to list the listings that don't match the applied filters
+def check_listings(records, location, department):
+    mismatches = []
+    for record in records:
+        if location not in record["location"]:
+            mismatches.append(f"'{record['title']}' is in '{record['location']}', not '{location}'")
+        if department not in record["department"]:
+            mismatches.append(f"'{record['title']}' is in '{record['department']}', not '{department}'")
+    return mismatches
+
+# Function to apply every combination in turn on one open positions page and validate its listings
+def run_filter_matrix(page, combinations):
+    results = []
+    for combination in combinations:
+        location, department = combination["location"], combination["department"]
+        result = {"location": location, "department": department, "jobs": 0, "mismatches": [], "error": None}
+        try:
+            with span("step.filter_combination", location=location, department=department):
+                page.apply_filters(location, department)
+                records = page.extract_jobs()
+            result["jobs"] = len(records)
+            result["mismatches"] = check_listings(records, location, department)
+            if len(records) < combination["min_jobs"]:
+                result["mismatches"].append(f"expected at least {combination['min_jobs']} job(s), found {len(records)}")
+        except Exception as e:
+            # One bad combination (e.g. a retired option) must not hide the rest of the matrix
+            result["error"] = str(e).splitlines()[0] if str(e) else type(e).__name__
+        results.append(result)
+    return results
+
+# Function to print one line per combination and return the failed ones
+def print_matrix_report(results):
+    print(f"🧮 Filter matrix: {len(results)} combination(s)")
+    failed = []
+    for result in results:
+        ok = not result["error"] and not result["mismatches"]
+        print(f"   {'✅' if ok else '❌'} {result['location']:<28} {result['department']:<24} {result['jobs']:>3} job(s)")
+        if result["error"]:
+            print(f"      Error: {result['error']}")
+        for mismatch in result["mismatches"]:
+            print(f"      {mismatch}")
+        if not ok:
+            failed.append(result)
+    return failed
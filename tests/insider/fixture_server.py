@@ -0,0 +1,35 @@
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import functools
+import os
+import socket
+import threading
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Function to pick the address the chrome-node browsers can reach this pod on
+def get_reachable_host():
+    return os.environ.get("FIXTURE_HOST") or socket.gethostbyname(socket.gethostname())
+
+# Quiet static file handler for the fixtures directory
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+# Static HTTP server for the HTML fixtures, so the Remote browser can load them from disk
+class FixtureServer:
+    def __init__(self, directory=FIXTURES_DIR, host=None):
+        handler = functools.partial(QuietHandler, directory=directory)
+        self.httpd = ThreadingHTTPServer(("0.0.0.0", 0), handler)
+        self.httpd.daemon_threads = True
+        self.host = host or get_reachable_host()
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url(self, path=""):
+        return f"http://{self.host}:{self.httpd.server_address[1]}/{path.lstrip('/')}"
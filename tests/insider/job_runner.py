@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import urllib.request
+
+from driver_pool import HUB_URL
+from pages import JobPage
+from tracing import traced
+
+# Function to count the free session slots reported by the hub's /status endpoint
+def get_free_grid_slots(hub_url=HUB_URL):
+    status_url = hub_url.split("/wd/hub")[0].rstrip("/") + "/status"
+    with urllib.request.urlopen(status_url, timeout=5) as response:
+        status = json.load(response)
+
+    free_slots = 0
+    for node in status.get("value", {}).get("nodes", []):
+        if node.get("availability") != "UP":
+            continue
+        free_slots += sum(1 for slot in node.get("slots", []) if slot.get("session") is None)
+    return free_slots
+
+# Function to decide how many browser sessions to fan the jobs out over, counting the test's own session
+def get_worker_count(job_count, max_workers=None):
+    try:
+        slots = get_free_grid_slots() + 1
+    except Exception as e:
+        print(f"⚠️ Could not read grid capacity, using the test's own session only: {str(e)}")
+        slots = 1
+    workers = min(job_count, slots)
+    if max_workers:
+        workers = min(workers, max_workers)
+    return max(workers, 1)
+
+# Function to check a single job detail page in the given session
+@traced("step.check_job")
+def check_job(driver, job):
+    result = dict(job, view_role_loaded=False, lever_loaded=False, error=None)
+    try:
+        driver.get(job["href"])
+        apply_button = JobPage(driver).apply_button()
+        result["view_role_loaded"] = True
+        apply_button.click()
+        result["lever_loaded"] = "lever.co" in driver.current_url
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+# Function to check every job over the test's own session plus extra sessions taken from
+# `pool` for the free grid slots; with no free slots the jobs are checked one by one
+def process_jobs_in_parallel(jobs, driver, pool, max_workers=None, check=check_job):
+    workers = get_worker_count(len(jobs), max_workers)
+    if workers == 1:
+        print(f"🧵 Checking {len(jobs)} jobs in the test's own browser session...")
+        return [dict(check(driver, job), index=index) for index, job in enumerate(jobs)]
+    print(f"🧵 Checking {len(jobs)} jobs over {workers} browser sessions...")
+
+    local = threading.local()
+    # The test's own session goes to the first thread; the others take one from the pool
+    spare = [driver]
+    sessions = []
+    sessions_lock = threading.Lock()
+
+    def run(indexed_job):
+        index, job = indexed_job
+        session = getattr(local, "driver", None)
+        if session is None:
+            with sessions_lock:
+                session = spare.pop() if spare else None
+            if session is None:
+                try:
+                    session = pool.acquire()
+                except Exception as e:
+                    return dict(job, index=index, view_role_loaded=False, lever_loaded=False, error=str(e))
+                with sessions_lock:
+                    sessions.append(session)
+            local.driver = session
+        return dict(check(session, job), index=index)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() keeps the listing order regardless of which session finishes first
+            return list(executor.map(run, enumerate(jobs)))
+    finally:
+        for session in sessions:
+            pool.release(session)
+
+# Function to print the merged per-job report
+def print_job_report(results, department_name="Quality Assurance", location_name="Istanbul, Turkiye"):
+    for result in results:
+        qa_status = "✅ Yes" if department_name in result["department"] else "❌ No"
+        location_status = "✅ Yes" if location_name in result["location"] else "❌ No"
+        print(f"🔹 Position Title: {result['title']}")
+        print(f"   - Contains '{department_name}': {qa_status}")
+        print(f"   - Contains '{location_name}': {location_status}")
+        print(f"   - View Role page loaded: {'✅ Yes' if result['view_role_loaded'] else '❌ No'}")
+        print(f"   - Lever Application form loaded: {'✅ Yes' if result['lever_loaded'] else '❌ No'}")
+        if result["error"]:
+            print(f"   - Error processing position {result['title']}: {result['error']}")
+        print("-" * 50)
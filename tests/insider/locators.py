@@ -0,0 +1,42 @@
+from selenium.webdriver.common.by import By
+from collections import namedtuple
+
+# A named locator; value may hold {placeholders} filled in by with_params()
+Locator = namedtuple("Locator", ["name", "by", "value"])
+
+def with_params(locator, **params):
+    return locator._replace(value=locator.value.format(**params)) if params else locator
+
+# Central locator registry. CSS/ID strategies are used wherever the page offers a
+# stable id or class; XPath is kept only where a match on visible text is needed.
+LOCATORS = {locator.name: locator for locator in [
+    # Shared
+    Locator("cookie_accept", By.ID, "wt-cli-accept-all-btn"),
+
+    # Home page
+    Locator("navbar", By.CSS_SELECTOR, ".navbar-nav"),
+    Locator("company_menu", By.XPATH, "//a[contains(text(), 'Company')]"),
+    Locator("careers_link", By.XPATH, "//a[contains(@class, 'dropdown-sub') and contains(text(), 'Careers')]"),
+
+    # Careers page
+    Locator("our_locations", By.ID, "career-our-location"),
+    Locator("life_at_insider", By.XPATH, "//h2[contains(text(), 'Life at Insider')]"),
+
+    # QA careers page
+    Locator("see_all_qa_jobs", By.XPATH, "//a[contains(@class, 'btn') and contains(text(), 'See all QA jobs')]"),
+
+    # Open positions page
+    Locator("location_filter", By.ID, "filter-by-location"),
+    Locator("location_options", By.CSS_SELECTOR, "#filter-by-location option"),
+    Locator("location_option", By.XPATH, "//select[@id='filter-by-location']//option[contains(text(), '{text}')]"),
+    Locator("department_filter", By.ID, "filter-by-department"),
+    Locator("department_option", By.XPATH, "//select[@id='filter-by-department']//option[contains(text(), '{text}')]"),
+    Locator("job_items", By.CSS_SELECTOR, ".position-list .position-list-item:not(.position-list-item-wrapper)"),
+    Locator("job_title", By.CSS_SELECTOR, ".position-title"),
+    Locator("job_department", By.CSS_SELECTOR, ".position-department"),
+    Locator("job_location", By.CSS_SELECTOR, ".position-location"),
+    Locator("view_role", By.XPATH, ".//a[contains(@class, 'btn') and contains(text(), 'View Role')]"),
+
+    # Lever job page
+    Locator("apply_for_job", By.XPATH, "//a[contains(@class, 'postings-btn') and contains(text(), 'Apply for this job')]"),
+]}
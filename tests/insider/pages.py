@@ -0,0 +1,231 @@
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support import expected_conditions as EC
+import time
+
+from locators import LOCATORS, with_params
+from replay import resolve_url
+from tracing import span, traced
+from waits import probe, smart_wait, wait_for_dom_quiet
+
+HOME_URL = "https://useinsider.com/"
+QA_CAREERS_URL = "https://useinsider.com/careers/quality-assurance/"
+OPEN_POSITIONS_URL = "https://useinsider.com/careers/open-positions/"
+
+# Per-test counters for locator lookups and the time spent waiting on them
+class LocatorStats:
+    def __init__(self):
+        self.lookups = 0
+        self.cache_hits = 0
+        self.wait_time = 0.0
+
+    def record(self, elapsed):
+        self.lookups += 1
+        self.wait_time += elapsed
+
+    def summary(self):
+        return f"{self.lookups} locator lookups, {self.cache_hits} cache hits, {self.wait_time:.2f}s waiting"
+
+# Runs in the browser: one plain record per job listing, in document order
+EXTRACT_JOBS_SCRIPT = """
+const [itemSelector, titleSelector, departmentSelector, locationSelector] = arguments;
+const text = (item, selector) => {
+    const element = item.querySelector(selector);
+    return element ? (element.innerText || element.textContent).trim() : "";
+};
+return Array.from(document.querySelectorAll(itemSelector)).map(item => {
+    const viewRole = Array.from(item.querySelectorAll("a.btn")).find(link => link.textContent.includes("View Role"));
+    return {
+        title: text(item, titleSelector),
+        department: text(item, departmentSelector),
+        location: text(item, locationSelector),
+        href: viewRole ? viewRole.href : null,
+    };
+});
+"""
+
+# Runs in the browser: picks the first option whose text contains the wanted text and fires
+# the change event the listing listens to (through jQuery when the page uses it, e.g. select2)
+SET_SELECT_SCRIPT = """
+const [selectId, text] = arguments;
+const select = document.getElementById(selectId);
+const option = Array.from(select.options).find(option => option.textContent.includes(text));
+if (window.jQuery) {
+    window.jQuery(select).val(option.value).trigger("change");
+} else {
+    select.value = option.value;
+    select.dispatchEvent(new Event("change", {bubbles: true}));
+}
+"""
+
+# Base page: resolves registry locators and caches element handles until the page navigates
+class BasePage:
+    url = None
+
+    def __init__(self, driver, stats=None):
+        self.driver = driver
+        self.stats = stats or LocatorStats()
+        self.cache = {}
+
+    # Function to load the page's URL (through the replay server when one is active)
+    # and start with an empty element cache
+    def open(self):
+        with span("page.open", page=type(self).__name__):
+            self.driver.get(resolve_url(self.url))
+        self.invalidate()
+        return self
+
+    # Function to drop cached handles, called whenever the document changes
+    def invalidate(self):
+        self.cache.clear()
+
+    # Function to hand over to the page object for the next page state
+    def navigate_to(self, page_class):
+        self.invalidate()
+        return page_class(self.driver, self.stats)
+
+    # Function to wait for a registry locator and cache the resulting handle(s).
+    # timeout is the ceiling; once there is history the wait uses a learned timeout.
+    def find(self, name, condition=EC.presence_of_element_located, timeout=10, **params):
+        key = (name, condition, tuple(sorted(params.items())))
+        if key in self.cache:
+            self.stats.cache_hits += 1
+            return self.cache[key]
+
+        locator = with_params(LOCATORS[name], **params)
+        start = time.perf_counter()
+        try:
+            result = smart_wait(self.driver, name, condition((locator.by, locator.value)), timeout)
+        finally:
+            self.stats.record(time.perf_counter() - start)
+        self.cache[key] = result
+        return result
+
+    # Function to find a locator inside another element (not cached: it lives in the parent)
+    def find_in(self, parent, name, condition, timeout=10):
+        locator = LOCATORS[name]
+        start = time.perf_counter()
+        try:
+            return smart_wait(parent, name, condition((locator.by, locator.value)), timeout)
+        finally:
+            self.stats.record(time.perf_counter() - start)
+
+    # Function to accept the cookie consent
+    def accept_cookies(self):
+        try:
+            with span("step.accept_cookies"):
+                # The banner is optional: probe for it instead of waiting out a timeout
+                start = time.perf_counter()
+                try:
+                    cookie_button = probe(self.driver, LOCATORS["cookie_accept"])
+                finally:
+                    self.stats.record(time.perf_counter() - start)
+                if cookie_button is None:
+                    print("⚠️ No cookie prompt found, continuing...")
+                    return
+
+                # Scroll to the button using Selenium's ActionChains to move to it
+                ActionChains(self.driver).move_to_element(cookie_button).perform()
+
+                # Click the button to accept the cookie consent
+                cookie_button.click()
+                print("✅ Accepted cookie consent.")
+        except Exception as e:
+            print(f"⚠️ Could not accept the cookie prompt, continuing... Error: {str(e)}")
+
+class HomePage(BasePage):
+    url = HOME_URL
+
+    def wait_for_navbar(self):
+        return self.find("navbar")
+
+    # Function to open Company > Careers and return the careers page
+    @traced("step.go_to_careers")
+    def go_to_careers(self):
+        company_menu = self.find("company_menu", EC.visibility_of_element_located)
+        print("✅ Located the 'Company' dropdown menu.")
+
+        # Scroll the "Company" menu into view and hover over it
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", company_menu)
+        ActionChains(self.driver).move_to_element(company_menu).perform()
+        print("✅ Hovered over the 'Company' menu.")
+
+        self.find("careers_link", EC.element_to_be_clickable, timeout=5).click()
+        print("✅ Clicked on the 'Careers' option.")
+
+        careers_page = self.navigate_to(CareersPage)
+        smart_wait(self.driver, "careers_url", EC.url_contains("careers"), 10)
+        return careers_page
+
+class CareersPage(BasePage):
+    def locations_section(self):
+        return self.find("our_locations")
+
+    def life_at_insider_section(self):
+        return self.find("life_at_insider")
+
+class QAJobsPage(BasePage):
+    url = QA_CAREERS_URL
+
+    # Function to click "See all QA jobs" and return the open positions page
+    @traced("step.see_all_jobs")
+    def see_all_jobs(self):
+        self.find("see_all_qa_jobs", EC.element_to_be_clickable).click()
+        print("✅ Clicked on 'See all QA jobs' button.")
+        positions_page = self.navigate_to(OpenPositionsPage)
+        smart_wait(self.driver, "open_positions_url", EC.url_contains("open-positions"), 10)
+        return positions_page
+
+class OpenPositionsPage(BasePage):
+    url = OPEN_POSITIONS_URL
+
+    # Function to pick an option in one of the filter dropdowns by setting the select's
+    # value directly, instead of expanding it and clicking the option
+    def select_filter(self, filter_name, option_name, text, options_name=None):
+        if options_name:
+            # Wait for the options to load
+            self.find(options_name, EC.presence_of_all_elements_located, timeout=20)
+        try:
+            self.find(option_name, text=text, timeout=5)
+        except TimeoutException:
+            raise ValueError(f"No '{text}' option in the {filter_name} dropdown")
+        self.driver.execute_script(SET_SELECT_SCRIPT, LOCATORS[filter_name].value, text)
+        # Filtering re-renders the listing: let it settle, and drop the now stale job handles
+        wait_for_dom_quiet(self.driver)
+        self.cache = {key: value for key, value in self.cache.items() if key[0] != "job_items"}
+
+    @traced("step.filter_by_location")
+    def filter_by_location(self, location):
+        self.select_filter("location_filter", "location_option", location, options_name="location_options")
+
+    @traced("step.filter_by_department")
+    def filter_by_department(self, department):
+        self.select_filter("department_filter", "department_option", department)
+
+    # Function to apply a location/department pair in the current session
+    @traced("step.apply_filters")
+    def apply_filters(self, location, department):
+        self.filter_by_location(location)
+        self.filter_by_department(department)
+
+    def job_items(self):
+        return self.find("job_items", EC.visibility_of_all_elements_located)
+
+    # Function to read every listing (title, department, location, View Role href)
+    # in a single execute_script call instead of several round-trips per job
+    @traced("step.extract_jobs")
+    def extract_jobs(self):
+        return self.driver.execute_script(
+            EXTRACT_JOBS_SCRIPT,
+            LOCATORS["job_items"].value,
+            LOCATORS["job_title"].value,
+            LOCATORS["job_department"].value,
+            LOCATORS["job_location"].value,
+        )
+
+    def view_role_button(self, job):
+        return self.find_in(job, "view_role", EC.element_to_be_clickable)
+
+class JobPage(BasePage):
+    def apply_button(self):
+        return self.find("apply_for_job", EC.element_to_be_clickable)
@@ -0,0 +1,220 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import hashlib
+import json
+import os
+import re
+import threading
+import urllib.error
+import urllib.request
+
+from fixture_server import get_reachable_host
+
+REPLAY_ARCHIVE = os.environ.get(
+    "REPLAY_ARCHIVE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "replay_archive")
+)
+MODES = ("off", "record", "replay")
+FORWARDED_HEADERS = ("User-Agent", "Accept", "Accept-Language")
+TEXT_TYPES = ("text/", "javascript", "json", "xml")
+
+# Absolute URLs in text bodies, including the \/-escaped form used in inline JSON
+ABSOLUTE_URL = re.compile(r"(https?):(\\?/\\?/)([A-Za-z0-9.-]+(?::\d+)?)")
+# Subresource integrity hashes no longer match once a body has been rewritten
+INTEGRITY_ATTRIBUTE = re.compile(r"""\sintegrity=("[^"]*"|'[^']*')""")
+# Replay server paths look like /<scheme>/<host>/<path>
+ENCODED_PATH = re.compile(r"^/(https?)/([^/?#]+)(.*)$")
+
+# Function to hash a URL or a body into a file name
+def digest(data):
+    return hashlib.sha256(data if isinstance(data, bytes) else data.encode()).hexdigest()
+
+# Function to write a file in one step, so parallel xdist workers never see half of it
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+# Function to point every absolute URL in a text body at the replay server
+def rewrite_body(body, base_url, content_type=""):
+    server_host = urlsplit(base_url).netloc
+    text = body.decode("utf-8", errors="surrogateescape")
+
+    def replace(match):
+        scheme, slashes, host = match.groups()
+        if host == server_host:
+            return match.group(0)
+        slash = slashes[:len(slashes) // 2]  # "/" or the escaped "\/"
+        return base_url.replace("/", slash) + slash + scheme + slash + host
+
+    text = ABSOLUTE_URL.sub(replace, text)
+    if "html" in content_type:
+        text = INTEGRITY_ATTRIBUTE.sub("", text)
+    return text.encode("utf-8", errors="surrogateescape")
+
+# On-disk archive: one JSON entry per URL plus content-addressed bodies
+class ReplayArchive:
+    def __init__(self, path=REPLAY_ARCHIVE):
+        self.path = path
+
+    def entry_path(self, url):
+        return os.path.join(self.path, "entries", f"{digest(url)}.json")
+
+    # Function to read an archived response, or None when the URL was never recorded
+    def load(self, url):
+        try:
+            with open(self.entry_path(url)) as f:
+                entry = json.load(f)
+            with open(os.path.join(self.path, "bodies", entry["body"]), "rb") as f:
+                return dict(entry, body=f.read())
+        except (OSError, ValueError, KeyError):
+            return None
+
+    # Function to store a response body and its entry
+    def save(self, url, status, content_type, body):
+        body_name = digest(body)
+        body_path = os.path.join(self.path, "bodies", body_name)
+        if not os.path.exists(body_path):
+            write_atomic(body_path, body)
+        entry = {"url": url, "status": status, "content_type": content_type, "body": body_name}
+        write_atomic(self.entry_path(url), json.dumps(entry, indent=2).encode())
+
+    # Function to list every archived URL
+    def urls(self):
+        entries_dir = os.path.join(self.path, "entries")
+        if not os.path.isdir(entries_dir):
+            return []
+        urls = []
+        for name in sorted(os.listdir(entries_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(entries_dir, name)) as f:
+                    urls.append(json.load(f)["url"])
+        return urls
+
+# Request handler: maps the encoded path back to the original URL and serves the archived copy
+class ReplayHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.serve(send_body=True)
+
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def serve(self, send_body):
+        replay = self.server.replay
+        url = replay.original_url(self.path, self.headers.get("Referer"))
+        if url is None:
+            status, content_type, body = 404, "text/plain", b"Not a replay URL"
+        else:
+            headers = {name: self.headers[name] for name in FORWARDED_HEADERS if self.headers.get(name)}
+            status, content_type, body = replay.respond(url, headers)
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# Local server the Remote browser loads pages from. In "record" mode it fetches
+# unknown URLs live and archives them; in "replay" mode it only serves the archive.
+class ReplayServer:
+    def __init__(self, mode="replay", archive=None, host=None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown replay mode '{mode}', expected 'record' or 'replay'")
+        self.mode = mode
+        self.archive = archive or ReplayArchive()
+        self.httpd = ThreadingHTTPServer(("0.0.0.0", 0), ReplayHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.replay = self
+        self.host = host or get_reachable_host()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.recorded = 0
+        self.misses = 0
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.httpd.server_address[1]}"
+
+    # Function to turn a live URL into its replay server address
+    def url_for(self, url):
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}{query}"
+
+    # Function to recover the live URL from a request path. Root-relative requests
+    # (e.g. /wp-content/...) take their origin from the page that made them.
+    def original_url(self, path, referer=None):
+        match = ENCODED_PATH.match(path)
+        if match:
+            scheme, host, rest = match.groups()
+            return f"{scheme}://{host}{rest if rest.startswith('/') else '/' + rest}"
+        if referer:
+            origin = self.original_url(urlsplit(referer).path)
+            if origin:
+                parts = urlsplit(origin)
+                return f"{parts.scheme}://{parts.netloc}{path}"
+        return None
+
+    # Function to fetch a live response for the archive
+    def fetch(self, url, headers):
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, response.headers.get("Content-Type", "application/octet-stream"), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers.get("Content-Type", "application/octet-stream"), e.read()
+        except (urllib.error.URLError, OSError) as e:
+            print(f"⚠️ Could not record {url}: {str(e)}")
+            return None
+
+    # Function to produce the response for a URL, recording it first when allowed
+    def respond(self, url, headers):
+        entry = self.archive.load(url)
+        if entry is None and self.mode == "record":
+            fetched = self.fetch(url, headers)
+            if fetched:
+                self.archive.save(url, *fetched)
+                entry = self.archive.load(url)
+                with self.lock:
+                    self.recorded += 1
+        elif entry is not None:
+            with self.lock:
+                self.hits += 1
+
+        if entry is None:
+            with self.lock:
+                self.misses += 1
+            return 404, "text/plain", f"Not in the replay archive: {url}".encode()
+
+        body = entry["body"]
+        if any(text_type in entry["content_type"] for text_type in TEXT_TYPES):
+            body = rewrite_body(body, self.base_url, entry["content_type"])
+        return entry["status"], entry["content_type"], body
+
+    def summary(self):
+        with self.lock:
+            return f"{self.hits} served from the archive, {self.recorded} recorded, {self.misses} missing"
+
+_server = None
+
+# Function to route page loads through a replay server (None turns replay off)
+def set_replay_server(server):
+    global _server
+    _server = server
+
+# Function to map a live URL to the address the browser should load
+def resolve_url(url):
+    return _server.url_for(url) if _server else url
@@ -0,0 +1,247 @@
+# Long-lived test runner for the test-controller pod.
+#
+# `serve` imports pytest and selenium once and then forks a child per run
+# request, so every run starts from warm imports but still gets a clean process
+# (test modules and conftests are imported fresh in the child). `run` is the thin
+# client deploy_and_test.py execs in the pod; it streams the run's output and
+# exits with pytest's code, or runs pytest directly when no daemon is listening.
+# `bench` compares a cold `python -m pytest` start with a warm run via the daemon.
+#
+# Only the stdlib is imported at module level, so the client stays cheap.
+import argparse
+import importlib
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RUNNER_HOST = "127.0.0.1"
+RUNNER_PORT = int(os.environ.get("INSIDER_RUNNER_PORT", "8765"))
+EXIT_PREFIX = "RUNNER_EXIT "
+# The daemon runs from the copy baked into the image while the client runs from the synced
+# tests, so bump this whenever the /run request or response format changes
+PROTOCOL_VERSION = 1
+DEFAULT_CWD = os.path.dirname(os.path.abspath(__file__))
+# pytest plugins (xdist) are left out: pytest can only assert-rewrite them if it imports them itself
+PRELOAD_MODULES = (
+    "pytest", "_pytest.junitxml", "_pytest.terminal", "_pytest.python", "execnet", "selenium.webdriver",
+    "selenium.webdriver.remote.webdriver", "selenium.webdriver.common.by", "selenium.webdriver.support.ui",
+    "selenium.webdriver.support.expected_conditions",
+)
+
+# Function to import the heavy modules once in the daemon, before any run forks from it
+def preload(modules=PRELOAD_MODULES):
+    start = time.perf_counter()
+    loaded = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except ImportError:
+            pass
+    return loaded, time.perf_counter() - start
+
+# Function to run pytest in a forked child and stream its combined output to `write`
+def run_forked(args, env, cwd, write):
+    import pytest
+
+    read_fd, write_fd = os.pipe()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            os.dup2(write_fd, 1)
+            os.dup2(write_fd, 2)
+            sys.stdout.reconfigure(line_buffering=True)
+            sys.stderr.reconfigure(line_buffering=True)
+            os.environ.update(env)
+            os.chdir(cwd)
+            code = int(pytest.main(list(args)))
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            code = 3
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+    os.close(write_fd)
+    try:
+        with os.fdopen(read_fd, "rb") as output:
+            for chunk in iter(lambda: output.read1(65536), b""):
+                write(chunk)
+    except OSError:
+        # The client went away: don't leave the run behind
+        os.kill(pid, signal.SIGTERM)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+class RunnerHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/health":
+            self.send_error(404)
+            return
+        self.respond_json({"protocol": PROTOCOL_VERSION, "pid": os.getpid(), "runs": self.server.runs, "preload_seconds": self.server.preload_seconds})
+
+    def do_POST(self):
+        if self.path != "/run":
+            self.send_error(404)
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        self.server.runs += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.end_headers()
+
+        def write(chunk):
+            self.wfile.write(chunk)
+            self.wfile.flush()
+
+        code = run_forked(request.get("args", []), request.get("env", {}), request.get("cwd") or DEFAULT_CWD, write)
+        try:
+            write(f"\n{EXIT_PREFIX}{code}\n".encode())
+        except OSError:
+            pass
+
+    def respond_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# Function to preload the imports and serve run requests until the pod stops
+def serve(host=RUNNER_HOST, port=RUNNER_PORT):
+    loaded, elapsed = preload()
+    server = ThreadingHTTPServer((host, port), RunnerHandler)
+    server.daemon_threads = True
+    server.runs = 0
+    server.preload_seconds = round(elapsed, 3)
+    print(f"🏃 Test runner listening on {host}:{port} ({len(loaded)} modules preloaded in {elapsed:.2f}s)", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+# Function to read the daemon's /health payload (None when it isn't up)
+def daemon_health(port=RUNNER_PORT, timeout=2):
+    try:
+        with urllib.request.urlopen(f"http://{RUNNER_HOST}:{port}/health", timeout=timeout) as response:
+            return json.load(response) if response.status == 200 else None
+    except (OSError, urllib.error.URLError, ValueError):
+        return None
+
+# Function to check whether the daemon is up
+def is_running(port=RUNNER_PORT, timeout=2):
+    return daemon_health(port, timeout) is not None
+
+# Function to check whether a running daemon speaks this client's protocol
+def is_compatible(health):
+    return health is not None and health.get("protocol") == PROTOCOL_VERSION
+
+# Function to send a run to the daemon and copy its output to `out`; returns pytest's exit code
+def request_run(args, env=None, cwd=None, port=RUNNER_PORT, out=None):
+    out = out or sys.stdout.buffer
+    payload = json.dumps({"args": list(args), "env": env or {}, "cwd": cwd}).encode()
+    request = urllib.request.Request(f"http://{RUNNER_HOST}:{port}/run", data=payload, method="POST",
+                                     headers={"Content-Type": "application/json"})
+    code = 3
+    with urllib.request.urlopen(request) as response:
+        for line in response:
+            text = line.decode("utf-8", errors="replace").strip()
+            if text.startswith(EXIT_PREFIX):
+                code = int(text[len(EXIT_PREFIX):])
+                continue
+            out.write(line)
+            out.flush()
+    return code
+
+# Function to run pytest through the daemon, or in this process's place when it isn't running
+def run(args, env=None, cwd=None, port=RUNNER_PORT):
+    # Default to the client's directory (the synced tests), not the daemon's
+    cwd = cwd or DEFAULT_CWD
+    health = daemon_health(port)
+    if is_compatible(health):
+        return request_run(args, env, cwd, port)
+    if health is None:
+        print("⚠️ Test runner daemon is not running, starting pytest directly.", flush=True)
+    else:
+        print(f"⚠️ Test runner daemon speaks protocol {health.get('protocol')}, this client speaks "
+              f"{PROTOCOL_VERSION}; starting pytest directly (rebuild the test-controller image).", flush=True)
+    os.environ.update(env or {})
+    os.chdir(cwd)
+    os.execvp(sys.executable, [sys.executable, "-m", "pytest"] + list(args))
+
+# Function to time `repeat` cold pytest starts against the same runs through the daemon
+def bench(args, repeat=3, port=RUNNER_PORT):
+    cold, warm = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "pytest"] + list(args), cwd=DEFAULT_CWD,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        cold.append(time.perf_counter() - start)
+    if is_compatible(daemon_health(port)):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with open(os.devnull, "wb") as devnull:
+                request_run(args, cwd=DEFAULT_CWD, port=port, out=devnull)
+            warm.append(time.perf_counter() - start)
+    result = {"args": list(args), "repeat": repeat, "cold_p50": round(statistics.median(cold), 3),
+              "warm_p50": round(statistics.median(warm), 3) if warm else None}
+    print(f"❄️ Cold start (python -m pytest): {result['cold_p50']:.2f}s median of {repeat}")
+    if warm:
+        print(f"🔥 Warm start (runner daemon):   {result['warm_p50']:.2f}s median of {repeat} "
+              f"({result['cold_p50'] - result['warm_p50']:.2f}s saved per run)")
+    else:
+        print(f"⚠️ No compatible runner daemon on port {port}, no warm numbers.")
+    return result
+
+# Function to split the client's KEY=VALUE --env options into a dict
+def parse_env(pairs):
+    env = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition("=")
+        env[key] = value
+    return env
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm pytest runner for the test-controller pod.")
+    parser.add_argument("--port", type=int, default=RUNNER_PORT, help="Local port of the runner daemon")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="Preload pytest/selenium and serve run requests")
+    commands.add_parser("ping", help="Exit 0 when the daemon is up (readiness probe)")
+    run_parser = commands.add_parser("run", help="Run pytest through the daemon: run [--env K=V] -- <pytest args>")
+    run_parser.add_argument("--env", action="append", metavar="KEY=VALUE", help="Environment variable for the run")
+    run_parser.add_argument("--cwd", default=None, help="Working directory of the run (default: this directory)")
+    run_parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
+    bench_parser = commands.add_parser("bench", help="Compare cold and warm start time")
+    bench_parser.add_argument("--repeat", type=int, default=3)
+    bench_parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(port=args.port)
+    elif args.command == "ping":
+        return 0 if is_running(args.port) else 1
+    elif args.command == "run":
+        pytest_args = args.pytest_args[1:] if args.pytest_args[:1] == ["--"] else args.pytest_args
+        return run(pytest_args, parse_env(args.env), args.cwd, args.port)
+    elif args.command == "bench":
+        pytest_args = args.pytest_args[1:] if args.pytest_args[:1] == ["--"] else args.pytest_args
+        bench(pytest_args or ["--collect-only", "-q", DEFAULT_CWD], args.repeat, args.port)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
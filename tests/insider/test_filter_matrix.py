@@ -0,0 +1,18 @@
+from filter_matrix import print_matrix_report, run_filter_matrix
+from pages import OpenPositionsPage
+
+def test_filter_matrix_on_fixture(driver, locator_stats, fixture_server):
+    # Every combination runs against the same loaded page and session
+    driver.get(fixture_server.url("open_positions_filters.html"))
+    combinations = [
+        {"location": "Istanbul, Turkiye", "department": "Quality Assurance", "min_jobs": 2},
+        {"location": "Istanbul, Turkiye", "department": "Sales", "min_jobs": 1},
+        {"location": "London, United Kingdom", "department": "Quality Assurance", "min_jobs": 0},
+        {"location": "Berlin, Germany", "department": "Sales", "min_jobs": 0},
+    ]
+    results = run_filter_matrix(OpenPositionsPage(driver, locator_stats), combinations)
+
+    assert [result["jobs"] for result in results[:3]] == [2, 1, 0]
+    assert all(not result["mismatches"] and not result["error"] for result in results[:3])
+    assert "Berlin, Germany" in results[3]["error"]
+    assert print_matrix_report(results) == [results[3]]
@@ -0,0 +1,17 @@
+from pages import OpenPositionsPage
+
+def test_extract_jobs_from_fixture(driver, locator_stats, fixture_server):
+    # Load the static open positions fixture served from disk
+    driver.get(fixture_server.url("open_positions.html"))
+    records = OpenPositionsPage(driver, locator_stats).extract_jobs()
+
+    assert [record["title"] for record in records] == [
+        "Senior Software Quality Assurance Engineer",
+        "Software QA Tester - Insider Testinium Tech Hub (Remote)",
+        "QA Automation Engineer",
+    ]
+    assert all(record["department"] == "Quality Assurance" for record in records)
+    assert [record["location"] for record in records] == ["Istanbul, Turkiye", "Istanbul, Turkiye", "Ankara, Turkiye"]
+    assert records[0]["href"] == "https://jobs.lever.co/useinsider/11111111-aaaa-4bbb-8ccc-000000000001"
+    assert records[2]["href"] is None
+    print(f"✅ Extracted {len(records)} job records in one call.")
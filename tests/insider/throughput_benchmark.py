@@ -0,0 +1,111 @@
+import argparse
+import json
+import statistics
+import threading
+import time
+
+from browser_profiles import PROFILES, execute_cdp
+from driver_pool import initialize_driver
+from pages import HOME_URL, HomePage
+from replay import REPLAY_ARCHIVE, ReplayArchive, ReplayServer, set_replay_server
+
+# Prefix of the machine-readable summary line the host-side runner looks for
+RESULT_PREFIX = "THROUGHPUT_RESULT "
+
+# Function to read the page's used JS heap in MB through CDP (a browser-side memory estimate)
+def js_heap_mb(driver):
+    execute_cdp(driver, "Performance.enable")
+    metrics = {metric["name"]: metric["value"] for metric in execute_cdp(driver, "Performance.getMetrics")["metrics"]}
+    return metrics.get("JSHeapUsedSize", 0) / (1024 * 1024)
+
+# Function to run one test_homepage-style session: create, load the homepage, check it, quit
+def run_session(profile):
+    start = time.perf_counter()
+    driver = initialize_driver(profile)
+    created = time.perf_counter()
+    try:
+        HomePage(driver).open()
+        assert "Insider" in driver.title, f"Unexpected homepage title '{driver.title}'"
+        loaded = time.perf_counter()
+        try:
+            heap = js_heap_mb(driver)
+        except Exception:
+            heap = None
+    finally:
+        driver.quit()
+    return {"create": created - start, "load": loaded - created, "heap_mb": heap}
+
+# Function to keep `sessions` sessions going back to back for `duration` seconds
+def run_benchmark(sessions, duration, profile="default"):
+    results, errors = [], []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        while time.monotonic() < deadline:
+            try:
+                result = run_session(profile)
+                with lock:
+                    results.append(result)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e).splitlines()[0] if str(e) else type(e).__name__)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    def median(key):
+        values = [result[key] for result in results if result[key] is not None]
+        return round(statistics.median(values), 3) if values else None
+
+    return {
+        "sessions": sessions,
+        "elapsed": round(elapsed, 2),
+        "completed": len(results),
+        "failed": len(errors),
+        "sessions_per_minute": round(len(results) / elapsed * 60, 2),
+        "create_p50": median("create"),
+        "load_p50": median("load"),
+        "heap_mb_p50": median("heap_mb"),
+        "errors": errors[:3],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run N concurrent homepage sessions and report sessions/minute.")
+    parser.add_argument("--sessions", type=int, default=1, help="Concurrent sessions")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to keep starting new sessions")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default", help="Browser profile")
+    parser.add_argument("--replay", choices=["off", "record", "replay"], default="replay",
+                        help="Serve the homepage from the replay archive (default), record it, or load it live")
+    parser.add_argument("--replay-archive", default=REPLAY_ARCHIVE, help="Directory of the record/replay archive")
+    args = parser.parse_args()
+
+    server = None
+    if args.replay != "off":
+        archive = ReplayArchive(args.replay_archive)
+        if args.replay == "replay" and archive.load(HOME_URL) is None:
+            print(f"⚠️ {HOME_URL} is not in the replay archive, record it first with --replay record.")
+        server = ReplayServer(args.replay, archive).start()
+        set_replay_server(server)
+
+    print(f"🏎️ Running {args.sessions} concurrent session(s) for {args.duration:g}s ({args.profile} profile)...")
+    try:
+        summary = run_benchmark(args.sessions, args.duration, args.profile)
+    finally:
+        if server:
+            set_replay_server(None)
+            server.stop()
+
+    print(f"✅ {summary['completed']} sessions completed, {summary['failed']} failed, "
+          f"{summary['sessions_per_minute']} sessions/minute")
+    for error in summary["errors"]:
+        print(f"   ❌ {error}")
+    print(RESULT_PREFIX + json.dumps(summary))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+# One JSON object per line, appended by every pytest process of the run
+TRACE_FILE = os.environ.get("INSIDER_TRACE_FILE")
+
+# Span writer: times named blocks and appends them as JSONL records
+class Tracer:
+    def __init__(self, path, run_id=None):
+        self.path = path
+        self.run_id = run_id or os.environ.get("INSIDER_TRACE_RUN_ID") or os.path.splitext(os.path.basename(path))[0]
+        self.worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        self.test = None
+        self.ids = itertools.count(1)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "a")
+
+    # Function to time a block and write it as a span, marking it as failed if it raises.
+    # The yielded dict lets the caller set the status for failures it only learns about later.
+    @contextmanager
+    def span(self, name, kind="step", **attributes):
+        stack = self.local.__dict__.setdefault("stack", [])
+        span_id = f"{self.worker}-{next(self.ids)}"
+        parent_id = stack[-1] if stack else None
+        stack.append(span_id)
+        started = time.time()
+        start = time.perf_counter()
+        current = {"status": "ok"}
+        try:
+            yield current
+        except BaseException:
+            current["status"] = "error"
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            self.write({
+                "run_id": self.run_id, "worker": self.worker, "test": self.test,
+                "span_id": span_id, "parent_id": parent_id, "name": name, "kind": kind,
+                "start": round(started, 6), "duration": round(duration, 6), "status": current["status"],
+                "attributes": attributes,
+            })
+
+    def write(self, record):
+        line = json.dumps(record) + "\n"
+        with self.lock:
+            # A single write per line keeps lines from parallel xdist workers intact
+            self.file.write(line)
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+_tracer = None
+
+# Function to turn tracing on for this process (None turns it off)
+def set_tracer(tracer):
+    global _tracer
+    _tracer = tracer
+
+def get_tracer():
+    return _tracer
+
+# Function to open a span on the active tracer; a no-op when tracing is off
+@contextmanager
+def span(name, kind="step", **attributes):
+    if _tracer is None:
+        yield {"status": "ok"}
+        return
+    with _tracer.span(name, kind, **attributes) as current:
+        yield current
+
+# Function to time every WebDriver command a session sends to the grid
+def instrument_driver(driver):
+    if getattr(driver, "_traced", False):
+        return driver
+    execute = driver.execute
+
+    def traced_execute(command, params=None):
+        attributes = {"url": params["url"]} if command == "get" and params else {}
+        with span(f"webdriver.{command}", kind="command", **attributes):
+            return execute(command, params)
+
+    driver.execute = traced_execute
+    driver._traced = True
+    return driver
+
+# Decorator form of span() for page-object steps
+def traced(name, kind="step"):
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name, kind):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,140 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+import json
+import os
+import threading
+import time
+
+from tracing import span
+
+WAIT_LATENCIES_FILE = os.environ.get("WAIT_LATENCIES_FILE", "/tmp/insider-wait-latencies.json")
+POLL_FREQUENCY = 0.1
+HISTORY_LENGTH = 50
+MIN_SAMPLES = 5
+TIMEOUT_FACTOR = 3
+MIN_TIMEOUT = 2.0
+SLOW_WAIT_THRESHOLD = 1.0
+
+# Runs in the browser: resolves once no DOM mutation happened for quietMs, or false at timeoutMs
+DOM_QUIET_SCRIPT = """
+const [quietMs, timeoutMs, done] = arguments;
+let quietTimer = null;
+const finish = quiet => {
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(deadline);
+    done(quiet);
+};
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true), quietMs);
+});
+observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+quietTimer = setTimeout(() => finish(true), quietMs);
+const deadline = setTimeout(() => finish(false), timeoutMs);
+"""
+
+# Function to pick the 95th percentile of a list of latencies (nearest rank)
+def p95(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+# Recent wait latencies per wait name, used to size timeouts and flag slow successes
+class LatencyBook:
+    def __init__(self, history=None):
+        self.history = {name: list(values) for name, values in (history or {}).items()}
+        self.new = {}
+        self.lock = threading.Lock()
+
+    # Function to size a wait from its history: TIMEOUT_FACTOR x p95, capped by the
+    # hardcoded timeout the call site asked for (which also applies until there is history)
+    def timeout(self, name, default):
+        with self.lock:
+            values = self.history.get(name, [])
+            if len(values) < MIN_SAMPLES:
+                return default
+            return min(default, max(MIN_TIMEOUT, p95(values) * TIMEOUT_FACTOR))
+
+    # Function to record a successful wait and log it when it was unusually slow
+    def record(self, name, elapsed, timeout):
+        with self.lock:
+            values = self.history.setdefault(name, [])
+            slow = len(values) >= MIN_SAMPLES and elapsed > max(p95(values), SLOW_WAIT_THRESHOLD)
+            baseline = p95(values) if slow else None
+            values.append(elapsed)
+            del values[:-HISTORY_LENGTH]
+            self.new.setdefault(name, []).append(elapsed)
+        if slow:
+            print(f"🐢 Slow wait '{name}': {elapsed:.2f}s (p95 {baseline:.2f}s, timeout {timeout:.1f}s)")
+
+# Function to read the latency history saved by earlier runs
+def load_latencies(path=WAIT_LATENCIES_FILE):
+    try:
+        with open(path) as f:
+            return LatencyBook(json.load(f))
+    except (OSError, ValueError):
+        return LatencyBook()
+
+# Function to add this process's samples to the saved history (xdist workers save in turn)
+def save_latencies(book, path=WAIT_LATENCIES_FILE):
+    history = load_latencies(path).history
+    with book.lock:
+        for name, values in book.new.items():
+            history[name] = (history.get(name, []) + values)[-HISTORY_LENGTH:]
+        book.new = {}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp_path, path)
+
+_book = LatencyBook()
+
+def set_latency_book(book):
+    global _book
+    _book = book
+
+def get_latency_book():
+    return _book
+
+# Function to wait on a condition with a learned timeout, recording how long it took
+def smart_wait(driver, name, condition, default_timeout):
+    timeout = _book.timeout(name, default_timeout)
+    start = time.perf_counter()
+    with span(f"wait.{name}", kind="wait", timeout=timeout):
+        result = WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(condition)
+    _book.record(name, time.perf_counter() - start, timeout)
+    return result
+
+# Function to wait for a window that was not open before, returning its handle (None on timeout)
+def wait_for_new_window(driver, known_handles, default_timeout=5):
+    try:
+        smart_wait(driver, "new_window", EC.new_window_is_opened(list(known_handles)), default_timeout)
+    except Exception:
+        return None
+    new_handles = [handle for handle in driver.window_handles if handle not in known_handles]
+    return new_handles[-1] if new_handles else None
+
+# Function to wait until the page stops mutating the DOM (re-renders, late widgets)
+def wait_for_dom_quiet(driver, quiet_period=0.3, default_timeout=5):
+    timeout = _book.timeout("dom_quiet", default_timeout)
+    start = time.perf_counter()
+    with span("wait.dom_quiet", kind="wait", timeout=timeout):
+        quiet = driver.execute_async_script(DOM_QUIET_SCRIPT, int(quiet_period * 1000), int(timeout * 1000))
+    if quiet:
+        _book.record("dom_quiet", time.perf_counter() - start, timeout)
+    return quiet
+
+# Function to look for an optional element without waiting out a timeout: check now,
+# and if it is not there, check once more after the page has settled
+def probe(driver, locator):
+    def first_displayed():
+        for element in driver.find_elements(locator.by, locator.value):
+            if element.is_displayed():
+                return element
+        return None
+
+    element = first_displayed()
+    if element is None:
+        wait_for_dom_quiet(driver, default_timeout=2)
+        element = first_displayed()
+    return element
@@ -0,0 +1,27 @@
+import json
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "scripts")
+FAKE_KUBECTL = os.path.join(os.path.dirname(__file__), "fake_kubectl.py")
+
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+# Fake kubectl wired into the scripts; call it with a scenario dict
+@pytest.fixture
+def fake_kubectl(tmp_path, monkeypatch):
+    import readiness
+
+    log_path = tmp_path / "kubectl.log"
+    monkeypatch.setattr(readiness, "KUBECTL", f"{sys.executable} {FAKE_KUBECTL}")
+    monkeypatch.setenv("FAKE_KUBECTL_LOG", str(log_path))
+
+    def configure(scenario):
+        scenario_path = tmp_path / "scenario.json"
+        scenario_path.write_text(json.dumps(scenario))
+        monkeypatch.setenv("FAKE_KUBECTL_SCENARIO", str(scenario_path))
+        return log_path
+
+    return configure
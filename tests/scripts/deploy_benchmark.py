@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# Benchmark harness for scripts/deploy_and_test.py against a simulated cluster.
+#
+# Each run calls deploy_and_test.main() in-process, with the fake kubectl (and,
+# for the "api" backend, the fake API server) standing in for EKS. Readiness
+# delays and failure rates are configurable. The simulated pytest run takes
+# test_seconds split over the `-n` xdist workers deploy_and_test passes. Each
+# run records the wall-clock time of every phase plus the number of kubectl
+# invocations and API requests. --save-baseline stores the medians;
+# --compare fails when a phase got slower or more calls are made.
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(TESTS_DIR))
+FAKE_KUBECTL = os.path.join(TESTS_DIR, "fake_kubectl.py")
+BASELINE_FILE = os.path.join(REPO_ROOT, ".cache", "deploy_benchmark_baseline.json")
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+sys.path.insert(0, TESTS_DIR)
+
+import deploy_and_test
+import readiness
+import result_history
+import timing_cache
+import trace_report
+from cluster_client import KubectlClient, set_client
+from deploy_and_test import POD_RUNNER
+from fake_apiserver import FakeApiServer
+from grid import HUB_STATUS_PATH
+
+CONTROLLER_POD = "selenium-test-controller-pod"
+
+DEFAULT_SIMULATION = {
+    "service_delay": 0.05,
+    "deployment_delay": 0.3,
+    "pod_delay": 0.1,
+    "test_seconds": 2.0,
+    "failure_rate": 0.0,
+    "seed": 1,
+}
+
+# Function to build a hub /status document with one free slot per chrome-node
+def hub_status(node_count):
+    nodes = [{"availability": "UP", "slots": [{"session": None}]} for _ in range(node_count)]
+    return {"value": {"ready": True, "nodes": nodes}}
+
+# Function to build the fake kubectl scenario for one run
+def kubectl_scenario(simulation, node_count, backend):
+    # exec/cp always go through kubectl; "exec ... -- python <runner> run" is the pytest run itself.
+    # Its time is split over the -n workers deploy_and_test actually passed, not over node_count.
+    scenario = {
+        "exec": {"stdout": ""},
+        f"exec {CONTROLLER_POD} -- python {POD_RUNNER} run": {
+            "delay": simulation["test_seconds"],
+            "split_over_workers": True,
+            "stdout": "simulated pytest run on {workers} worker(s)\n",
+        },
+        "cp": {"stdout": ""},
+    }
+    if backend == "kubectl":
+        scenario.update({
+            "apply": {"stdout": "configured\n"},
+            "delete": {"stdout": "deleted\n"},
+            "scale": {"stdout": "scaled\n"},
+            "get service": {"events": [{"delay": simulation["service_delay"], "object": {"kind": "Service"}}]},
+            "get hpa": {"events": [{"delay": simulation["service_delay"], "object": {"kind": "HorizontalPodAutoscaler"}}]},
+            # A failed rollout shows up as a watch that ends without the deployment becoming available
+            "get deployment": {"failure_rate": simulation["failure_rate"],
+                               "events": [{"delay": simulation["deployment_delay"],
+                                           "object": {"status": {"availableReplicas": 1}}}]},
+            "get pod -l app=chrome-node --watch": {"events": [{"delay": simulation["pod_delay"],
+                                                               "object": {"status": {"phase": "Running"}}}]},
+            "get pod -o json -l app=selenium-test-controller": {
+                "stdout": json.dumps({"items": [{"metadata": {"name": CONTROLLER_POD}}]})},
+            "get --raw": {"stdout": json.dumps(hub_status(node_count))},
+        })
+    return scenario
+
+# Function to run deploy_and_test.main() once against a fresh simulated cluster
+def run_once(backend, node_count, simulation=DEFAULT_SIMULATION):
+    with tempfile.TemporaryDirectory() as tmp:
+        scenario_path = os.path.join(tmp, "scenario.json")
+        log_path = os.path.join(tmp, "kubectl.log")
+        with open(scenario_path, "w") as f:
+            json.dump(kubectl_scenario(simulation, node_count, backend), f)
+
+        argv = ["--node_count", str(node_count), "--cluster_client", backend]
+        fake = None
+        if backend == "api":
+            fake = FakeApiServer(ready_delays={"deployment": simulation["deployment_delay"], "pod": simulation["pod_delay"]},
+                                 failure_rate=simulation["failure_rate"], seed=simulation["seed"]).start()
+            fake.set_raw(HUB_STATUS_PATH, hub_status(node_count))
+            argv += ["--api_server", fake.url]
+
+        saved_env = {name: os.environ.get(name) for name in ("FAKE_KUBECTL_SCENARIO", "FAKE_KUBECTL_LOG", "FAKE_KUBECTL_SEED")}
+        saved_kubectl, saved_timeouts = readiness.KUBECTL, dict(readiness.TIMEOUTS)
+        # Keep the run's history, timings, JUnit copy, traces and artifacts out of the repo's .cache
+        cache_paths = [(result_history, "HISTORY_DB", os.path.join(tmp, "test_history.sqlite")),
+                       (timing_cache, "TIMINGS_FILE", os.path.join(tmp, "test_timings.json")),
+                       (trace_report, "TRACES_DIR", os.path.join(tmp, "traces")),
+                       (deploy_and_test, "LOCAL_ARTIFACTS_DIR", os.path.join(tmp, "artifacts"))]
+        saved_paths = [(module, name, getattr(module, name)) for module, name, _ in cache_paths]
+        for module, name, path in cache_paths:
+            setattr(module, name, path)
+        # main() opens the manifests by relative path
+        saved_cwd = os.getcwd()
+        os.chdir(REPO_ROOT)
+        os.environ.update(FAKE_KUBECTL_SCENARIO=scenario_path, FAKE_KUBECTL_LOG=log_path,
+                          FAKE_KUBECTL_SEED=str(simulation["seed"]))
+        readiness.KUBECTL = f"{sys.executable} {FAKE_KUBECTL}"
+
+        timer = deploy_and_test.PhaseTimer()
+        output = io.StringIO()
+        ok = True
+        try:
+            with contextlib.redirect_stdout(output):
+                deploy_and_test.main(argv, timer)
+        except SystemExit as e:
+            ok = not e.code
+        finally:
+            total = time.perf_counter() - timer.started
+            os.chdir(saved_cwd)
+            for module, name, path in saved_paths:
+                setattr(module, name, path)
+            readiness.KUBECTL = saved_kubectl
+            readiness.TIMEOUTS.clear()
+            readiness.TIMEOUTS.update(saved_timeouts)
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            set_client(KubectlClient())
+            if fake:
+                fake.stop()
+
+        phases = dict(timer.phases)
+        # main() reports failed deploys and aborted test runs without exiting non-zero
+        ok = ok and "run tests" in phases
+        with open(log_path) if os.path.exists(log_path) else io.StringIO() as log:
+            kubectl_calls = sum(1 for _ in log)
+        return {
+            "backend": backend,
+            "node_count": node_count,
+            "ok": ok,
+            "phases": phases,
+            "total": total,
+            "kubectl_calls": kubectl_calls,
+            "api_requests": len(fake.requests) if fake else 0,
+            "output": output.getvalue(),
+        }
+
+# Function to reduce repeated runs of one configuration to their medians
+def summarize(runs):
+    names = [name for name in runs[0]["phases"] if all(name in run["phases"] for run in runs)]
+    return {
+        "ok": all(run["ok"] for run in runs),
+        "phases": {name: statistics.median(run["phases"][name] for run in runs) for name in names},
+        "total": statistics.median(run["total"] for run in runs),
+        "kubectl_calls": statistics.median(run["kubectl_calls"] for run in runs),
+        "api_requests": statistics.median(run["api_requests"] for run in runs),
+    }
+
+def result_key(backend, node_count):
+    return f"{backend}/nodes={node_count}"
+
+# Function to list everything that regressed against the baseline
+def compare(results, baseline, tolerance=0.2, min_delta=0.1):
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if base["ok"] and not result["ok"]:
+            regressions.append(f"{key}: run failed")
+        timings = dict(base["phases"], total=base["total"])
+        current = dict(result["phases"], total=result["total"])
+        for name, before in timings.items():
+            if name not in current:
+                regressions.append(f"{key}: phase '{name}' missing")
+                continue
+            after = current[name]
+            if after > before * (1 + tolerance) and after - before > min_delta:
+                regressions.append(f"{key}: '{name}' took {after:.2f}s vs {before:.2f}s baseline")
+        for counter in ("kubectl_calls", "api_requests"):
+            if result[counter] > base[counter]:
+                regressions.append(f"{key}: {counter} went from {base[counter]:g} to {result[counter]:g}")
+    return regressions
+
+# Function to print one line per backend/node count
+def print_results(results):
+    columns = ["deploy graph", "chrome-node health", "copy tests", "run tests"]
+    print(f"📊 {'configuration':<18} {'ok':<3} " + " ".join(f"{c:>18}" for c in columns)
+          + f" {'total':>8} {'kubectl':>8} {'api':>6}")
+    for key, result in results.items():
+        phases = " ".join(f"{result['phases'][c]:>17.2f}s" if c in result["phases"] else f"{'-':>18}" for c in columns)
+        print(f"   {key:<18} {'✅' if result['ok'] else '❌':<3} {phases} {result['total']:>7.2f}s "
+              f"{result['kubectl_calls']:>8g} {result['api_requests']:>6g}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deploy_and_test.py against a simulated cluster.")
+    parser.add_argument("--backend", action="append", choices=["kubectl", "api"],
+                        help="Cluster client backend to benchmark (repeatable, default: both)")
+    parser.add_argument("--node_counts", default="1,2,3,4,5", help="Comma-separated --node_count values")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per configuration (medians are kept)")
+    for name, value in DEFAULT_SIMULATION.items():
+        parser.add_argument(f"--{name}", type=type(value), default=value, help=f"Simulation setting (default: {value})")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON file")
+    parser.add_argument("--save_baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Fail when results regress against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown per phase")
+    args = parser.parse_args()
+
+    simulation = {name: getattr(args, name) for name in DEFAULT_SIMULATION}
+    results = {}
+    for backend in args.backend or ["kubectl", "api"]:
+        for node_count in [int(n) for n in args.node_counts.split(",")]:
+            print(f"⏳ Benchmarking {result_key(backend, node_count)} ({args.repeat} run(s))...")
+            runs = [run_once(backend, node_count, simulation) for _ in range(args.repeat)]
+            for run in runs:
+                if not run["ok"]:
+                    print(f"❌ Run failed, last output:\n{run['output'][-2000:]}")
+            results[result_key(backend, node_count)] = summarize(runs)
+    print_results(results)
+
+    if args.compare:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError):
+            print(f"❌ No baseline at {args.baseline}, run with --save_baseline first.")
+            exit(1)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if regressions:
+            exit(1)
+        print("✅ No regressions against the baseline.")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}.")
+
+if __name__ == "__main__":
+    main()
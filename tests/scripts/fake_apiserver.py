@@ -0,0 +1,248 @@
+# In-memory fake of the Kubernetes API server endpoints used by scripts/cluster_client.py.
+#
+# Applied deployments become available after ready_delays["deployment"] seconds,
+# at which point a Running pod labelled app=<name> is created for them. Arbitrary
+# paths (e.g. the hub /status through the service proxy) can be served with
+# set_raw(). Requests and TCP connections are counted so tests can check reuse.
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PLURALS = {
+    "services": "service",
+    "deployments": "deployment",
+    "horizontalpodautoscalers": "hpa",
+    "pods": "pod",
+}
+PATH_PATTERN = re.compile(r"^/(?:api/v1|apis/[^/]+/[^/]+)/namespaces/[^/]+/(\w+)(?:/([^/]+))?(?:/(scale))?$")
+
+class FakeApiServer:
+    def __init__(self, ready_delays=None, failure_rate=0.0, seed=None):
+        self.ready_delays = ready_delays or {}
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.objects = {}
+        self.raw = {}
+        self.events = []
+        self.requests = []
+        self.connections = 0
+        self.condition = threading.Condition()
+        self.timers = []
+
+        server = self
+
+        class Handler(FakeApiHandler):
+            fake = server
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        for timer in self.timers:
+            timer.cancel()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def set_raw(self, path, body):
+        self.raw[path] = body if isinstance(body, str) else json.dumps(body)
+
+    def put(self, kind, obj):
+        name = obj["metadata"]["name"]
+        with self.condition:
+            event_type = "MODIFIED" if (kind, name) in self.objects else "ADDED"
+            self.objects[(kind, name)] = obj
+            self.events.append((event_type, kind, json.loads(json.dumps(obj))))
+            self.condition.notify_all()
+
+    def remove(self, kind, name):
+        with self.condition:
+            obj = self.objects.pop((kind, name), None)
+            if obj is not None:
+                self.events.append(("DELETED", kind, obj))
+                self.condition.notify_all()
+            return obj
+
+    def get(self, kind, name):
+        with self.condition:
+            return self.objects.get((kind, name))
+
+    def list(self, kind, selector=None):
+        with self.condition:
+            return [obj for (k, _), obj in self.objects.items() if k == kind and matches_selector(obj, selector)]
+
+    def schedule(self, delay, callback):
+        timer = threading.Timer(delay, callback)
+        timer.daemon = True
+        self.timers.append(timer)
+        timer.start()
+
+    # Function to create or update an object from an applied manifest
+    def apply(self, kind, name, manifest):
+        # The repo's manifests all label their pods with app=<name>
+        obj = self.get(kind, name) or {"kind": kind, "metadata": {"name": name, "labels": {"app": name}}, "spec": {}, "status": {}}
+        self.put(kind, obj)
+        if kind == "deployment":
+            self.schedule(self.ready_delays.get("deployment", 0), lambda: self.mark_ready(name))
+
+    def mark_ready(self, name):
+        deployment = self.get("deployment", name)
+        if deployment is None:
+            return
+        deployment = json.loads(json.dumps(deployment))
+        deployment["status"]["availableReplicas"] = deployment["spec"].get("replicas", 1)
+        self.put("deployment", deployment)
+        self.schedule(self.ready_delays.get("pod", 0), lambda: self.put("pod", {
+            "kind": "pod",
+            "metadata": {"name": f"{name}-pod", "labels": {"app": name}},
+            "status": {"phase": "Running"},
+        }))
+
+def matches_selector(obj, selector):
+    if not selector:
+        return True
+    labels = obj["metadata"].get("labels", {})
+    return all(labels.get(key) == value for key, value in (term.split("=", 1) for term in selector.split(",")))
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    fake = None
+
+    def setup(self):
+        super().setup()
+        with self.fake.condition:
+            self.fake.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length).decode("utf-8")
+
+    def route(self):
+        url = urllib.parse.urlsplit(self.path)
+        self.fake.requests.append((self.command, self.path))
+        match = PATH_PATTERN.match(url.path)
+        if not match or match.group(1) not in PLURALS:
+            return None, None, None, url
+        return PLURALS[match.group(1)], match.group(2), match.group(3), url
+
+    def fail_randomly(self):
+        if self.fake.failure_rate and self.fake.random.random() < self.fake.failure_rate:
+            self.send_json(500, {"message": "injected failure"})
+            return True
+        return False
+
+    def do_GET(self):
+        kind, name, _, url = self.route()
+        query = dict(urllib.parse.parse_qsl(url.query))
+        if kind is None:
+            if url.path in self.fake.raw:
+                data = self.fake.raw[url.path].encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            else:
+                self.send_json(404, {"message": "not found"})
+            return
+        if query.get("watch"):
+            self.stream_watch(kind, query)
+        elif name:
+            obj = self.fake.get(kind, name)
+            self.send_json(200, obj) if obj else self.send_json(404, {"message": "not found"})
+        else:
+            self.send_json(200, {"items": self.fake.list(kind, query.get("labelSelector"))})
+
+    def do_PATCH(self):
+        kind, name, subresource, _ = self.route()
+        body = self.read_body()
+        if kind is None:
+            self.send_json(404, {"message": "not found"})
+            return
+        if self.fail_randomly():
+            return
+        if subresource == "scale":
+            obj = self.fake.get(kind, name)
+            if obj is None:
+                self.send_json(404, {"message": "not found"})
+                return
+            obj = json.loads(json.dumps(obj))
+            obj["spec"]["replicas"] = json.loads(body)["spec"]["replicas"]
+            self.fake.put(kind, obj)
+        elif self.headers.get("Content-Type") == "application/merge-patch+json":
+            # Only metadata merge patches (annotations) are sent outside the scale subresource
+            obj = self.fake.get(kind, name)
+            if obj is None:
+                self.send_json(404, {"message": "not found"})
+                return
+            obj = json.loads(json.dumps(obj))
+            annotations = json.loads(body).get("metadata", {}).get("annotations", {})
+            obj["metadata"].setdefault("annotations", {}).update(annotations)
+            self.fake.put(kind, obj)
+        else:
+            self.fake.apply(kind, name, body)
+        self.send_json(200, self.fake.get(kind, name))
+
+    def do_DELETE(self):
+        kind, name, _, _ = self.route()
+        obj = self.fake.remove(kind, name) if kind else None
+        self.send_json(200, obj) if obj else self.send_json(404, {"message": "not found"})
+
+    def write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    # Function to stream ADDED/MODIFIED/DELETED events like the real watch API
+    def stream_watch(self, kind, query):
+        name = query.get("fieldSelector", "").partition("metadata.name=")[2] or None
+        selector = query.get("labelSelector")
+        timeout = float(query.get("timeoutSeconds", 30))
+
+        def wanted(event_kind, obj):
+            return event_kind == kind and (name is None or obj["metadata"]["name"] == name) and matches_selector(obj, selector)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        fake = self.fake
+        with fake.condition:
+            initial = [obj for obj in fake.list(kind, selector) if name is None or obj["metadata"]["name"] == name]
+            seen = len(fake.events)
+        try:
+            for obj in initial:
+                self.write_chunk(json.dumps({"type": "ADDED", "object": obj}).encode("utf-8") + b"\n")
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                with fake.condition:
+                    fake.condition.wait_for(lambda: len(fake.events) > seen, timeout=deadline - time.monotonic())
+                    new_events, seen = fake.events[seen:], len(fake.events)
+                for event_type, event_kind, obj in new_events:
+                    if wanted(event_kind, obj):
+                        self.write_chunk(json.dumps({"type": event_type, "object": obj}).encode("utf-8") + b"\n")
+            self.write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
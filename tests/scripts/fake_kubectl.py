@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# Fake kubectl used by the script tests.
+#
+# The scenario is a JSON file named by FAKE_KUBECTL_SCENARIO that maps an
+# argument prefix (e.g. "get deployment chrome-node") to a response:
+#
+#   {"stdout": "...", "returncode": 0, "delay": 0.5, "failure_rate": 0.1,
+#    "events": [{"delay": 0.1, "object": {...}}, ...], "hold": true}
+#
+# "delay" is slept before responding. "failure_rate" is the chance that the
+# call fails with returncode 1 instead; draws are seeded by FAKE_KUBECTL_SEED
+# and the invocation number, so a scenario fails the same way on every run.
+# "events" are printed one by one as watch events; with "hold" the process
+# keeps running afterwards like a real `--watch` stream. The longest matching
+# prefix wins. Every invocation is appended to FAKE_KUBECTL_LOG when it is set.
+#
+# With "split_over_workers" the response stands in for a pytest run: "delay" is
+# the total test time, divided by the `-n N` xdist workers found in the call's
+# arguments (1 without -n), and "{workers}" in stdout is replaced by N.
+import json
+import os
+import random
+import sys
+import time
+
+# Function to read the pytest-xdist worker count from a command line (1 when -n is absent)
+def xdist_workers(args):
+    for flag, value in zip(args, args[1:]):
+        if flag == "-n" and value.isdigit():
+            return max(int(value), 1)
+    return 1
+
+def main():
+    args = sys.argv[1:]
+    command = " ".join(args)
+
+    invocation = 0
+    log_path = os.environ.get("FAKE_KUBECTL_LOG")
+    if log_path:
+        with open(log_path, "a+") as log:
+            log.seek(0)
+            invocation = sum(1 for _ in log)
+            log.write(command + "\n")
+
+    scenario = {}
+    scenario_path = os.environ.get("FAKE_KUBECTL_SCENARIO")
+    if scenario_path:
+        with open(scenario_path) as f:
+            scenario = json.load(f)
+
+    matches = [prefix for prefix in scenario if command.startswith(prefix)]
+    response = scenario[max(matches, key=len)] if matches else {}
+
+    delay, stdout = response.get("delay", 0), response.get("stdout")
+    if response.get("split_over_workers"):
+        workers = xdist_workers(args)
+        delay /= workers
+        stdout = stdout and stdout.replace("{workers}", str(workers))
+
+    time.sleep(delay)
+    rng = random.Random(f"{os.environ.get('FAKE_KUBECTL_SEED', '')}:{invocation}")
+    if rng.random() < response.get("failure_rate", 0):
+        sys.stderr.write("injected failure\n")
+        return 1
+
+    if stdout:
+        sys.stdout.write(stdout)
+        sys.stdout.flush()
+
+    for event in response.get("events", []):
+        time.sleep(event.get("delay", 0))
+        sys.stdout.write(json.dumps(event["object"], indent=4) + "\n")
+        sys.stdout.flush()
+
+    if response.get("hold"):
+        while True:
+            time.sleep(1)
+
+    if response.get("stderr"):
+        sys.stderr.write(response["stderr"])
+    return response.get("returncode", 0)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import asyncio
+import glob
+import os
+import time
+
+import pytest
+
+from cluster_client import ApiClient, KubectlClient, create_client, read_manifest_identity
+from fake_apiserver import FakeApiServer
+from readiness import deployment_available, pod_running
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+
+@pytest.fixture
+def api_server():
+    server = FakeApiServer(ready_delays={"deployment": 0.2}).start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def client(api_server):
+    client = ApiClient(api_server.url)
+    yield client
+    client.close()
+
+def test_manifest_identity_for_every_repo_manifest():
+    identities = {read_manifest_identity(open(path).read())
+                  for path in glob.glob(os.path.join(REPO_ROOT, "kubernetes", "*", "*.yaml"))}
+    assert ("deployment", "chrome-node") in identities
+    assert ("service", "selenium-hub") in identities
+    assert ("hpa", "chrome-node-hpa") in identities
+
+def test_apply_then_watch_returns_when_ready(client):
+    manifest = os.path.join(REPO_ROOT, "kubernetes", "deployments", "chrome-node.yaml")
+
+    async def deploy():
+        assert await client.apply(manifest)
+        start = time.perf_counter()
+        ready = await client.watch_until("deployment", "chrome-node", condition=deployment_available, timeout=5)
+        return ready, time.perf_counter() - start
+
+    ready, elapsed = asyncio.run(deploy())
+    assert ready
+    assert elapsed < 2
+    assert asyncio.run(client.watch_until("pod", selector="app=chrome-node", condition=pod_running, timeout=5))
+
+def test_reads_reuse_one_connection(client, api_server):
+    api_server.put("pod", {"metadata": {"name": "controller", "labels": {"app": "selenium-test-controller"}}, "status": {}})
+
+    async def read_many():
+        for _ in range(10):
+            await client.list("pod", selector="app=selenium-test-controller")
+        return await client.get("pod", "controller"), await client.get("pod", "missing")
+
+    controller, missing = asyncio.run(read_many())
+    assert controller["metadata"]["name"] == "controller"
+    assert missing is None
+    assert api_server.connections == 1
+
+def test_scale_and_delete(client, api_server, tmp_path):
+    manifest = tmp_path / "hub.yaml"
+    manifest.write_text("kind: Deployment\nmetadata:\n  name: selenium-hub\n")
+
+    async def scale_then_delete():
+        await client.apply(str(manifest))
+        assert await client.scale("selenium-hub", 3)
+        replicas = (await client.get("deployment", "selenium-hub"))["spec"]["replicas"]
+        assert await client.delete(str(manifest))
+        return replicas, await client.get("deployment", "selenium-hub")
+
+    replicas, deleted = asyncio.run(scale_then_delete())
+    assert replicas == 3
+    assert deleted is None
+
+def test_annotate_merges_into_existing_annotations(client, api_server):
+    api_server.put("pod", {"metadata": {"name": "chrome-node-a", "annotations": {"team": "qa"}}, "status": {}})
+
+    async def annotate():
+        assert await client.annotate("pod", "chrome-node-a", {"controller.kubernetes.io/pod-deletion-cost": "-100"})
+        assert not await client.annotate("pod", "missing", {"a": "b"})
+        return await client.get("pod", "chrome-node-a")
+
+    pod = asyncio.run(annotate())
+    assert pod["metadata"]["annotations"] == {"team": "qa", "controller.kubernetes.io/pod-deletion-cost": "-100"}
+
+def test_kubectl_backend_when_requested():
+    assert isinstance(create_client("kubectl"), KubectlClient)
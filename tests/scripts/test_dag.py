@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+import pytest
+
+from dag import run_graph, topological_order
+
+def make_action(log, name, delay=0.0, ok=True):
+    async def action():
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+        return ok
+    return action
+
+def test_independent_nodes_run_concurrently():
+    log = []
+    graph = {
+        "a": {"depends_on": [], "action": make_action(log, "a", 0.3)},
+        "b": {"depends_on": [], "action": make_action(log, "b", 0.3)},
+        "c": {"depends_on": ["a", "b"], "action": make_action(log, "c")},
+    }
+    start = time.perf_counter()
+    results = asyncio.run(run_graph(graph))
+    assert time.perf_counter() - start < 0.55
+    assert results == {"a": True, "b": True, "c": True}
+    assert log.index(("start", "c")) > log.index(("end", "a"))
+    assert log.index(("start", "c")) > log.index(("end", "b"))
+
+def test_dependents_of_failed_node_are_skipped():
+    log = []
+    graph = {
+        "hub": {"depends_on": [], "action": make_action(log, "hub", ok=False)},
+        "node": {"depends_on": ["hub"], "action": make_action(log, "node")},
+        "svc": {"depends_on": [], "action": make_action(log, "svc")},
+    }
+    results = asyncio.run(run_graph(graph))
+    assert results == {"hub": False, "node": False, "svc": True}
+    assert ("start", "node") not in log
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        topological_order({"a": {"depends_on": ["b"]}, "b": {"depends_on": ["a"]}})
+    with pytest.raises(ValueError, match="Unknown"):
+        topological_order({"a": {"depends_on": ["missing"]}})
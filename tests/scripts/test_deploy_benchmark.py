@@ -0,0 +1,33 @@
+import deploy_and_test
+from deploy_benchmark import DEFAULT_SIMULATION, compare, run_once, summarize
+
+FAST_SIMULATION = dict(DEFAULT_SIMULATION, service_delay=0.0, deployment_delay=0.05, pod_delay=0.0, test_seconds=0.2)
+
+def test_run_once_records_phases_and_kubectl_calls():
+    result = run_once("kubectl", 2, FAST_SIMULATION)
+    assert result["ok"], result["output"][-2000:]
+    assert {"deploy graph", "chrome-node health", "copy tests", "run tests"} <= set(result["phases"])
+    assert result["phases"]["run tests"] >= 0.1  # 0.2s of simulated tests split over 2 workers
+    assert result["kubectl_calls"] > 0
+    assert "simulated pytest run on 2 worker(s)" in result["output"]
+
+def test_simulated_test_time_follows_the_workers_actually_passed(monkeypatch):
+    # A worker count that ignores the grid's free slots must show up in the numbers
+    monkeypatch.setattr(deploy_and_test, "get_test_worker_count", lambda: 1)
+    result = run_once("kubectl", 2, dict(FAST_SIMULATION, test_seconds=0.4))
+    assert result["ok"], result["output"][-2000:]
+    assert "simulated pytest run on 1 worker(s)" in result["output"]
+    assert result["phases"]["run tests"] >= 0.4
+
+def test_compare_flags_slow_phases_and_extra_calls_only():
+    baseline = {"kubectl/nodes=1": {"ok": True, "phases": {"deploy graph": 1.0, "run tests": 2.0}, "total": 3.0,
+                                    "kubectl_calls": 20, "api_requests": 0}}
+    run = {"ok": True, "phases": {"deploy graph": 1.05, "run tests": 3.0}, "total": 4.05,
+           "kubectl_calls": 22, "api_requests": 0, "output": ""}
+    regressions = compare({"kubectl/nodes=1": summarize([run])}, baseline)
+    assert regressions == [
+        "kubectl/nodes=1: 'run tests' took 3.00s vs 2.00s baseline",
+        "kubectl/nodes=1: 'total' took 4.05s vs 3.00s baseline",
+        "kubectl/nodes=1: kubectl_calls went from 20 to 22",
+    ]
+    assert compare({"kubectl/nodes=1": baseline["kubectl/nodes=1"]}, baseline) == []
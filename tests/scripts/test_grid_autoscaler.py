@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+from cluster_client import get_client, set_client
+from grid import HUB_STATUS_PATH, count_slots
+from grid_autoscaler import GridAutoscaler, SimulatedGrid, desired_replicas, parse_bursts, simulate
+
+def test_desired_replicas_covers_busy_queued_and_headroom_within_bounds():
+    assert desired_replicas(busy=0, queued=0, node_slots=1, headroom=1, min_replicas=1, max_replicas=5) == 1
+    assert desired_replicas(busy=2, queued=3, node_slots=2, headroom=1, min_replicas=1, max_replicas=5) == 3
+    assert desired_replicas(busy=4, queued=9, node_slots=1, headroom=0, min_replicas=1, max_replicas=5) == 5
+    assert desired_replicas(busy=0, queued=0, node_slots=1, headroom=0, min_replicas=2, max_replicas=5) == 2
+
+def test_scales_up_at_once_and_down_one_step_after_the_cooldown():
+    grid = SimulatedGrid(arrivals=[], replicas=1)
+    autoscaler = GridAutoscaler(min_replicas=1, max_replicas=5, headroom=1, cooldown=30, clock=grid.clock)
+    previous = get_client()
+    set_client(grid)
+    try:
+        grid.queue = 3
+        assert asyncio.run(autoscaler.step())["target"] == 4
+        assert grid.replicas == 4
+
+        # Demand is gone: nothing happens until it has stayed low for the cooldown
+        grid.queue = 0
+        grid.now = 3  # 15s later
+        assert asyncio.run(autoscaler.step())["target"] == 4
+        grid.now = 6  # 30s after the last change
+        assert asyncio.run(autoscaler.step())["target"] == 3
+        grid.now = 7
+        assert asyncio.run(autoscaler.step())["target"] == 3
+    finally:
+        set_client(previous)
+
+def test_scale_down_removes_an_idle_node_and_waits_while_all_are_busy():
+    grid = SimulatedGrid(arrivals=[], replicas=3, session_ticks=10)
+    autoscaler = GridAutoscaler(min_replicas=1, max_replicas=5, headroom=0, cooldown=0, clock=grid.clock)
+    previous = get_client()
+    set_client(grid)
+    try:
+        # Sessions on the first and the newest node; the ReplicaSet would pick the newest by default
+        grid.nodes[0]["sessions"] = [10]
+        grid.nodes[2]["sessions"] = [10]
+        assert asyncio.run(autoscaler.step())["target"] == 2
+        assert [node["name"] for node in grid.nodes] == ["chrome-node-1", "chrome-node-3"]
+
+        # Both remaining nodes are busy: nothing is removed even though demand is below capacity
+        grid.nodes[1]["sessions"] = [10, 10]
+        grid.node_slots = 2
+        assert asyncio.run(autoscaler.step())["target"] == 2
+        assert grid.killed_sessions == 0
+    finally:
+        set_client(previous)
+
+def test_simulated_hub_reports_sessions_and_queue():
+    grid = SimulatedGrid(arrivals=[3], node_slots=2, replicas=1)
+    grid.tick()
+    status = json.loads(asyncio.run(grid.get_raw(HUB_STATUS_PATH)))
+    assert count_slots(status) == (2, 2)
+    assert grid.queue == 1
+
+def test_controller_cuts_queue_time_against_a_static_grid():
+    arrivals = parse_bursts("2:4,20:3", 40)
+    static = simulate(SimulatedGrid(arrivals))
+    grid = SimulatedGrid(arrivals)
+    scaled = simulate(grid, GridAutoscaler(headroom=1, cooldown=20, clock=grid.clock))
+    assert scaled["queued_session_seconds"] < static["queued_session_seconds"]
+    assert scaled["killed_sessions"] == 0
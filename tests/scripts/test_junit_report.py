@@ -0,0 +1,20 @@
+from junit_report import parse_junit
+
+JUNIT_XML = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" errors="0" failures="1" skipped="1" tests="3" time="20.0">
+<testcase classname="test_insider" name="test_homepage" time="2.5" />
+<testcase classname="test_insider" name="test_qa_jobs" time="15.25"><failure message="AssertionError: No QA jobs found">trace</failure></testcase>
+<testcase classname="test_insider" name="test_careers_page" time="0.0"><skipped message="grid busy" /></testcase>
+</testsuite></testsuites>
+"""
+
+def test_parse_junit_reports_outcome_and_duration_per_test(tmp_path):
+    path = tmp_path / "junit.xml"
+    path.write_text(JUNIT_XML)
+    results = parse_junit(str(path))
+    assert [(r["test_id"], r["outcome"], r["duration"]) for r in results] == [
+        ("test_insider.py::test_homepage", "passed", 2.5),
+        ("test_insider.py::test_qa_jobs", "failed", 15.25),
+        ("test_insider.py::test_careers_page", "skipped", 0.0),
+    ]
+    assert results[1]["message"] == "AssertionError: No QA jobs found"
@@ -0,0 +1,37 @@
+import os
+
+from cluster_client import read_manifest_identity
+from node_config import CHROME_NODE_MANIFEST, node_settings, render_chrome_node_manifest, write_chrome_node_manifest
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+TEMPLATE = os.path.join(REPO_ROOT, CHROME_NODE_MANIFEST)
+
+def test_render_adds_session_env_and_resources_to_the_container():
+    env, resources = node_settings(max_sessions=4, overcommit=True, cpu_request="1", memory_limit="4Gi")
+    with open(TEMPLATE) as f:
+        rendered = render_chrome_node_manifest(f.read(), env, resources)
+
+    assert read_manifest_identity(rendered) == ("deployment", "chrome-node")
+    assert (
+        "        resources:\n"
+        "          requests:\n"
+        '            cpu: "1"\n'
+        "          limits:\n"
+        '            memory: "4Gi"\n'
+        "        env:\n"
+        "          - name: SE_NODE_MAX_SESSIONS\n"
+        '            value: "4"\n'
+        "          - name: SE_NODE_OVERRIDE_MAX_SESSIONS\n"
+        '            value: "true"\n'
+        "          - name: SE_EVENT_BUS_HOST\n"
+    ) in rendered
+
+def test_defaults_only_pin_one_session_per_node():
+    env, resources = node_settings()
+    assert (env, resources) == ({"SE_NODE_MAX_SESSIONS": "1"}, {})
+    path = write_chrome_node_manifest(env, resources, template=TEMPLATE)
+    try:
+        with open(path) as f:
+            assert "resources:" not in f.read()
+    finally:
+        os.remove(path)
@@ -0,0 +1,39 @@
+import time
+
+from readiness import (
+    JsonStreamDecoder, parse_timeouts, wait_for_resource,
+    deployment_available, pod_running,
+)
+
+def test_decoder_splits_concatenated_objects():
+    decoder = JsonStreamDecoder()
+    assert decoder.feed('{"a": 1}\n{"b"') == [{"a": 1}]
+    assert decoder.feed(': 2}\n') == [{"b": 2}]
+
+def test_parse_timeouts_overrides_single_kind():
+    timeouts = parse_timeouts(["deployment=5"])
+    assert timeouts["deployment"] == 5
+    assert timeouts["service"] == 30
+
+def test_wait_returns_on_first_matching_event(fake_kubectl):
+    fake_kubectl({"get deployment chrome-node --watch": {
+        "events": [
+            {"delay": 0, "object": {"status": {}}},
+            {"delay": 0.2, "object": {"status": {"availableReplicas": 1}}},
+        ],
+        "hold": True,
+    }})
+    start = time.perf_counter()
+    assert wait_for_resource("deployment", "chrome-node", condition=deployment_available, timeout=10)
+    assert time.perf_counter() - start < 5
+
+def test_wait_times_out_without_matching_event(fake_kubectl):
+    fake_kubectl({"get pod -l app=chrome-node --watch": {
+        "events": [{"delay": 0, "object": {"status": {"phase": "Pending"}}}],
+        "hold": True,
+    }})
+    assert not wait_for_resource("pod", selector="app=chrome-node", condition=pod_running, timeout=0.5)
+
+def test_wait_fails_when_watch_exits(fake_kubectl):
+    fake_kubectl({"get svc missing": {"returncode": 1, "stderr": "NotFound"}})
+    assert not wait_for_resource("svc", "missing", timeout=10)
@@ -0,0 +1,36 @@
+from result_history import ResultHistory, error_signature, flip_rate
+
+def result(test_id, outcome, duration=1.0, message=""):
+    return {"test_id": test_id, "outcome": outcome, "duration": duration, "message": message}
+
+def test_error_signature_masks_ids_and_numbers():
+    first = error_signature("TimeoutException: Message: session 8f3a9c0d1e2b4a5f6c7d8e9f timed out after 10.5s\nStacktrace...")
+    second = error_signature("TimeoutException: Message: session 0a1b2c3d4e5f60718293a4b5 timed out after 7s")
+    assert first == second == "TimeoutException: Message: session <id> timed out after Ns"
+
+def test_flip_rate_only_scores_flaky_tests():
+    assert flip_rate(["passed"] * 6) == 0
+    assert flip_rate(["failed"] * 6) == 0
+    assert flip_rate(["passed", "passed", "failed", "failed", "failed"]) == 0.25  # one regression
+    assert flip_rate(["failed", "passed", "passed", "failed", "passed"]) == 0.75
+
+def test_history_quarantines_flaky_tests_and_puts_recent_failures_first():
+    history = ResultHistory(":memory:")
+    for run in range(6):
+        flaky = "failed" if run % 2 else "passed"
+        history.record(f"run{run}", 1, [
+            result("test_insider.py::test_homepage", "passed", 2.0),
+            result("test_insider.py::test_careers_page", flaky, 5.0, "TimeoutException"),
+            result("test_insider.py::test_qa_jobs", "failed" if run == 5 else "passed", 20.0, "No QA jobs found"),
+            result("test_insider.py::test_skipped", "skipped"),
+        ])
+        if flaky == "failed":
+            history.record(f"run{run}", 2, [result("test_insider.py::test_careers_page", "passed", 4.0)])
+
+    assert history.quarantined(threshold=0.3) == ["test_insider.py::test_careers_page"]
+    assert history.quarantined(threshold=0.3, min_attempts=20) == []
+    assert history.run_first() == ["test_insider.py::test_qa_jobs", "test_insider.py::test_careers_page"]
+    stats = history.stats()
+    assert "test_insider.py::test_skipped" not in stats
+    assert stats["test_insider.py::test_qa_jobs"]["last_signature"] == "No QA jobs found"
+    history.close()
@@ -0,0 +1,70 @@
+import io
+import json
+import subprocess
+import tarfile
+
+import pytest
+
+import cluster_client
+import sync_tests
+from sync_tests import MANIFEST_NAME, diff_manifests, hash_tree
+
+# Client whose exec() applies the sync commands to a local directory standing in for /tests
+class FakePodClient:
+    def __init__(self, remote_dir):
+        self.remote_dir = remote_dir
+        self.uploads = []
+
+    def exec(self, pod_name, command, stdin=False, input=None, **kwargs):
+        if command[0] == "cat":
+            manifest = self.remote_dir / MANIFEST_NAME
+            if not manifest.exists():
+                return subprocess.CompletedProcess(command, 1, b"", b"")
+            return subprocess.CompletedProcess(command, 0, manifest.read_bytes(), b"")
+        self.uploads.append(input)
+        with tarfile.open(fileobj=io.BytesIO(input), mode="r:gz") as bundle:
+            bundle.extractall(self.remote_dir)
+        return subprocess.CompletedProcess(command, 0, b"", b"")
+
+@pytest.fixture
+def tests_tree(tmp_path):
+    root = tmp_path / "tests"
+    (root / "insider" / "__pycache__").mkdir(parents=True)
+    (root / "scripts").mkdir()
+    (root / "unit").mkdir()
+    (root / "insider" / "test_insider.py").write_text("def test_a(): pass\n")
+    (root / "insider" / "__pycache__" / "test_insider.pyc").write_bytes(b"\0")
+    (root / "scripts" / "test_dag.py").write_text("")
+    (root / "unit" / "test_waits.py").write_text("")
+    (root / "test_controller.py").write_text("def test_ready(): pass\n")
+    return root
+
+@pytest.fixture
+def pod(tmp_path, monkeypatch):
+    remote_dir = tmp_path / "pod"
+    remote_dir.mkdir()
+    client = FakePodClient(remote_dir)
+    monkeypatch.setattr(cluster_client, "_client", client)
+    return client
+
+def test_hash_tree_skips_caches_and_host_side_tests(tests_tree):
+    assert sorted(hash_tree(tests_tree)) == ["insider/test_insider.py", "test_controller.py"]
+
+def test_diff_manifests():
+    changed, deleted = diff_manifests({"a": "1", "b": "2"}, {"a": "1", "b": "0", "c": "3"})
+    assert changed == ["b"]
+    assert deleted == ["c"]
+
+def test_sync_only_sends_changed_files(tests_tree, pod):
+    assert sync_tests.sync_tests("controller", root=str(tests_tree))
+    assert (pod.remote_dir / "insider" / "test_insider.py").exists()
+
+    # Nothing changed: no upload at all
+    assert sync_tests.sync_tests("controller", root=str(tests_tree))
+    assert len(pod.uploads) == 1
+
+    (tests_tree / "insider" / "test_insider.py").write_text("def test_b(): pass\n")
+    assert sync_tests.sync_tests("controller", root=str(tests_tree))
+    with tarfile.open(fileobj=io.BytesIO(pod.uploads[-1]), mode="r:gz") as bundle:
+        assert sorted(bundle.getnames()) == [MANIFEST_NAME, "insider/test_insider.py"]
+    assert json.loads((pod.remote_dir / MANIFEST_NAME).read_text()) == hash_tree(tests_tree)
@@ -0,0 +1,35 @@
+import asyncio
+import json
+
+from cluster_client import get_client, set_client
+from throughput import RESULT_PREFIX, get_chrome_node_memory, parse_memory, parse_result
+
+class FakeMetricsClient:
+    def __init__(self, body):
+        self.body = body
+
+    async def get_raw(self, path):
+        return self.body
+
+def test_parse_memory_handles_binary_and_decimal_units():
+    assert parse_memory("512Ki") == 512 * 1024
+    assert parse_memory("2Gi") == 2 * 1024 ** 3
+    assert parse_memory("1500M") == 1.5e9
+    assert parse_memory("1024") == 1024
+
+def test_chrome_node_memory_sums_every_container():
+    pods = {"items": [{"containers": [{"usage": {"memory": "100Mi"}}]},
+                      {"containers": [{"usage": {"memory": "50Mi"}}, {"usage": {"memory": "50Mi"}}]}]}
+    previous = get_client()
+    try:
+        set_client(FakeMetricsClient(json.dumps(pods)))
+        assert asyncio.run(get_chrome_node_memory()) == 200 * 1024 ** 2
+        set_client(FakeMetricsClient(None))  # no metrics-server
+        assert asyncio.run(get_chrome_node_memory()) is None
+    finally:
+        set_client(previous)
+
+def test_parse_result_reads_the_summary_line():
+    output = f"🏎️ Running...\n{RESULT_PREFIX}{json.dumps({'sessions': 2, 'completed': 9})}\n"
+    assert parse_result(output) == {"sessions": 2, "completed": 9}
+    assert parse_result("Traceback ...") is None
@@ -0,0 +1,18 @@
+from grid import count_free_slots
+from timing_cache import average_durations, load_timings, save_timings
+
+def test_timings_keep_a_bounded_history(tmp_path):
+    path = tmp_path / "timings.json"
+    for duration in range(1, 8):
+        save_timings({"test_insider.py::test_homepage": float(duration)}, path)
+    timings = load_timings(path)
+    assert timings["test_insider.py::test_homepage"] == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert average_durations(timings) == {"test_insider.py::test_homepage": 5.0}
+
+def test_count_free_slots_skips_busy_and_down_nodes():
+    status = {"value": {"nodes": [
+        {"availability": "UP", "slots": [{"session": None}, {"session": {"sessionId": "1"}}]},
+        {"availability": "UP", "slots": [{"session": None}]},
+        {"availability": "DOWN", "slots": [{"session": None}]},
+    ]}}
+    assert count_free_slots(status) == 2
@@ -0,0 +1,28 @@
+import json
+
+from trace_report import aggregate, load_spans, percentile
+
+def write_trace(path, run_id, durations):
+    with open(path, "w") as f:
+        for name, duration in durations:
+            f.write(json.dumps({"run_id": run_id, "name": name, "kind": "step", "duration": duration, "status": "ok"}) + "\n")
+
+def test_percentile_interpolates_between_ranks():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([5.0], 95) == 5.0
+    assert percentile(list(range(1, 101)), 95) == 95.05
+    assert percentile([], 50) == 0.0
+
+def test_aggregate_merges_spans_from_several_runs(tmp_path):
+    first, second = tmp_path / "run1.jsonl", tmp_path / "run2.jsonl"
+    write_trace(first, "run1", [("step.accept_cookies", 5.0), ("page.open", 1.0)])
+    write_trace(second, "run2", [("step.accept_cookies", 0.2), ("page.open", 3.0)])
+    with open(second, "a") as f:
+        f.write("{truncated\n")
+
+    summary = aggregate(load_spans([str(first), str(second)]))
+    cookies = summary["step.accept_cookies"]
+    assert (cookies["count"], cookies["runs"], cookies["max"]) == (2, 2, 5.0)
+    assert cookies["p50"] == 2.6
+    assert summary["page.open"]["total"] == 4.0
+    assert aggregate(load_spans([str(first)]), kinds=["wait"]) == {}
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Host-side unit tests for the tests/insider modules; like tests/scripts, never synced to the pod
+INSIDER_DIR = os.path.join(os.path.dirname(__file__), "..", "insider")
+
+sys.path.insert(0, os.path.abspath(INSIDER_DIR))
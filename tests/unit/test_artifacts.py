@@ -0,0 +1,41 @@
+import json
+import tarfile
+
+from artifacts import ArtifactUploader, artifact_name, capture
+
+class FakeDriver:
+    def get_screenshot_as_png(self):
+        return b"\x89PNG"
+
+    def execute_script(self, script):
+        return {"url": "https://useinsider.com/careers/", "title": "Careers", "html": "<html></html>"}
+
+    def get_log(self, log_type):
+        return [{"level": "SEVERE", "message": "old", "timestamp": 1000},
+                {"level": "SEVERE", "message": "new", "timestamp": 5000}]
+
+def test_names_are_unique_per_worker_and_attempt():
+    nodeid = "tests/insider/test_insider.py::test_homepage"
+    first, second = artifact_name(nodeid, "gw0"), artifact_name(nodeid, "gw0")
+    assert first.startswith("tests-insider-test_insider.py-test_homepage__gw0__")
+    assert first != second
+    assert "__gw1__" in artifact_name(nodeid, "gw1")
+
+def test_capture_keeps_only_this_tests_console_messages():
+    files, meta = capture(FakeDriver(), since=2)
+    assert files["page.html"] == b"<html></html>"
+    assert [entry["message"] for entry in json.loads(files["console.json"])] == ["new"]
+    assert meta == {"url": "https://useinsider.com/careers/", "title": "Careers", "capture_errors": []}
+
+def test_uploader_writes_one_archive_per_failure_in_the_background(tmp_path):
+    uploader = ArtifactUploader(str(tmp_path), upload_url=None)
+    files, meta = capture(FakeDriver())
+    path = uploader.submit("test_homepage__gw0", files, dict(meta, test="test_homepage"))
+    uploader.submit("test_careers__gw0", {}, {"test": "test_careers", "phase": "setup"})
+    uploader.close()
+
+    assert uploader.failures == []
+    assert len(uploader.written) == 2
+    with tarfile.open(path) as tar:
+        assert sorted(tar.getnames()) == ["console.json", "meta.json", "page.html", "screenshot.png"]
+        assert json.load(tar.extractfile("meta.json"))["test"] == "test_homepage"
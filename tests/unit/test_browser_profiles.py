@@ -0,0 +1,33 @@
+import json
+
+from browser_profiles import report_page_weight
+
+class FakeDriver:
+    def __init__(self, requests, kilobytes, url="https://useinsider.com/?utm=1"):
+        self.weight = {"url": url, "requests": requests, "bytes": kilobytes * 1024}
+
+    def execute_script(self, script):
+        return dict(self.weight)
+
+def test_default_runs_store_the_baseline_fast_runs_print_the_savings(tmp_path, capsys):
+    path = str(tmp_path / "weights.json")
+    report_page_weight(FakeDriver(120, 3000), "default", path)
+    report_page_weight(FakeDriver(40, 900), "fast", path)
+
+    assert json.load(open(path)) == {"https://useinsider.com/": {"requests": 120, "bytes": 3000 * 1024}}
+    assert "saved 80 requests, 2100 KB vs default" in capsys.readouterr().out
+
+def test_missing_baseline_is_measured_in_a_default_session(tmp_path, capsys):
+    path = str(tmp_path / "weights.json")
+    measured = []
+
+    def measure_default(url):
+        measured.append(url)
+        return FakeDriver(100, 2000).weight
+
+    report_page_weight(FakeDriver(30, 500), "fast", path, measure_default)
+    assert "saved 70 requests, 1500 KB vs default" in capsys.readouterr().out
+
+    # Stored once, then reused
+    report_page_weight(FakeDriver(30, 500), "fast", path, measure_default)
+    assert measured == ["https://useinsider.com/?utm=1"]
@@ -0,0 +1,126 @@
+from driver_pool import DriverPool, format_stats, merge_stats
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+class FakeCommandExecutor:
+    def __init__(self):
+        self._commands = {}
+
+class FakeDriver:
+    def __init__(self, name):
+        self.name = name
+        self.alive = True
+        self.fail_reset = False
+        self.quit_called = False
+        self.handles = ["main"]
+        self.urls = {"main": "about:blank"}
+        self.current = "main"
+        self.switch_to = FakeSwitchTo(self)
+        self.command_executor = FakeCommandExecutor()
+        self.cdp_commands = []
+
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return list(self.handles)
+
+    @property
+    def current_url(self):
+        return self.urls[self.current]
+
+    # Function to open a tab on a URL, like a link with target="_blank"
+    def open_tab(self, handle, url):
+        self.handles.append(handle)
+        self.urls[handle] = url
+
+    def close(self):
+        self.handles.remove(self.current)
+
+    def execute_script(self, script):
+        pass
+
+    def execute(self, command, params=None):
+        if self.fail_reset:
+            raise RuntimeError("reset failed")
+        self.cdp_commands.append((params["cmd"], params["params"]))
+        return {"value": {}}
+
+    def get(self, url):
+        self.urls[self.current] = url
+
+    def set_window_size(self, width, height):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+# Function to build a pool whose factory hands out numbered fake sessions
+def make_pool(max_idle=1):
+    created = []
+
+    def factory():
+        created.append(FakeDriver(f"session-{len(created) + 1}"))
+        return created[-1]
+
+    return DriverPool(factory=factory, max_idle=max_idle), created
+
+def test_released_sessions_are_reset_and_reused():
+    pool, created = make_pool()
+    first = pool.acquire()
+    first.get("https://useinsider.com/careers/")
+    first.open_tab("job-tab", "https://jobs.lever.co/useinsider/1")
+    pool.release(first)
+    assert first.handles == ["main"] and first.current_url == "about:blank"
+    # Cookies are cleared browser-wide and storage for every origin the tabs were on
+    assert first.cdp_commands == [
+        ("Network.clearBrowserCookies", {}),
+        ("Storage.clearDataForOrigin", {"origin": "https://jobs.lever.co", "storageTypes": "all"}),
+        ("Storage.clearDataForOrigin", {"origin": "https://useinsider.com", "storageTypes": "all"}),
+    ]
+
+    assert pool.acquire() is first
+    assert (pool.hits, pool.misses, len(created)) == (1, 1, 1)
+
+def test_dead_idle_sessions_are_discarded_on_acquire():
+    pool, created = make_pool()
+    first = pool.acquire()
+    pool.release(first)
+    first.alive = False
+
+    second = pool.acquire()
+    assert second is not first and first.quit_called
+    assert (pool.hits, pool.misses) == (0, 2)
+
+def test_sessions_that_fail_to_reset_are_dropped():
+    pool, _ = make_pool()
+    driver = pool.acquire()
+    driver.fail_reset = True
+    pool.release(driver)
+    assert pool.idle == [] and driver.quit_called
+
+def test_idle_sessions_are_bounded_by_max_idle():
+    pool, _ = make_pool(max_idle=2)
+    drivers = [pool.acquire() for _ in range(3)]
+    for driver in drivers:
+        pool.release(driver)
+    assert pool.idle == drivers[:2]
+    assert drivers[2].quit_called
+
+    pool.close()
+    assert pool.idle == [] and all(driver.quit_called for driver in drivers)
+
+def test_stats_from_several_pools_are_merged_and_formatted():
+    merged = merge_stats([{"hits": 3, "misses": 1, "creation_times": [2.0]},
+                          {"hits": 1, "misses": 2, "creation_times": [1.0, 3.0]}])
+    assert merged == {"hits": 4, "misses": 3, "creation_times": [2.0, 1.0, 3.0]}
+    assert format_stats(merged) == [
+        "Driver pool: 4 hits / 3 misses (7 acquisitions)",
+        "Session creation: 3 sessions, avg 2.00s, min 1.00s, max 3.00s",
+    ]
+    assert format_stats({"hits": 0, "misses": 0, "creation_times": []}) == ["Driver pool: 0 hits / 0 misses (0 acquisitions)"]
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from filter_matrix import check_listings, load_filter_matrix
+
+def test_load_filter_matrix_defaults_min_jobs_and_rejects_incomplete_pairs(tmp_path):
+    path = tmp_path / "filters.json"
+    path.write_text(json.dumps({"combinations": [{"location": "Istanbul, Turkiye", "department": "Sales"}]}))
+    assert load_filter_matrix(str(path)) == [{"location": "Istanbul, Turkiye", "department": "Sales", "min_jobs": 0}]
+
+    path.write_text(json.dumps({"combinations": [{"location": "Istanbul, Turkiye"}]}))
+    with pytest.raises(ValueError):
+        load_filter_matrix(str(path))
+
+def test_shipped_filter_matrix_is_valid():
+    assert len(load_filter_matrix()) > 1
+
+def test_check_listings_reports_each_mismatch():
+    records = [
+        {"title": "QA Engineer", "department": "Quality Assurance", "location": "Istanbul, Turkiye"},
+        {"title": "Sales Manager", "department": "Sales", "location": "London, United Kingdom"},
+    ]
+    assert check_listings(records[:1], "Istanbul, Turkiye", "Quality Assurance") == []
+    assert check_listings(records, "Istanbul, Turkiye", "Quality Assurance") == [
+        "'Sales Manager' is in 'London, United Kingdom', not 'Istanbul, Turkiye'",
+        "'Sales Manager' is in 'Sales', not 'Quality Assurance'",
+    ]
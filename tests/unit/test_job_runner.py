@@ -0,0 +1,84 @@
+import threading
+import time
+
+import job_runner
+from job_runner import process_jobs_in_parallel
+
+class FakeDriver:
+    def __init__(self, name):
+        self.name = name
+        self.threads = set()
+
+# Pool standing in for the profile's DriverPool: counts the sessions handed out and back
+class FakePool:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.acquired = []
+        self.released = []
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            if self.fail:
+                raise RuntimeError("no free grid slot")
+            self.acquired.append(FakeDriver(f"pooled-{len(self.acquired) + 1}"))
+            return self.acquired[-1]
+
+    def release(self, driver):
+        with self.lock:
+            self.released.append(driver)
+
+def make_jobs(count):
+    return [{"title": f"job-{index}", "href": f"https://example.test/jobs/{index}"} for index in range(count)]
+
+# Function to build a check that records the session and thread each job ran on
+def make_check(finished, delay=None):
+    def check(driver, job):
+        index = int(job["title"].split("-")[1])
+        if delay:
+            time.sleep(delay(index))
+        driver.threads.add(threading.get_ident())
+        finished.append(job["title"])
+        return dict(job, view_role_loaded=True, lever_loaded=True, error=None, session=driver.name)
+    return check
+
+def test_results_keep_listing_order_over_one_session_per_thread(monkeypatch):
+    monkeypatch.setattr(job_runner, "get_free_grid_slots", lambda hub_url=None: 2)
+    own, pool, finished = FakeDriver("own"), FakePool(), []
+    # Earlier jobs take longer, so the sessions finish them out of order
+    check = make_check(finished, delay=lambda index: (6 - index) * 0.02)
+
+    jobs = make_jobs(6)
+    results = process_jobs_in_parallel(jobs, own, pool, check=check)
+
+    assert finished != [job["title"] for job in jobs]
+    assert [result["title"] for result in results] == [job["title"] for job in jobs]
+    assert [result["index"] for result in results] == list(range(6))
+    # The test's own session counts as one of the three workers; each session stays on its thread
+    assert len(pool.acquired) == 2
+    assert {result["session"] for result in results} == {"own", "pooled-1", "pooled-2"}
+    assert all(len(session.threads) == 1 for session in [own] + pool.acquired)
+    # Extra sessions go back to the pool, the test's own session stays with the test
+    assert pool.released == pool.acquired
+
+def test_no_free_slots_checks_the_jobs_in_the_tests_own_session(monkeypatch):
+    monkeypatch.setattr(job_runner, "get_free_grid_slots", lambda hub_url=None: 0)
+    own, pool, finished = FakeDriver("own"), FakePool(), []
+
+    results = process_jobs_in_parallel(make_jobs(3), own, pool, check=make_check(finished))
+
+    assert finished == ["job-0", "job-1", "job-2"]
+    assert [result["session"] for result in results] == ["own"] * 3
+    assert pool.acquired == [] and own.threads == {threading.get_ident()}
+
+def test_failed_session_creation_is_reported_on_the_job(monkeypatch):
+    monkeypatch.setattr(job_runner, "get_free_grid_slots", lambda hub_url=None: 1)
+    own, pool, finished = FakeDriver("own"), FakePool(fail=True), []
+
+    results = process_jobs_in_parallel(make_jobs(4), own, pool, check=make_check(finished, delay=lambda index: 0.05))
+
+    failed = [result for result in results if result["error"]]
+    assert failed and len(failed) < 4
+    assert all(result["error"] == "no free grid slot" and not result["view_role_loaded"] for result in failed)
+    assert all(result["session"] == "own" for result in results if not result["error"])
+    assert pool.released == []
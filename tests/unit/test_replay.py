@@ -0,0 +1,56 @@
+import urllib.error
+import urllib.request
+
+from fixture_server import FixtureServer
+from replay import ReplayArchive, ReplayServer
+
+# Function to GET a URL and return (status, body), without raising on 4xx
+def fetch(url, referer=None):
+    request = urllib.request.Request(url, headers={"Referer": referer} if referer else {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+def test_record_then_replay_offline(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    upstream = FixtureServer(directory=str(site), host="127.0.0.1").start()
+    page_url = upstream.url("careers/index.html")
+    (site / "careers").mkdir()
+    (site / "careers" / "index.html").write_text(
+        f'<a href="{upstream.url("careers/open-positions.html")}">Jobs</a>'
+        f'<script src="/app.js" integrity="sha384-abc"></script>'
+        f'<script>var api = "{upstream.url("api.json").replace("/", chr(92) + "/")}";</script>'
+    )
+    (site / "app.js").write_text("console.log('app');")
+    archive = ReplayArchive(str(tmp_path / "archive"))
+
+    # Record run: unknown URLs are fetched live and rewritten to point at the replay server
+    recorder = ReplayServer("record", archive, host="127.0.0.1").start()
+    try:
+        status, body = fetch(recorder.url_for(page_url))
+        assert status == 200
+        assert f'{recorder.base_url}/http/127.0.0.1:{upstream.httpd.server_address[1]}/careers/open-positions.html' in body
+        assert "integrity=" not in body
+        assert recorder.base_url.replace("/", "\\/") + "\\/http\\/127.0.0.1" in body
+        # Root-relative assets take their origin from the page that requested them
+        assert fetch(f"{recorder.base_url}/app.js", referer=recorder.url_for(page_url)) == (200, "console.log('app');")
+        assert recorder.recorded == 2
+    finally:
+        recorder.stop()
+        upstream.stop()
+
+    # Replay run: the upstream is gone, archived URLs still load and unknown ones are 404s
+    replayer = ReplayServer("replay", archive, host="127.0.0.1").start()
+    try:
+        status, body = fetch(replayer.url_for(page_url))
+        assert status == 200
+        assert replayer.base_url in body
+        assert fetch(replayer.url_for(upstream.url("missing.html")))[0] == 404
+        assert (replayer.hits, replayer.recorded, replayer.misses) == (1, 0, 1)
+    finally:
+        replayer.stop()
+
+    assert sorted(archive.urls()) == sorted([page_url, upstream.url("app.js")])
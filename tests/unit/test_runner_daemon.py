@@ -0,0 +1,53 @@
+import io
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from runner_daemon import PROTOCOL_VERSION, daemon_health, is_compatible, is_running, parse_env, request_run
+
+RUNNER_DAEMON = os.path.join(os.path.dirname(__file__), "..", "insider", "runner_daemon.py")
+
+# Function to pick a free local port for the daemon
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def test_parse_env_keeps_equals_signs_in_values():
+    assert parse_env(["PYTEST_TEST_TIMINGS={\"a\": 1}", "X=a=b"]) == {"PYTEST_TEST_TIMINGS": "{\"a\": 1}", "X": "a=b"}
+
+def test_only_daemons_speaking_this_protocol_are_used():
+    assert is_compatible({"protocol": PROTOCOL_VERSION, "pid": 1})
+    assert not is_compatible({"protocol": PROTOCOL_VERSION + 1, "pid": 1})
+    # A daemon from before the protocol was versioned
+    assert not is_compatible({"pid": 1, "runs": 0})
+    assert not is_compatible(None)
+
+def test_daemon_runs_pytest_in_a_fresh_child_per_request(tmp_path):
+    (tmp_path / "test_sample.py").write_text(
+        "import os\n"
+        "def test_env():\n"
+        "    assert os.environ['RUNNER_CHECK'] == 'yes'\n"
+    )
+    port = free_port()
+    daemon = subprocess.Popen([sys.executable, RUNNER_DAEMON, "--port", str(port), "serve"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 10
+        while not is_running(port) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert is_compatible(daemon_health(port))
+
+        out = io.BytesIO()
+        assert request_run(["-q", "-p", "no:cacheprovider"], {"RUNNER_CHECK": "yes"}, str(tmp_path), port, out) == 0
+        assert b"1 passed" in out.getvalue()
+
+        # The previous run's environment doesn't leak into the next one
+        out = io.BytesIO()
+        assert request_run(["-q", "-p", "no:cacheprovider"], {}, str(tmp_path), port, out) == 1
+        assert b"1 failed" in out.getvalue()
+    finally:
+        daemon.terminate()
+        daemon.wait()
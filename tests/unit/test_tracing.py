@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from tracing import Tracer, instrument_driver, set_tracer, span, traced
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, command, params=None):
+        self.commands.append(command)
+        return {"value": None}
+
+# Function to read the spans written so far
+def read_spans(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+@pytest.fixture
+def active_tracer(tmp_path):
+    tracer = Tracer(str(tmp_path / "trace.jsonl"), run_id="run1")
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(None)
+    tracer.close()
+
+def test_spans_nest_and_record_errors(active_tracer):
+    active_tracer.test = "test_insider.py::test_homepage"
+    with span("test", kind="test"):
+        with span("step.open"):
+            pass
+        with pytest.raises(ValueError):
+            with span("step.fail"):
+                raise ValueError("boom")
+    spans = {record["name"]: record for record in read_spans(active_tracer.path)}
+
+    assert spans["test"]["parent_id"] is None
+    assert spans["step.open"]["parent_id"] == spans["test"]["span_id"]
+    assert spans["step.fail"]["parent_id"] == spans["test"]["span_id"]
+    assert (spans["step.open"]["status"], spans["step.fail"]["status"], spans["test"]["status"]) == ("ok", "error", "ok")
+    assert all(record["run_id"] == "run1" and record["test"] == active_tracer.test for record in spans.values())
+
+def test_status_can_be_set_after_the_block(active_tracer):
+    with span("test", kind="test") as current:
+        current["status"] = "error"
+    assert read_spans(active_tracer.path)[0]["status"] == "error"
+
+def test_instrumented_driver_times_each_command(active_tracer):
+    driver = instrument_driver(FakeDriver())
+    assert instrument_driver(driver) is driver  # wrapping twice is a no-op
+
+    @traced("step.load")
+    def load():
+        driver.execute("get", {"url": "https://useinsider.com/"})
+        driver.execute("getTitle")
+
+    load()
+    spans = read_spans(active_tracer.path)
+    assert [record["name"] for record in spans] == ["webdriver.get", "webdriver.getTitle", "step.load"]
+    assert spans[0]["kind"] == "command" and spans[0]["attributes"] == {"url": "https://useinsider.com/"}
+    assert spans[0]["parent_id"] == spans[2]["span_id"]
+    assert driver.commands == ["get", "getTitle"]
+
+def test_spans_are_no_ops_when_tracing_is_off():
+    set_tracer(None)
+    driver = instrument_driver(FakeDriver())
+    with span("step.open") as current:
+        driver.execute("getTitle")
+    assert current == {"status": "ok"}
+    assert driver.commands == ["getTitle"]
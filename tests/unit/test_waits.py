@@ -0,0 +1,28 @@
+import pytest
+
+from waits import LatencyBook, load_latencies, save_latencies
+
+def test_timeout_is_learned_from_history_and_capped_by_the_default():
+    book = LatencyBook()
+    assert book.timeout("navbar", 10) == 10  # no history yet
+
+    for elapsed in [0.5, 0.6, 0.4, 0.5, 0.7]:
+        book.record("navbar", elapsed, 10)
+    assert book.timeout("navbar", 10) == pytest.approx(2.1)  # 3 x p95, above the 2s floor
+    assert book.timeout("navbar", 1) == 1
+
+def test_slow_success_is_logged(capsys):
+    book = LatencyBook({"careers_link": [0.2] * 10})
+    book.record("careers_link", 0.3, 5)
+    assert capsys.readouterr().out == ""
+    book.record("careers_link", 3.5, 5)
+    assert "🐢 Slow wait 'careers_link': 3.50s" in capsys.readouterr().out
+
+def test_saved_history_merges_samples_from_each_process(tmp_path):
+    path = str(tmp_path / "latencies.json")
+    first, second = load_latencies(path), load_latencies(path)
+    first.record("dom_quiet", 0.3, 5)
+    second.record("dom_quiet", 0.4, 5)
+    save_latencies(first, path)
+    save_latencies(second, path)
+    assert load_latencies(path).history == {"dom_quiet": [0.3, 0.4]}